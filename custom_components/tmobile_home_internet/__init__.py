@@ -1,40 +1,99 @@
 """The Home Assistant T-Mobile Home Internet integration."""
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+import copy
+from datetime import datetime, timedelta
 import logging
+import statistics
+import time
+from typing import Any
 import async_timeout
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_USERNAME, CONF_PASSWORD, EVENT_CALL_SERVICE, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_HOST, CONF_USERNAME, CONF_PASSWORD, EVENT_CALL_SERVICE, Platform
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
     UpdateFailed,
 )
 from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .api import GatewayApiClient
+from .auth import TokenManager, async_remove_token
+from .cells import CellIndex
+from .detector import SignalDetector
+from .history import GENERATIONS, CellHistory
+from .rolling import RollingStatistics
+from .pool import async_get_request_pool
+from .retry import RetryPolicy
+from .scheduler import AdaptivePollInterval, AllSectionsFailed, GatewayScheduler
+from .writer import AccessPointWriter
+
+from .const import (
+    ACCESS_POINT_RETRY_BUDGET_SECONDS,
+    ACCESS_POINT_TIMEOUT_SECONDS,
+    CELL_HISTORY_CAPACITY,
+    CELL_INDEX_CAPACITY,
+    CONF_OVERSAMPLING,
+    CONF_PUBLISH_SECONDS,
+    CONF_SAMPLE_SECONDS,
+    CONF_STALE_SECTION_SECONDS,
+    CONF_STATISTICS_MINUTES,
+    DEFAULT_HOST,
+    DEFAULT_OVERSAMPLING,
+    DEFAULT_PUBLISH_SECONDS,
+    DEFAULT_SAMPLE_SECONDS,
+    DEFAULT_STATISTICS_MINUTES,
+    DEFAULT_STALE_SECTION_SECONDS,
+    DOMAIN,
+    ENDPOINT_TIMEOUT_SECONDS,
+    EVENT_CELL_HANDOVER,
+    EVENT_SIGNAL_DEGRADED,
+    EVENT_SIGNAL_RECOVERED,
+    FAST_POLL_MAX_SECONDS,
+    FAST_POLL_MIN_SECONDS,
+    FAST_POLL_SECONDS,
+    SLOW_POLL_MAX_SECONDS,
+    SLOW_POLL_MIN_SECONDS,
+    SIM_REFRESH_SECONDS,
+    RETRY_INITIAL_DELAY_SECONDS,
+    RETRY_MAX_DELAY_SECONDS,
+    SIGNAL_METRICS,
+    SLOW_POLL_SECONDS,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
 
-from pytmhi import TmiApiClient
-
-from .const import GET_ACCESS_POINT_RETRIES, GET_ACCESS_POINT_RETRY_SECONDS, DOMAIN, FAST_POLL_SECONDS, SLOW_POLL_SECONDS
-
-from .utils import Static, validate_text_and_update_entities
+from .utils import validate_text_and_update_entities, value_hash
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.BUTTON, Platform.SELECT, Platform.SENSOR, Platform.SWITCH, Platform.TEXT]
 
-def setup(hass, config):
-    # Setup service call listener to check validity of text
-    hass.bus.listen(EVENT_CALL_SERVICE, validate_text_and_update_entities)
+# Spreads the entries' poll phases evenly however many entries there are.
+_GOLDEN_RATIO_CONJUGATE = 0.6180339887498949
+
+
+async def async_setup(hass: HomeAssistant, config) -> bool:
+    """Set up the Home Assistant T-Mobile Home Internet integration."""
 
-    # Provide hass object to utils
-    static = Static()
-    static.hass = hass
+    async def handle_call_service(event: Event) -> None:
+        """Check validity of text set on the SSID edit controls."""
+        await validate_text_and_update_entities(hass, event)
+
+    # Setup service call listener to check validity of text
+    hass.bus.async_listen(EVENT_CALL_SERVICE, handle_call_service)
 
     return True
 
@@ -43,11 +102,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Home Assistant T-Mobile Home Internet from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
-    try:
-        controller = TmiApiClient(entry.data[CONF_USERNAME],entry.data[CONF_PASSWORD])
+    # Dedicated session so connections to the gateway are kept alive between polls.
+    session = async_create_clientsession(hass)
+    entry.async_on_unload(session.close)
 
-        # Request some data to validate username/password.
-        await hass.async_add_executor_job(controller.auth_token)
+    # All entries share one request pool, bounding concurrent gateway requests.
+    controller = GatewayApiClient(
+        session,
+        entry.data[CONF_USERNAME],
+        entry.data[CONF_PASSWORD],
+        entry.data.get(CONF_HOST, DEFAULT_HOST),
+        async_get_request_pool(hass),
+    )
+    token_manager = TokenManager(hass, controller)
+
+    try:
+        # Reuse the token from the config flow or the previous run if it is still valid,
+        # otherwise request one to validate username/password.
+        token_valid = await token_manager.async_load()
+        token_manager.async_start()
+        entry.async_on_unload(token_manager.async_stop)
+        if not token_valid:
+            await controller.login()
 
     except Exception as exc:
         _LOGGER.error(f"Unable to connect to T-Mobile Home Internet controller: {str(exc)}")
@@ -60,19 +136,167 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             "fast_coordinator": fast_coordinator,
             "slow_coordinator": slow_coordinator,
             "controller": controller,
+            "hostname_store": await _async_get_hostname_store(hass, entry),
         }
 
     # Fetch initial data
+    await fast_coordinator.cell_index.async_load()
+    await slow_coordinator.access_point_writer.async_load()
     await fast_coordinator.async_config_entry_first_refresh()
     await slow_coordinator.async_config_entry_first_refresh()
 
+    # One timer polls every endpoint of the gateway, coalescing fetches that fall due together.
+    # Each entry gets its own phase so that gateways are not all polled on the same tick.
+    index = hass.config_entries.async_entries(DOMAIN).index(entry)
+    phase = (index * _GOLDEN_RATIO_CONJUGATE) % 1
+    scheduler = GatewayScheduler(hass, [fast_coordinator, slow_coordinator], controller.probe, phase)
+    hass.data[DOMAIN][entry.entry_id]["scheduler"] = scheduler
+    scheduler.async_start()
+    entry.async_on_unload(scheduler.async_stop)
+    entry.async_on_unload(slow_coordinator.access_point_writer.async_start())
+
+    await _async_migrate_unique_ids(hass, entry)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
     return True
 
 
-class FastCoordinator(DataUpdateCoordinator):
-    """Rapid refresh coordinator."""
+async def _async_migrate_unique_ids(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Prefix entity unique ids with the entry id so that several gateways do not collide."""
+    legacy_prefixes = tuple(f"{platform}_tmobile_home_internet_" for platform in PLATFORMS)
+
+    @callback
+    def migrate(registry_entry: er.RegistryEntry) -> dict[str, str] | None:
+        if not registry_entry.unique_id.startswith(legacy_prefixes):
+            return None
+        return {"new_unique_id": slugify(f"{entry.entry_id}_{registry_entry.unique_id}")}
+
+    await er.async_migrate_entries(hass, entry.entry_id, migrate)
+
+
+async def _async_get_hostname_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the entry's store of client hostname edits.
+
+    Hostname edits used to be kept in a single store shared by every entry.
+    They are moved to the first entry that is set up.
+    """
+    store = Store[list[dict[str, str]]](hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}")
+    if await store.async_load() is None:
+        legacy_store = Store[list[dict[str, str]]](hass, STORAGE_VERSION, STORAGE_KEY)
+        if (edited_clients := await legacy_store.async_load()) is not None:
+            _LOGGER.debug(f"Migrating client hostname edits to entry {entry.entry_id}")
+            await store.async_save(edited_clients)
+            await legacy_store.async_remove()
+    return store
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload config entry when options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+class GatewayCoordinator(DataUpdateCoordinator):
+    """Coordinator that only fetches the sections somebody needs.
+
+    Entities, services and other consumers register demand for the sections
+    of the data they read. Sections nobody asked for are skipped after the
+    first refresh, and fetched on request by async_ensure_section.
+    """
+
+    def __init__(self, hass, *args, **kwargs):
+        """Initialize the coordinator."""
+        super().__init__(hass, *args, **kwargs)
+        self._demand: dict[str, int] = {}
+        self._hashes: dict[str, tuple[Any, int]] = {}
+        self.changed_sections: set[str] = set()
+
+    @callback
+    def async_add_demand(self, section: str) -> CALLBACK_TYPE:
+        """Register interest in a section; return a function to remove it."""
+        self._demand[section] = self._demand.get(section, 0) + 1
+
+        @callback
+        def remove_demand() -> None:
+            self._demand[section] -= 1
+
+        return remove_demand
+
+    def has_demand(self, section: str) -> bool:
+        """Return whether anything is interested in a section."""
+        return self._demand.get(section, 0) > 0
+
+    def sections_to_poll(self, sections: list[str]) -> list[str]:
+        """Return which of the sections the scheduler found due should be fetched."""
+        return [section for section in sections if self.has_demand(section)]
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Work out which sections changed since the last update, then update the listeners."""
+        self.changed_sections = set()
+        for section in self.SECTIONS:
+            if self.data is None or section not in self.data:
+                continue
+            value = self.data[section]
+            previous = self._hashes.get(section)
+            if previous is not None and previous[0] is value:
+                # Carried over unchanged from the previous data.
+                continue
+            section_hash = value_hash(value)
+            if previous is None or previous[1] != section_hash:
+                self.changed_sections.add(section)
+            self._hashes[section] = (value, section_hash)
+
+        super().async_update_listeners()
+
+    def _sections_to_fetch(self, sections) -> list[str]:
+        """Return the sections that need fetching this cycle."""
+        if self.data is None:
+            # Fetch everything the first time, before entities register demand.
+            return list(sections)
+        return [section for section in sections if self.has_demand(section)]
+
+    def section_available(self, section: str) -> bool:
+        """Return whether a section can be shown."""
+        return self.data is not None and section in self.data
+
+    async def async_ensure_section(self, section: str) -> None:
+        """Fetch a section now if it is not being polled, e.g. for a service call."""
+        if self.has_demand(section) and self.section_available(section):
+            return
+        try:
+            data = await self.async_fetch_sections([section])
+        except AllSectionsFailed as err:
+            # Carry on with the last good value; a request the caller makes next fails the same way.
+            data = err.data
+        self.async_set_updated_data(data)
+
+    @callback
+    def async_set_section(self, section: str, value: Any) -> None:
+        """Replace a section with a value known to be current, such as one just written to the gateway."""
+        self.async_set_updated_data(self.data | {section: value})
+
+    async def async_fetch_sections(self, sections: list[str], snapshot_time: datetime | None = None) -> dict:
+        """Fetch the given sections and return the merged data.
+
+        snapshot_time stamps the sections fetched, so that all sections of one
+        scheduler batch share a timestamp. AllSectionsFailed is raised, with
+        the data, when sections that have a last good value all fail.
+        """
+        raise NotImplementedError
+
+
+class FastCoordinator(GatewayCoordinator):
+    """Rapid refresh coordinator.
+
+    In oversampling mode the cell data is sampled every sample_seconds, and
+    published every publish_seconds with each signal metric replaced by its
+    mean over the samples since the last publish. The mean, min, max and
+    sample count are published in the cell_stats section.
+    """
+
+    SECTIONS = ("cell",)
 
     def __init__(self, hass, controller):
         """Initialize fast coordinator."""
@@ -80,46 +304,170 @@ class FastCoordinator(DataUpdateCoordinator):
             hass,
             _LOGGER,
             name="T-Mobile Home Internet",
-            # Polling interval. Will only be polled if there are subscribers.
-            update_interval=timedelta(seconds=FAST_POLL_SECONDS),
+            # Polled by the gateway's GatewayScheduler rather than its own timer.
+            update_interval=None,
             always_update=False
         )
         self._hass = hass
         self._controller = controller
 
+        options = self.config_entry.options
+        self.oversampling = options.get(CONF_OVERSAMPLING, DEFAULT_OVERSAMPLING)
+        if self.oversampling:
+            # A fixed sample rate, only stretched if the gateway is slow to respond.
+            sample_seconds = options.get(CONF_SAMPLE_SECONDS, DEFAULT_SAMPLE_SECONDS)
+            self.poll_interval = AdaptivePollInterval(sample_seconds, sample_seconds, FAST_POLL_MAX_SECONDS)
+        else:
+            self.poll_interval = AdaptivePollInterval(FAST_POLL_SECONDS, FAST_POLL_MIN_SECONDS, FAST_POLL_MAX_SECONDS)
+        self._publish_seconds = options.get(CONF_PUBLISH_SECONDS, DEFAULT_PUBLISH_SECONDS)
+        self._window: dict[tuple[str, str], list[float]] = {}
+        self._window_started: float | None = None
+        self.history = CellHistory(CELL_HISTORY_CAPACITY)
+        window_seconds = options.get(CONF_STATISTICS_MINUTES, DEFAULT_STATISTICS_MINUTES) * 60
+        self.statistics = {
+            (generation, metric): RollingStatistics(window_seconds)
+            for generation in GENERATIONS
+            for metric in SIGNAL_METRICS
+        }
+        self.detector = SignalDetector()
+        self.cell_index = CellIndex(
+            Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{self.config_entry.entry_id}.cells"),
+            CELL_INDEX_CAPACITY,
+        )
+        # The history, statistics, degradation events and cell index need every sample,
+        # whether or not an enabled entity shows the cell data.
+        self.async_add_demand("cell")
+
     async def _async_update_data(self):
         """Fetch data from API endpoint.
 
         This is the place to pre-process the data to lookup tables
         so entities can quickly look up their data.
         """
+        return await self.async_fetch_sections(self._sections_to_fetch(self.SECTIONS))
+
+    async def async_fetch_sections(self, sections: list[str], snapshot_time: datetime | None = None) -> dict:
+        """Fetch the cell section."""
+        if not sections:
+            return self.data
+
+        started = time.monotonic()
         try:
             # Note: asyncio.TimeoutError and aiohttp.ClientError are already
             # handled by the data update coordinator.
             async with async_timeout.timeout(10):
-                return await self._hass.async_add_executor_job(self._controller.get_cell)
+                data = await self._controller.get_cell()
 
         except Exception as err:
             raise UpdateFailed(f"Error communicating with API: {err}")
 
-
-class SlowCoordinator(DataUpdateCoordinator):
+        finally:
+            self.poll_interval.record_response_time(time.monotonic() - started)
+
+        timestamp = (snapshot_time or dt_util.utcnow()).timestamp()
+        self.history.append(timestamp, data["cell"])
+        self._record_statistics(timestamp, data["cell"])
+        self._detect_degradation(timestamp, data["cell"])
+        self._index_cells(timestamp, data["cell"])
+
+        if not self.oversampling:
+            self.poll_interval.record_cell(data["cell"])
+            return data
+
+        return self._add_sample(data)
+
+    def _record_statistics(self, timestamp: float, cell: dict) -> None:
+        """Add a raw sample to the rolling statistics."""
+        for (generation, metric), rolling in self.statistics.items():
+            if generation in cell and (value := cell[generation]["sector"].get(metric)) is not None:
+                rolling.add(timestamp, value)
+
+    def _detect_degradation(self, timestamp: float, cell: dict) -> None:
+        """Run the degradation detector on a raw sample and fire an event for each change."""
+        for kind, details in self.detector.process(timestamp, cell):
+            _LOGGER.info(f"Signal {kind}: {details}")
+            self._hass.bus.async_fire(
+                EVENT_SIGNAL_DEGRADED if kind == "degraded" else EVENT_SIGNAL_RECOVERED,
+                {"entry_id": self.config_entry.entry_id, "host": self._controller.host} | details,
+            )
+
+    def _index_cells(self, timestamp: float, cell: dict) -> None:
+        """Add a raw sample to the cell index and fire an event for each handover."""
+        for handover in self.cell_index.process(timestamp, cell):
+            _LOGGER.debug(f"Cell handover: {handover}")
+            self._hass.bus.async_fire(
+                EVENT_CELL_HANDOVER,
+                {"entry_id": self.config_entry.entry_id, "host": self._controller.host} | handover,
+            )
+
+    def _add_sample(self, data: dict) -> dict:
+        """Add a sample to the window; return the aggregate when it is time to publish."""
+        now = time.monotonic()
+        if self._window_started is None:
+            self._window_started = now
+
+        cell = data["cell"]
+        for generation in ("4g", "5g"):
+            if generation not in cell:
+                continue
+            for metric in SIGNAL_METRICS:
+                value = cell[generation]["sector"].get(metric)
+                if value is not None:
+                    self._window.setdefault((generation, metric), []).append(value)
+
+        # Publish straight away the first time, so entities have data.
+        if self.data is not None and now - self._window_started < self._publish_seconds:
+            return self.data
+
+        cell = copy.deepcopy(cell)
+        stats: dict[str, dict[str, dict[str, float]]] = {}
+        for (generation, metric), values in self._window.items():
+            if generation not in cell:
+                continue
+            mean = round(statistics.fmean(values), 1)
+            cell[generation]["sector"][metric] = mean
+            stats.setdefault(generation, {})[metric] = {
+                "mean": mean,
+                "min": min(values),
+                "max": max(values),
+                "samples": len(values),
+            }
+
+        self._window = {}
+        self._window_started = None
+        return {**data, "cell": cell, "cell_stats": stats}
+
+
+class SlowCoordinator(GatewayCoordinator):
     """Rapid refresh coordinator."""
 
+    SECTIONS = ("access_point", "time", "clients")
+
     def __init__(self, hass, controller):
         """Initialize fast coordinator."""
         super().__init__(
             hass,
             _LOGGER,
             name="T-Mobile Home Internet",
-            # Polling interval. Will only be polled if there are subscribers.
-            update_interval=timedelta(seconds=SLOW_POLL_SECONDS),
+            # Polled by the gateway's GatewayScheduler rather than its own timer.
+            update_interval=None,
             always_update=False
         )
         self._hass = hass
         self._controller = controller
         self._sim = None
+        self._sim_fetched_at = None
         self._gateway = None
+        self.poll_interval = AdaptivePollInterval(SLOW_POLL_SECONDS, SLOW_POLL_MIN_SECONDS, SLOW_POLL_MAX_SECONDS)
+        self._retry_policy = RetryPolicy(
+            ACCESS_POINT_RETRY_BUDGET_SECONDS, RETRY_INITIAL_DELAY_SECONDS, RETRY_MAX_DELAY_SECONDS
+        )
+        self.access_point_writer = AccessPointWriter(
+            hass,
+            self,
+            controller,
+            Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{self.config_entry.entry_id}.access_point_queue"),
+        )
 
     async def _async_setup(self):
         """Set up the coordinator
@@ -131,13 +479,14 @@ class SlowCoordinator(DataUpdateCoordinator):
         coordinator.async_config_entry_first_refresh.
         """
         async with async_timeout.timeout(10):
-            config = await self._hass.async_add_executor_job(self._controller.get_gateway_config)
+            # The response is cached, so the first update reuses it for "time".
+            config = await self._controller.get_gateway_config()
             # Return only "device", since "signal" and "time" contain frequently changing info that will be periodically retrieved elsewhere.
             self._gateway = { "device": config["device"] }
 
         async with async_timeout.timeout(10):
-            self._sim = await self._hass.async_add_executor_job(self._controller.get_sim)
-
+            self._sim = await self._controller.get_sim()
+            self._sim_fetched_at = time.monotonic()
 
     async def _async_update_data(self):
         """Fetch data from API endpoint.
@@ -145,28 +494,176 @@ class SlowCoordinator(DataUpdateCoordinator):
         This is the place to pre-process the data to lookup tables
         so entities can quickly look up their data.
         """
-        try:
-            # Note: asyncio.TimeoutError and aiohttp.ClientError are already
-            # handled by the data update coordinator.
-            async with async_timeout.timeout(30):
-                _access_point = {"access_point":  await self._hass.async_add_executor_job(self._controller.get_ap_config, GET_ACCESS_POINT_RETRIES, GET_ACCESS_POINT_RETRY_SECONDS) }
-
-            async with async_timeout.timeout(10):
-                config =  await self._hass.async_add_executor_job(self._controller.get_gateway_config)
-                _time = { "time": config["time"] }
-
-            async with async_timeout.timeout(10):
-                _clients = await self._hass.async_add_executor_job(self._controller.get_clients)
+        return await self.async_fetch_sections(self._sections_to_fetch(self.SECTIONS))
+
+    @property
+    def _fetchers(self) -> dict:
+        """Return the fetch function for each section."""
+        return {
+            "access_point": self._fetch_access_point,
+            "time": self._fetch_time,
+            "clients": self._fetch_clients,
+        }
 
-            return _access_point | _time | _clients
+    async def async_fetch_sections(self, sections: list[str], snapshot_time: datetime | None = None) -> dict:
+        """Fetch the given sections and return the merged data.
 
+        Each section is fetched independently. A section that fails keeps its
+        last good value, and its state under "sections" records when it was
+        last fetched and the error, so only entities depending on that section
+        go unavailable once it becomes stale. Sections not fetched are left as
+        they were. If every section fails, AllSectionsFailed is raised with the
+        data, so the failure is counted while the last good values are kept.
+        """
+        sections = self._skip_access_point_while_writing(sections)
+        if not sections:
+            return self.data
+
+        fetchers = {section: self._fetchers[section] for section in sections}
+
+        # The endpoints are independent, so fetch them concurrently; the cycle
+        # then takes as long as the slowest endpoint rather than the sum.
+        started = time.monotonic()
+        results = await asyncio.gather(
+            *(fetch() for fetch in fetchers.values()),
+            return_exceptions=True,
+        )
+        self.poll_interval.record_response_time(time.monotonic() - started)
+
+        previous = self.data or {}
+        data = dict(previous)
+        sections = dict(previous.get("sections", {}))
+        now = snapshot_time or dt_util.utcnow()
+
+        error = None
+        for section, result in zip(fetchers, results):
+            state = dict(previous.get("sections", {}).get(section, {"fetched_at": None, "error": None}))
+            state["attempted_at"] = now
+
+            if isinstance(result, BaseException):
+                if section not in data:
+                    # No last good value to fall back on.
+                    raise UpdateFailed(f"Error communicating with API: {result}")
+
+                if state["error"] is None:
+                    _LOGGER.warning(f"Error fetching {section}, keeping last good data: {result}")
+                state["error"] = error = str(result) or type(result).__name__
+            else:
+                if state["error"] is not None:
+                    _LOGGER.info(f"Fetching {section} recovered")
+                data[section] = result
+                state["fetched_at"] = now
+                state["error"] = None
+
+            sections[section] = state
+
+        data["sections"] = sections
+
+        if all(isinstance(result, BaseException) for result in results):
+            raise AllSectionsFailed(f"Error communicating with API: {error}", data)
+
+        # A reboot may come with a firmware update or SIM swap, so revalidate the
+        # SIM then as well as periodically. The device is refreshed with "time".
+        if _uptime_regressed(previous, data) or time.monotonic() - self._sim_fetched_at >= SIM_REFRESH_SECONDS:
+            await self._async_refresh_sim()
+
+        return data
+
+    def sections_to_poll(self, sections: list[str]) -> list[str]:
+        """Return which of the sections the scheduler found due should be fetched."""
+        return self._skip_access_point_while_writing(super().sections_to_poll(sections))
+
+    def _skip_access_point_while_writing(self, sections: list[str]) -> list[str]:
+        """Leave out the access point while a write is in progress."""
+        if self.access_point_writer.in_progress:
+            # The gateway is resetting to apply a write, and the writer shows the new config until it is confirmed.
+            return [section for section in sections if section != "access_point"]
+        return sections
+
+    async def _async_refresh_sim(self) -> None:
+        """Fetch the SIM details again, keeping the old ones on failure."""
+        try:
+            async with async_timeout.timeout(ENDPOINT_TIMEOUT_SECONDS):
+                self._sim = await self._controller.get_sim()
+            self._sim_fetched_at = time.monotonic()
         except Exception as err:
-            raise UpdateFailed(f"Error communicating with API: {err}")
+            _LOGGER.debug(f"Unable to refresh SIM details: {err}")
+
+    def _async_update_device(self, device: dict) -> None:
+        """Keep the device details and device registry in line with the gateway."""
+        previous = self._gateway["device"]
+        if device == previous:
+            return
+
+        self._gateway = { "device": device }
+
+        if (
+            device.get("softwareVersion") != previous.get("softwareVersion")
+            or device.get("hardwareVersion") != previous.get("hardwareVersion")
+        ):
+            _LOGGER.info(f"Gateway software version is now {device.get('softwareVersion')}")
+            device_registry = dr.async_get(self.hass)
+            if device_entry := device_registry.async_get_device(identifiers={(DOMAIN, self.config_entry.entry_id)}):
+                device_registry.async_update_device(
+                    device_entry.id,
+                    sw_version=device.get("softwareVersion"),
+                    hw_version=device.get("hardwareVersion"),
+                )
+
+    def section_available(self, section: str) -> bool:
+        """Return whether a section was fetched recently enough to be shown."""
+        if self.data is None or section not in self.data.get("sections", {}):
+            return False
+
+        fetched_at = self.data["sections"][section]["fetched_at"]
+        max_age = self.config_entry.options.get(CONF_STALE_SECTION_SECONDS, DEFAULT_STALE_SECTION_SECONDS)
+        return fetched_at is not None and dt_util.utcnow() - fetched_at <= timedelta(seconds=max_age)
+
+    async def _fetch_access_point(self) -> dict:
+        """Fetch the access point section."""
+        # Leave the next cycle its time: retry for at most half the poll interval.
+        async with async_timeout.timeout(ACCESS_POINT_TIMEOUT_SECONDS):
+            return await self._retry_policy.async_call(
+                self._controller.get_ap_config, "access_point data", self.poll_interval.interval / 2
+            )
+
+    async def _fetch_time(self) -> dict:
+        """Fetch the time section, revalidating the device details from the same response."""
+        async with async_timeout.timeout(ENDPOINT_TIMEOUT_SECONDS):
+            config = await self._controller.get_gateway_config()
+        self._async_update_device(config["device"])
+        return config["time"]
+
+    async def _fetch_clients(self) -> dict:
+        """Fetch the clients section."""
+        async with async_timeout.timeout(ENDPOINT_TIMEOUT_SECONDS):
+            return (await self._controller.get_clients())["clients"]
+
+
+def _uptime_regressed(previous: dict, current: dict) -> bool:
+    """Return whether the gateway uptime went backwards, meaning it rebooted."""
+    previous_uptime = previous.get("time", {}).get("upTime")
+    current_uptime = current.get("time", {}).get("upTime")
+    return previous_uptime is not None and current_uptime is not None and current_uptime < previous_uptime
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    # The entry set up again by a reload loads the cell index straight away, so save it first.
+    await hass.data[DOMAIN][entry.entry_id]["fast_coordinator"].cell_index.async_save()
+    # A write left waiting would never be resolved, so its callers get an error now.
+    hass.data[DOMAIN][entry.entry_id]["slow_coordinator"].access_point_writer.async_stop()
+
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the entry's stored client hostname edits, cell index, queued access point changes and auth token."""
+    await Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}").async_remove()
+    await Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}.cells").async_remove()
+    await Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}.access_point_queue").async_remove()
+    # The gateway's bearer token would otherwise stay valid on disk.
+    await async_remove_token(hass, entry.data.get(CONF_HOST, DEFAULT_HOST))
@@ -0,0 +1,289 @@
+"""Asyncio client for the T-Mobile Home Internet gateway API."""
+from __future__ import annotations
+
+import asyncio
+from contextlib import AbstractAsyncContextManager, nullcontext
+from datetime import datetime, timedelta, timezone
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+import aiohttp
+
+from .const import DEFAULT_HOST, RESPONSE_CACHE_SECONDS
+
+if TYPE_CHECKING:
+    from .pool import GatewayRequestPool
+
+_LOGGER = logging.getLogger(__name__)
+
+_DEFAULT_HEADERS = {
+    "accept": "application/json",
+    "accept-language": "en-US,en;q=0.9",
+    "cache-control": "max-age=0",
+}
+
+
+class GatewayApiError(Exception):
+    """Error communicating with the gateway."""
+
+
+class GatewayAuthError(GatewayApiError):
+    """Gateway rejected the credentials or token."""
+
+
+class GatewayBusyError(GatewayApiError):
+    """Earlier requests to the gateway are stuck, so no more are sent."""
+
+
+class GatewayStatusError(GatewayApiError):
+    """Gateway answered with an error status in place of data."""
+
+    def __init__(self, status_code: int, message: str) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class GatewayIncompleteResponseError(GatewayApiError):
+    """Gateway answered with an empty or partial body."""
+
+
+class GatewayApiClient:
+    """Client for the undocumented API on T-Mobile Home Internet gateways.
+
+    Mirrors the endpoints of pytmhi's TmiApiClient, but runs on the event loop
+    using a shared aiohttp session so that connections are kept alive between
+    polls and timeouts cancel the request itself.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        username: str,
+        password: str,
+        host: str = DEFAULT_HOST,
+        pool: GatewayRequestPool | None = None,
+    ) -> None:
+        """Initialize the client."""
+        self._session = session
+        self._username = username
+        self._password = password
+        self._host = host
+        self._pool = pool
+        self._base_url = f"http://{host}/TMI/v1/"
+        self._auth_token: str | None = None
+        self._auth_expiration: datetime | None = None
+        self._auth_lock = asyncio.Lock()
+        self._token_listeners: list[Callable[[str, datetime], None]] = []
+        self._cache: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    @property
+    def pool(self) -> GatewayRequestPool | None:
+        """Return the request pool shared with other gateways, if any."""
+        return self._pool
+
+    @property
+    def host(self) -> str:
+        """Return the gateway host."""
+        return self._host
+
+    @property
+    def username(self) -> str:
+        """Return the admin username."""
+        return self._username
+
+    @property
+    def token_expiration(self) -> datetime | None:
+        """Return when the current auth token expires."""
+        return self._auth_expiration
+
+    def set_token(self, token: str, expiration: datetime) -> None:
+        """Use a previously obtained auth token."""
+        self._auth_token = token
+        self._auth_expiration = expiration
+
+    def invalidate_token(self) -> None:
+        """Forget the current auth token so the next request logs in again."""
+        self._auth_token = None
+        self._auth_expiration = None
+
+    def add_token_listener(self, listener: Callable[[str, datetime], None]) -> Callable[[], None]:
+        """Call listener with each new token; return a function to remove it."""
+        self._token_listeners.append(listener)
+        return lambda: self._token_listeners.remove(listener)
+
+    def _slot(self) -> AbstractAsyncContextManager[None]:
+        """Hold a slot in the shared request pool, if there is one."""
+        return self._pool.slot(self._host) if self._pool is not None else nullcontext()
+
+    async def _login(self) -> str:
+        """Get a new auth token by logging in."""
+        login_body = {"username": self._username, "password": self._password}
+
+        async with self._slot(), self._session.post(self._base_url + "auth/login", json=login_body) as response:
+            if response.status == 401:
+                raise GatewayAuthError("Invalid username or password")
+            response.raise_for_status()
+            json_obj = await response.json(content_type=None)
+
+        auth = json_obj.get("auth", {})
+        if not auth:
+            raise GatewayApiError(f"Failed to get token and expiration from request: {json_obj}")
+
+        self._auth_token = auth["token"]
+        self._auth_expiration = datetime.fromtimestamp(auth.get("expiration", 0), timezone.utc)
+        for listener in self._token_listeners:
+            listener(self._auth_token, self._auth_expiration)
+        return self._auth_token
+
+    async def login(self) -> str:
+        """Log in now, replacing any current token."""
+        async with self._auth_lock:
+            return await self._login()
+
+    async def auth_token(self) -> str:
+        """Get the authentication token, logging in if there is none or it has expired."""
+        async with self._auth_lock:
+            if (
+                self._auth_token is None
+                or self._auth_expiration is None
+                or datetime.now(timezone.utc) > self._auth_expiration - timedelta(seconds=10)
+            ):
+                return await self._login()
+            return self._auth_token
+
+    async def _headers(self) -> dict[str, str]:
+        """Get the headers for a request, including the auth token."""
+        return {**_DEFAULT_HEADERS, "Authorization": f"Bearer {await self.auth_token()}"}
+
+    async def _request(self, method: str, path: str, json: dict[str, Any] | None = None) -> dict[str, Any] | None:
+        """Authenticated request, logging in again once if the token is rejected."""
+        for attempt in range(2):
+            headers = await self._headers()
+            async with self._slot(), self._session.request(
+                method, self._base_url + path, json=json, headers=headers
+            ) as response:
+                if response.status == 401:
+                    if attempt == 0:
+                        # Token expired early or was revoked by another login.
+                        _LOGGER.debug(f"Token rejected requesting {path}; logging in again")
+                        self.invalidate_token()
+                        continue
+                    raise GatewayAuthError(f"Unauthorized requesting {path}")
+
+                if method == "GET":
+                    return await self._decode(path, response)
+
+                response.raise_for_status()
+                return None
+
+    @staticmethod
+    async def _decode(path: str, response: aiohttp.ClientResponse) -> dict[str, Any] | None:
+        """Decode a GET response, raising for error statuses and bodies that are not JSON."""
+        try:
+            body = await response.json(content_type=None)
+        except ValueError as exc:
+            # An HTML error page or a truncated body, typically from a rebooting gateway.
+            response.raise_for_status()
+            raise GatewayIncompleteResponseError(f"Invalid JSON requesting {path}: {exc}") from exc
+
+        # An error body with a "result" is left to the caller, which knows what it means.
+        if response.status >= 400 and not (isinstance(body, dict) and "result" in body):
+            response.raise_for_status()
+        return body
+
+    async def _get(self, path: str) -> dict[str, Any]:
+        """Authenticated GET returning the decoded JSON body."""
+        return await self._request("GET", path)
+
+    async def _cached_get(self, path: str, max_age: float) -> dict[str, Any]:
+        """GET served from a response cache when the cached copy is recent enough.
+
+        Concurrent requests for the same path share a single gateway request.
+        """
+        cached = self._cache.get(path)
+        if cached is not None and time.monotonic() - cached[0] <= max_age:
+            return cached[1]
+
+        if (future := self._in_flight.get(path)) is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[path] = future
+        try:
+            result = await self._get(path)
+        except asyncio.CancelledError:
+            # Only the request's owner was cancelled, e.g. by its own timeout. Cancelling the
+            # future would cancel every other caller waiting on it, so fail them instead.
+            future.set_exception(GatewayApiError(f"Request for {path} was cancelled"))
+            future.exception()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Retrieve the exception so it is not logged when nobody else is waiting.
+            future.exception()
+            raise
+        else:
+            self._cache[path] = (time.monotonic(), result)
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[path]
+
+    async def _post(self, path: str, json: dict[str, Any] | None = None) -> None:
+        """Authenticated POST."""
+        await self._request("POST", path, json)
+
+    async def probe(self) -> None:
+        """Check that the gateway is answering, without logging in."""
+        async with self._slot(), self._session.get(self._base_url + "version", headers=_DEFAULT_HEADERS) as response:
+            response.raise_for_status()
+
+    async def get_gateway_config(self, max_age: float = RESPONSE_CACHE_SECONDS) -> dict[str, Any]:
+        """Get the gateway's device, signal, and time.
+
+        Responses up to max_age seconds old are reused, so that callers needing
+        different parts of it in the same cycle cost one request.
+        """
+        return await self._cached_get("gateway?get=all", max_age)
+
+    async def get_cell(self) -> dict[str, Any]:
+        """Get the gateway's cell data."""
+        return await self._get("network/telemetry/?get=cell")
+
+    async def get_sim(self) -> dict[str, Any]:
+        """Get the gateway's sim data."""
+        return await self._get("network/telemetry/?get=sim")
+
+    async def get_clients(self) -> dict[str, Any]:
+        """Get the gateway's clients."""
+        return await self._get("network/telemetry/?get=clients")
+
+    async def get_ap_config(self) -> dict[str, Any]:
+        """Get the access point config.
+
+        Makes a single attempt; see RetryPolicy for retrying the failures.
+        """
+        result = await self._get("network/configuration/v2?get=ap")
+        if not isinstance(result, dict) or not result:
+            raise GatewayIncompleteResponseError("Empty access_point data")
+        if "result" in result:
+            # Gateway gets busy after an update and returns an error body with status 408 until stable.
+            status_code = result["result"].get("statusCode")
+            raise GatewayStatusError(status_code, f"Error {status_code} retrieving access_point data")
+        if "ssids" not in result:
+            raise GatewayIncompleteResponseError(f"Partial access_point data: {sorted(result)}")
+
+        _LOGGER.debug("Success getting access_point data")
+        return result
+
+    async def set_ap_config(self, new_ap_config: dict[str, Any]) -> None:
+        """Set the access point config."""
+        await self._post("network/configuration/v2?set=ap", new_ap_config)
+        _LOGGER.debug("Success setting access_point data")
+
+    async def reboot_gateway(self) -> None:
+        """Reboot the gateway."""
+        await self._post("gateway/reset?set=reboot")
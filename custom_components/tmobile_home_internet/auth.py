@@ -0,0 +1,117 @@
+"""Auth token persistence for the Home Assistant T-Mobile Home Internet integration."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import GatewayApiClient
+from .const import (
+    DOMAIN,
+    STORAGE_VERSION,
+    TOKEN_REFRESH_MARGIN_SECONDS,
+    TOKEN_REFRESH_RETRY_SECONDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+REFRESH_MARGIN = timedelta(seconds=TOKEN_REFRESH_MARGIN_SECONDS)
+
+
+def _token_store(hass: HomeAssistant, host: str) -> Store[dict[str, str]]:
+    """Return the store of a gateway's cached auth token."""
+    return Store[dict[str, str]](hass, STORAGE_VERSION, f"{DOMAIN}.auth.{host}")
+
+
+async def async_remove_token(hass: HomeAssistant, host: str) -> None:
+    """Remove a gateway's cached auth token."""
+    await _token_store(hass, host).async_remove()
+
+
+class TokenManager:
+    """Keep a gateway auth token cached in a Store and refresh it before it expires.
+
+    The config flow saves the token it validated with, so setup that follows
+    immediately, and setup after a Home Assistant restart, can reuse it
+    instead of logging in again.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: GatewayApiClient) -> None:
+        """Initialize the token manager."""
+        self._hass = hass
+        self._client = client
+        self._store = _token_store(hass, client.host)
+        self._unsub_refresh: CALLBACK_TYPE | None = None
+        self._unsub_listener: CALLBACK_TYPE | None = None
+
+    async def async_load(self) -> bool:
+        """Restore a cached token into the client; return whether one was usable."""
+        data = await self._store.async_load()
+        if not data or data.get("username") != self._client.username:
+            return False
+
+        expiration = dt_util.parse_datetime(data["expiration"])
+        if expiration is None or expiration - dt_util.utcnow() < REFRESH_MARGIN:
+            return False
+
+        self._client.set_token(data["token"], expiration)
+        _LOGGER.debug(f"Reusing cached auth token expiring {expiration}")
+        return True
+
+    async def async_save(self, token: str, expiration: datetime) -> None:
+        """Cache a token."""
+        await self._store.async_save(
+            {"username": self._client.username, "token": token, "expiration": expiration.isoformat()}
+        )
+
+    @callback
+    def async_start(self) -> None:
+        """Persist new tokens as the client obtains them and refresh ahead of expiry."""
+        self._unsub_listener = self._client.add_token_listener(self._handle_new_token)
+        self._schedule_refresh()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop refreshing."""
+        if self._unsub_listener is not None:
+            self._unsub_listener()
+            self._unsub_listener = None
+        if self._unsub_refresh is not None:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+
+    @callback
+    def _handle_new_token(self, token: str, expiration: datetime) -> None:
+        """Save a token obtained by the client and reschedule the refresh."""
+        self._hass.async_create_task(self.async_save(token, expiration))
+        self._schedule_refresh()
+
+    @callback
+    def _schedule_refresh(self, delay: float | None = None) -> None:
+        """Schedule the next proactive refresh."""
+        if self._unsub_refresh is not None:
+            self._unsub_refresh()
+
+        if delay is None:
+            expiration = self._client.token_expiration
+            if expiration is None:
+                # The next request logs in, and the new token reschedules.
+                self._unsub_refresh = None
+                return
+            delay = max(0, (expiration - dt_util.utcnow() - REFRESH_MARGIN).total_seconds())
+
+        self._unsub_refresh = async_call_later(self._hass, delay, self._async_refresh)
+
+    async def _async_refresh(self, _now: datetime) -> None:
+        """Log in again before the current token expires."""
+        self._unsub_refresh = None
+        try:
+            # The new token is saved and the next refresh scheduled by _handle_new_token.
+            await self._client.login()
+        except Exception as exc:
+            _LOGGER.warning(f"Unable to refresh auth token: {str(exc)}")
+            self._schedule_refresh(TOKEN_REFRESH_RETRY_SECONDS)
@@ -1,7 +1,8 @@
 """The Home Assistant T-Mobile Home Internet integration."""
+import asyncio
+import copy
 import json
 import logging
-import time
 
 from typing import Callable, Dict
 
@@ -16,7 +17,10 @@ from .const import (
     DOMAIN,
 )
 
+from .entity import SkipUnchangedStateMixin
 from .utils import (
+    edit_entity_id,
+    edit_state,
     generate_random_hex_string, 
     generate_random_mixed_string, 
     get_ssid_edit_index,
@@ -53,7 +57,7 @@ def _create_entities(hass: HomeAssistant, entry: dict):
     return entities
 
 
-class GatewayButton(CoordinatorEntity, ButtonEntity):
+class GatewayButton(SkipUnchangedStateMixin, CoordinatorEntity, ButtonEntity):
     """Represent a button for the gateway."""
 
     def __init__(self, hass, coordinator, controller):
@@ -61,12 +65,17 @@ class GatewayButton(CoordinatorEntity, ButtonEntity):
         self._hass = hass
         self._coordinator = coordinator
         self._controller = controller
+        self._entry = coordinator.config_entry
         self._entity_type = "button"
         super().__init__(coordinator)
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, coordinator.config_entry.entry_id)},
         )
 
+    def _state_fingerprint(self) -> tuple:
+        """Return the rendered state; a button only shows when it was last pressed."""
+        return ()
+
 
 class GatewayEditSSIDSaveButton(GatewayButton):
     """Represent a button for the gateway."""
@@ -88,66 +97,67 @@ class GatewayEditSSIDSaveButton(GatewayButton):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_edit_ssid_save")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_edit_ssid_save")
 
     async def async_press(self) -> None:
         """Save edits."""
 
-        if self.hass.states.get("switch.t_mobile_edit_ssid_edits_pending").state == 'on':
+        if edit_state(self.hass, self._entry, "switch", "edit_ssid_edits_pending") == 'on':
 
             try:
 
                 # Clear edits pending flag
-                await set_edits_pending(False)
+                await set_edits_pending(self.hass, self._entry, False)
 
                 # Set edits saving flag
-                await set_edits_saving(True)
+                await set_edits_saving(self.hass, self._entry, True)
 
                 # Get the index of the SSID being edited
-                ssid_index = get_ssid_edit_index(self._hass)
+                ssid_index = get_ssid_edit_index(self._hass, self._entry)
 
                 # Get the new values to be saved
-                new_ssid_name = self.hass.states.get("text.t_mobile_edit_ssid_name").state
-                new_ssid_password = self.hass.states.get("text.t_mobile_edit_ssid_password").state
-                new_encryption_version = self.hass.states.get("select.t_mobile_edit_ssid_encryption_version").state
-                new_isBroadcastEnabled = True if self.hass.states.get("switch.t_mobile_edit_ssid_hidden").state == 'off' else False
-                new_guest = True if self.hass.states.get("switch.t_mobile_edit_ssid_guest").state == 'on' else False
-                new_ssid2_4ghz = True if self.hass.states.get("switch.t_mobile_edit_ssid_2_4ghz").state == 'on' else False
-                new_ssid5_0ghz = True if self.hass.states.get("switch.t_mobile_edit_ssid_5_0ghz").state == 'on' else False
+                new_ssid_name = edit_state(self.hass, self._entry, "text", "edit_ssid_name")
+                new_ssid_password = edit_state(self.hass, self._entry, "text", "edit_ssid_password")
+                new_encryption_version = edit_state(self.hass, self._entry, "select", "edit_ssid_encryption_version")
+                new_isBroadcastEnabled = True if edit_state(self.hass, self._entry, "switch", "edit_ssid_hidden") == 'off' else False
+                new_guest = True if edit_state(self.hass, self._entry, "switch", "edit_ssid_guest") == 'on' else False
+                new_ssid2_4ghz = True if edit_state(self.hass, self._entry, "switch", "edit_ssid_2_4ghz") == 'on' else False
+                new_ssid5_0ghz = True if edit_state(self.hass, self._entry, "switch", "edit_ssid_5_0ghz") == 'on' else False
 
                 # Get current gateway values
-                access_point = self._coordinator.data["access_point"]
+                await self._coordinator.async_ensure_section("access_point")
+                ssids = copy.deepcopy(self._coordinator.data["access_point"]["ssids"])
 
                 # Save edited values
-                access_point["ssids"][ssid_index]["ssidName"] = new_ssid_name
-                access_point["ssids"][ssid_index]["wpaKey"] = new_ssid_password
-                access_point["ssids"][ssid_index]["encryptionVersion"] = new_encryption_version
-                access_point["ssids"][ssid_index]["isBroadcastEnabled"] = new_isBroadcastEnabled
-                access_point["ssids"][ssid_index]["guest"] = new_guest
-                access_point["ssids"][ssid_index]["2.4ghzSsid"] = new_ssid2_4ghz
-                access_point["ssids"][ssid_index]["5.0ghzSsid"] = new_ssid5_0ghz
-
-                # Write changes to gateway and refresh coordinator
-                await self._hass.async_add_executor_job(self._controller.set_ap_config, access_point)
-                await self._coordinator.async_request_refresh()
+                ssids[ssid_index]["ssidName"] = new_ssid_name
+                ssids[ssid_index]["wpaKey"] = new_ssid_password
+                ssids[ssid_index]["encryptionVersion"] = new_encryption_version
+                ssids[ssid_index]["isBroadcastEnabled"] = new_isBroadcastEnabled
+                ssids[ssid_index]["guest"] = new_guest
+                ssids[ssid_index]["2.4ghzSsid"] = new_ssid2_4ghz
+                ssids[ssid_index]["5.0ghzSsid"] = new_ssid5_0ghz
+
+                # Write changes to gateway, which updates the coordinator
+                await self._coordinator.access_point_writer.async_write({"ssids": ssids})
 
                 # Set editing controls to current settings - should only be different if failure to update gateway
-                await set_ssid_edit_controls(self._hass, self._coordinator, ssid_index)
+                await set_ssid_edit_controls(self._hass, self._entry, self._coordinator, ssid_index)
 
                 # If change to ssid name, refresh the select control and select newly named option.
-                current_ssid_name = access_point["ssids"][ssid_index]["ssidName"]
-                select_ssid_name = self.hass.states.get("select.t_mobile_edit_ssids").state
+                current_ssid_name = self._coordinator.data["access_point"]["ssids"][ssid_index]["ssidName"]
+                select_ssid_name = edit_state(self.hass, self._entry, "select", "edit_ssids")
                 if current_ssid_name != select_ssid_name:
-                    await update_entity("select.t_mobile_edit_ssids")
+                    select_entity_id = edit_entity_id(self.hass, self._entry, "select", "edit_ssids")
+                    await update_entity(self.hass, select_entity_id)
 
                     # Delay is necessary to allow entity to stabilize.
-                    await self.hass.async_add_executor_job(time.sleep, 0.05)
+                    await asyncio.sleep(0.05)
 
-                    await select_option("select.t_mobile_edit_ssids", current_ssid_name)
+                    await select_option(self.hass, select_entity_id, current_ssid_name)
 
             finally:
                 # Clear edits saving flag
-                await set_edits_saving(False)
+                await set_edits_saving(self.hass, self._entry, False)
 
 
 class GatewayEditSSIDCancelButton(GatewayButton):
@@ -170,17 +180,17 @@ class GatewayEditSSIDCancelButton(GatewayButton):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_edit_ssid_cancel")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_edit_ssid_cancel")
 
     async def async_press(self) -> None:
         """Cancel edits."""
-        if self.hass.states.get("switch.t_mobile_edit_ssid_edits_pending").state == 'on':
+        if edit_state(self.hass, self._entry, "switch", "edit_ssid_edits_pending") == 'on':
 
             # Get the index of the SSID being edited
-            ssid_index = get_ssid_edit_index(self._hass)
+            ssid_index = get_ssid_edit_index(self._hass, self._entry)
 
             # Restore the original values
-            await set_ssid_edit_controls(self._hass, self._coordinator, ssid_index)
+            await set_ssid_edit_controls(self._hass, self._entry, self._coordinator, ssid_index)
 
 
 class GatewayEditSSIDsDeleteButton(GatewayButton):
@@ -203,35 +213,35 @@ class GatewayEditSSIDsDeleteButton(GatewayButton):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_edit_ssids_delete")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_edit_ssids_delete")
 
     async def async_press(self) -> None:
         """Delete SSID."""
         # Set edits saving flag
-        await set_edits_saving(True)
+        await set_edits_saving(self.hass, self._entry, True)
 
         try:
 
             # Get the index of the SSID being edited
-            ssid_index = get_ssid_edit_index(self._hass)
+            ssid_index = get_ssid_edit_index(self._hass, self._entry)
 
             if ssid_index > 0:
                 # Get current gateway values
-                access_point = self._coordinator.data["access_point"]
+                await self._coordinator.async_ensure_section("access_point")
+                ssids = list(self._coordinator.data["access_point"]["ssids"])
 
                 # Delete the SSID
-                del access_point["ssids"][ssid_index]
+                del ssids[ssid_index]
 
-                # Write changes to gateway and refresh coordinator
-                await self._hass.async_add_executor_job(self._controller.set_ap_config, access_point)
-                await self._coordinator.async_request_refresh()
+                # Write changes to gateway, which updates the coordinator
+                await self._coordinator.access_point_writer.async_write({"ssids": ssids})
 
                 # Refresh the select control
-                await update_entity("select.t_mobile_edit_ssids")
+                await update_entity(self.hass, edit_entity_id(self.hass, self._entry, "select", "edit_ssids"))
 
         finally:
             # Clear edits saving flag
-            await set_edits_saving(False)
+            await set_edits_saving(self.hass, self._entry, False)
 
 
 class GatewayEditSSIDsAddButton(GatewayButton):
@@ -254,14 +264,15 @@ class GatewayEditSSIDsAddButton(GatewayButton):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_edit_ssids_add")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_edit_ssids_add")
 
     async def async_press(self) -> None:
         """Create new SSID."""
         # Set edits saving flag
-        await set_edits_saving(True)
+        await set_edits_saving(self.hass, self._entry, True)
 
         try:
+            await self._coordinator.async_ensure_section("access_point")
             access_point = self._coordinator.data["access_point"]
 
             if len(access_point["ssids"]) < 4:
@@ -277,21 +288,21 @@ class GatewayEditSSIDsAddButton(GatewayButton):
                 new_ssid["2.4ghzSsid"] = True
                 new_ssid["5.0ghzSsid"] = True
 
-                access_point["ssids"].append(new_ssid)
-
-                # Write changes to gateway and refresh coordinator
-                await self._hass.async_add_executor_job(self._controller.set_ap_config, access_point)
-                await self._coordinator.async_request_refresh()
+                # Write changes to gateway, which updates the coordinator
+                await self._coordinator.access_point_writer.async_write(
+                    {"ssids": [*access_point["ssids"], new_ssid]}
+                )
 
                 # Refresh select entity with new options.
-                await update_entity("select.t_mobile_edit_ssids")
+                select_entity_id = edit_entity_id(self.hass, self._entry, "select", "edit_ssids")
+                await update_entity(self.hass, select_entity_id)
 
                 # Delay is necessary to allow entity to stabilize.
-                await self.hass.async_add_executor_job(time.sleep, 0.05)
+                await asyncio.sleep(0.05)
 
                 # Set editing controls to new entry.
-                await select_option("select.t_mobile_edit_ssids", new_ssid["ssidName"])
+                await select_option(self.hass, select_entity_id, new_ssid["ssidName"])
 
         finally:
             # Clear edits saving flag
-            await set_edits_saving(False)
+            await set_edits_saving(self.hass, self._entry, False)
@@ -0,0 +1,163 @@
+"""Per-cell quality index for the Home Assistant T-Mobile Home Internet integration."""
+from __future__ import annotations
+
+from collections import OrderedDict
+import math
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import CELL_INDEX_MAX_GAP_SECONDS, CELL_INDEX_SAVE_DELAY_SECONDS
+
+# Generations whose cells are indexed, and the metrics kept for each cell.
+INDEX_GENERATIONS = ("4g", "5g")
+INDEX_METRICS = ("rsrp", "sinr")
+
+
+class CellIndex:
+    """Running statistics for each cell the gateway has used, keyed by generation and ECGI.
+
+    Each sample updates the current cell's record in place: its last seen
+    time, its dwell time, and the count, mean and sum of squares of its RSRP
+    and SINR (Welford's algorithm). Moving to a different cell counts a
+    handover onto it. At most capacity cells are kept, evicting the least
+    recently seen. The index is saved to a Store CELL_INDEX_SAVE_DELAY_SECONDS
+    after the first change since the last save, rather than on every sample,
+    and saved at once by async_save before the entry unloads.
+    """
+
+    def __init__(self, store: Store, capacity: int) -> None:
+        """Initialize the index."""
+        self._store = store
+        self.capacity = capacity
+        self._cells: OrderedDict[tuple[str, str], dict[str, Any]] = OrderedDict()
+        self._current: dict[str, tuple[str, float]] = {}
+        self._save_pending = False
+
+    def __len__(self) -> int:
+        """Return the number of cells indexed."""
+        return len(self._cells)
+
+    async def async_load(self) -> None:
+        """Load the index saved by a previous run."""
+        for record in await self._store.async_load() or []:
+            self._cells[(record["generation"], record["ecgi"])] = record
+
+    async def async_save(self) -> None:
+        """Save the index now."""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _data_to_save(self) -> list[dict[str, Any]]:
+        """Return the records to save, least recently seen first."""
+        self._save_pending = False
+        return list(self._cells.values())
+
+    @callback
+    def process(self, timestamp: float, cell: dict[str, Any]) -> list[dict[str, Any]]:
+        """Add a sample to the index; return a description of each handover it shows."""
+        handovers = []
+
+        for generation in INDEX_GENERATIONS:
+            data = cell.get(generation) or {}
+            if not (ecgi := data.get("ecgi")):
+                # The generation is not in use, so the next cell seen is not a handover.
+                self._current.pop(generation, None)
+                continue
+
+            key = (generation, ecgi)
+            record = self._cells.get(key)
+            if record is None:
+                record = self._cells[key] = {
+                    "generation": generation,
+                    "ecgi": ecgi,
+                    "first_seen": timestamp,
+                    "last_seen": timestamp,
+                    "dwell_seconds": 0.0,
+                    "handovers": 0,
+                    **{metric: {"count": 0, "mean": 0.0, "m2": 0.0} for metric in INDEX_METRICS},
+                }
+            self._cells.move_to_end(key)
+
+            previous = self._current.get(generation)
+            if previous is not None and previous[0] != ecgi:
+                record["handovers"] += 1
+                handovers.append({
+                    "generation": generation,
+                    "from_ecgi": previous[0],
+                    "to_ecgi": ecgi,
+                    "dwell": round(timestamp - previous[1], 1),
+                })
+            if previous is None or previous[0] != ecgi:
+                self._current[generation] = (ecgi, timestamp)
+            elif timestamp - record["last_seen"] <= CELL_INDEX_MAX_GAP_SECONDS:
+                # Time between samples only counts if polling was not interrupted.
+                record["dwell_seconds"] += timestamp - record["last_seen"]
+            record["last_seen"] = timestamp
+
+            sector = data.get("sector") or {}
+            for metric in INDEX_METRICS:
+                if (value := sector.get(metric)) is None:
+                    continue
+                stats = record[metric]
+                stats["count"] += 1
+                delta = value - stats["mean"]
+                stats["mean"] += delta / stats["count"]
+                stats["m2"] += delta * (value - stats["mean"])
+
+        while len(self._cells) > self.capacity:
+            self._cells.popitem(last=False)
+
+        # Each call would restart the delay, which samples come too often to let expire.
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, CELL_INDEX_SAVE_DELAY_SECONDS)
+        return handovers
+
+    def ranking(self, generation: str | None = None, limit: int | None = None) -> list[dict[str, Any]]:
+        """Return the cells, best first, ranked by mean SINR and then mean RSRP.
+
+        Cells without signal samples are ranked last.
+        """
+
+        def quality(record: dict[str, Any]) -> tuple:
+            sinr, rsrp = record["sinr"], record["rsrp"]
+            return (
+                sinr["count"] > 0 or rsrp["count"] > 0,
+                sinr["mean"] if sinr["count"] else -math.inf,
+                rsrp["mean"] if rsrp["count"] else -math.inf,
+            )
+
+        records = [
+            record for record in self._cells.values()
+            if generation is None or record["generation"] == generation
+        ]
+        records.sort(key=quality, reverse=True)
+        current = {(current_generation, ecgi) for current_generation, (ecgi, _) in self._current.items()}
+        return [
+            self._describe(record, (record["generation"], record["ecgi"]) in current)
+            for record in records[:limit]
+        ]
+
+    @staticmethod
+    def _describe(record: dict[str, Any], current: bool) -> dict[str, Any]:
+        """Return a record for display."""
+        description = {
+            "generation": record["generation"],
+            "ecgi": record["ecgi"],
+            "current": current,
+            "first_seen": dt_util.utc_from_timestamp(record["first_seen"]).isoformat(),
+            "last_seen": dt_util.utc_from_timestamp(record["last_seen"]).isoformat(),
+            "dwell_seconds": round(record["dwell_seconds"]),
+            "handovers": record["handovers"],
+        }
+        for metric in INDEX_METRICS:
+            stats = record[metric]
+            description[metric] = {
+                "mean": round(stats["mean"], 1) if stats["count"] else None,
+                "stdev": round(math.sqrt(stats["m2"] / (stats["count"] - 1)), 1) if stats["count"] > 1 else None,
+                "samples": stats["count"],
+            }
+        return description
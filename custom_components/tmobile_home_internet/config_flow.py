@@ -4,27 +4,50 @@ from __future__ import annotations
 import asyncio
 import logging
 
-from requests import ConnectionError,HTTPError
 from typing import Any
 
+import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.const import CONF_USERNAME, CONF_PASSWORD
-
-import pytmhi
-
-from .const import DOMAIN
+from homeassistant.const import CONF_HOST, CONF_USERNAME, CONF_PASSWORD
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .api import GatewayApiClient, GatewayAuthError
+from .auth import TokenManager
+from .const import (
+    CONF_HEARTBEAT_MINUTES,
+    CONF_MIN_PUBLISH_SECONDS,
+    CONF_OVERSAMPLING,
+    CONF_PUBLISH_SECONDS,
+    CONF_RSRP_DEADBAND,
+    CONF_RSRQ_DEADBAND,
+    CONF_SAMPLE_SECONDS,
+    CONF_SINR_DEADBAND,
+    CONF_STALE_SECTION_SECONDS,
+    CONF_STATISTICS_MINUTES,
+    DEFAULT_HEARTBEAT_MINUTES,
+    DEFAULT_HOST,
+    DEFAULT_MIN_PUBLISH_SECONDS,
+    DEFAULT_OVERSAMPLING,
+    DEFAULT_PUBLISH_SECONDS,
+    DEFAULT_SAMPLE_SECONDS,
+    DEFAULT_SIGNAL_DEADBAND,
+    DEFAULT_STALE_SECTION_SECONDS,
+    DEFAULT_STATISTICS_MINUTES,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_USERNAME): str,
-        vol.Required(CONF_PASSWORD): str
+        vol.Required(CONF_PASSWORD): str,
+        vol.Optional(CONF_HOST, default=DEFAULT_HOST): str,
     }
 )
 
@@ -34,10 +57,16 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
 
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
     """
-    controller = pytmhi.TmiApiClient(data[CONF_USERNAME], data[CONF_PASSWORD])
+    controller = GatewayApiClient(
+        async_get_clientsession(hass), data[CONF_USERNAME], data[CONF_PASSWORD], data[CONF_HOST]
+    )
 
     # Request some data to validate username/password.
-    await hass.async_add_executor_job(controller.auth_token)
+    async with asyncio.timeout(10):
+        token = await controller.auth_token()
+
+    # Cache the token so setup can use it without logging in again.
+    await TokenManager(hass, controller).async_save(token, controller.token_expiration)
 
     # Return info that you want to store in the config entry.
     return {"title": "T-Mobile Home Internet"}
@@ -54,17 +83,22 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle the initial step."""
         errors: dict[str, str] = {}
         if user_input is not None:
+            # One entry per gateway.
+            await self.async_set_unique_id(user_input[CONF_HOST])
+            self._abort_if_unique_id_configured()
+
             try:
                 info = await validate_input(self.hass, user_input)
-            except HTTPError as exc:
-                _LOGGER.exception(f"HTTPError: {str(exc)}")
-                if exc.response.status_code == 401:
-                    errors["base"] = "invalid_auth"
-                elif exc.response.status_code == 404:
+            except GatewayAuthError as exc:
+                _LOGGER.exception(f"GatewayAuthError: {str(exc)}")
+                errors["base"] = "invalid_auth"
+            except aiohttp.ClientResponseError as exc:
+                _LOGGER.exception(f"ClientResponseError: {str(exc)}")
+                if exc.status == 404:
                     errors["base"] = "cannot_connect"
                 else:
                     errors["base"] = "unknown"
-            except ConnectionError as exc:
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
                 _LOGGER.exception(exc)
                 errors["base"] = "cannot_connect"
             except Exception as exc: # pylint: disable=broad-except
@@ -76,3 +110,71 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler()
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle options for Home Assistant T-Mobile Home Internet."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_STALE_SECTION_SECONDS,
+                        default=options.get(CONF_STALE_SECTION_SECONDS, DEFAULT_STALE_SECTION_SECONDS),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+                    vol.Required(
+                        CONF_RSRP_DEADBAND,
+                        default=options.get(CONF_RSRP_DEADBAND, DEFAULT_SIGNAL_DEADBAND),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=30)),
+                    vol.Required(
+                        CONF_RSRQ_DEADBAND,
+                        default=options.get(CONF_RSRQ_DEADBAND, DEFAULT_SIGNAL_DEADBAND),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=30)),
+                    vol.Required(
+                        CONF_SINR_DEADBAND,
+                        default=options.get(CONF_SINR_DEADBAND, DEFAULT_SIGNAL_DEADBAND),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=30)),
+                    vol.Required(
+                        CONF_MIN_PUBLISH_SECONDS,
+                        default=options.get(CONF_MIN_PUBLISH_SECONDS, DEFAULT_MIN_PUBLISH_SECONDS),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Required(
+                        CONF_HEARTBEAT_MINUTES,
+                        default=options.get(CONF_HEARTBEAT_MINUTES, DEFAULT_HEARTBEAT_MINUTES),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                    vol.Required(
+                        CONF_OVERSAMPLING,
+                        default=options.get(CONF_OVERSAMPLING, DEFAULT_OVERSAMPLING),
+                    ): bool,
+                    vol.Required(
+                        CONF_SAMPLE_SECONDS,
+                        default=options.get(CONF_SAMPLE_SECONDS, DEFAULT_SAMPLE_SECONDS),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=2, max=60)),
+                    vol.Required(
+                        CONF_PUBLISH_SECONDS,
+                        default=options.get(CONF_PUBLISH_SECONDS, DEFAULT_PUBLISH_SECONDS),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10, max=3600)),
+                    vol.Required(
+                        CONF_STATISTICS_MINUTES,
+                        default=options.get(CONF_STATISTICS_MINUTES, DEFAULT_STATISTICS_MINUTES),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+                }
+            ),
+        )
@@ -6,10 +6,94 @@ from homeassistant.helpers import config_validation as cv
 from typing import Final
 
 DOMAIN: Final = "tmobile_home_internet"
-GET_ACCESS_POINT_RETRIES: Final = 20
-GET_ACCESS_POINT_RETRY_SECONDS: Final = 4
+DEFAULT_HOST: Final = "192.168.12.1"
 FAST_POLL_SECONDS: Final = 10
+FAST_POLL_MIN_SECONDS: Final = 5
+FAST_POLL_MAX_SECONDS: Final = 60
 SLOW_POLL_SECONDS: Final = 60
+SLOW_POLL_MIN_SECONDS: Final = 60
+SLOW_POLL_MAX_SECONDS: Final = 600
+SIGNAL_VOLATILITY_DB: Final = 3
+POLL_RELAX_FACTOR: Final = 1.5
+RESPONSE_TIME_SMOOTHING: Final = 0.3
+GATEWAY_DUTY_CYCLE: Final = 0.1
+ENDPOINT_TIMEOUT_SECONDS: Final = 10
+ACCESS_POINT_TIMEOUT_SECONDS: Final = 30
+# Access point changes made within this long of each other are written together.
+AP_WRITE_WINDOW_SECONDS: Final = 1
+# After a write, the gateway is polled at doubling intervals until it reports the changes.
+AP_CONFIRM_INITIAL_DELAY_SECONDS: Final = 2
+AP_CONFIRM_MAX_DELAY_SECONDS: Final = 15
+AP_CONFIRM_TIMEOUT_SECONDS: Final = 120
+# A queue of access point changes the gateway keeps timing out on is retried at doubling
+# intervals, and dropped after this many replays.
+AP_QUEUE_MAX_REPLAYS: Final = 10
+AP_QUEUE_REPLAY_INITIAL_DELAY_SECONDS: Final = 60
+AP_QUEUE_REPLAY_MAX_DELAY_SECONDS: Final = 3600
+ACCESS_POINT_RETRY_BUDGET_SECONDS: Final = 25
+RETRY_INITIAL_DELAY_SECONDS: Final = 1
+RETRY_MAX_DELAY_SECONDS: Final = 8
+RESPONSE_CACHE_SECONDS: Final = 5
+SIM_REFRESH_SECONDS: Final = 3600
+MAX_CONCURRENT_REQUESTS: Final = 8
+MAX_GATEWAY_REQUESTS: Final = 2
+REQUEST_TIMEOUT_SECONDS: Final = 15
+STUCK_REQUEST_SECONDS: Final = 60
+BREAKER_FAILURE_THRESHOLD: Final = 3
+BREAKER_PROBE_MIN_SECONDS: Final = 5
+BREAKER_PROBE_MAX_SECONDS: Final = 300
+PROBE_TIMEOUT_SECONDS: Final = 5
+REBOOT_DOWN_PROBE_SECONDS: Final = 2
+REBOOT_DOWN_TIMEOUT_SECONDS: Final = 60
+REBOOT_UP_PROBE_MAX_SECONDS: Final = 30
+REBOOT_UP_TIMEOUT_SECONDS: Final = 600
+
+EVENT_GATEWAY_REBOOTED: Final = f"{DOMAIN}_gateway_rebooted"
+EVENT_SIGNAL_DEGRADED: Final = f"{DOMAIN}_signal_degraded"
+EVENT_SIGNAL_RECOVERED: Final = f"{DOMAIN}_signal_recovered"
+EVENT_CELL_HANDOVER: Final = f"{DOMAIN}_cell_handover"
+
+DATA_REQUEST_POOL: Final = f"{DOMAIN}_request_pool"
+
+CONF_STALE_SECTION_SECONDS: Final = "stale_section_seconds"
+DEFAULT_STALE_SECTION_SECONDS: Final = 300
+CONF_RSRP_DEADBAND: Final = "rsrp_deadband"
+CONF_RSRQ_DEADBAND: Final = "rsrq_deadband"
+CONF_SINR_DEADBAND: Final = "sinr_deadband"
+DEFAULT_SIGNAL_DEADBAND: Final = 0
+CONF_MIN_PUBLISH_SECONDS: Final = "min_publish_seconds"
+DEFAULT_MIN_PUBLISH_SECONDS: Final = 0
+CONF_HEARTBEAT_MINUTES: Final = "heartbeat_minutes"
+DEFAULT_HEARTBEAT_MINUTES: Final = 15
+CONF_OVERSAMPLING: Final = "oversampling"
+DEFAULT_OVERSAMPLING: Final = False
+CONF_SAMPLE_SECONDS: Final = "sample_seconds"
+DEFAULT_SAMPLE_SECONDS: Final = 5
+CONF_PUBLISH_SECONDS: Final = "publish_seconds"
+DEFAULT_PUBLISH_SECONDS: Final = 60
+CONF_STATISTICS_MINUTES: Final = "statistics_minutes"
+DEFAULT_STATISTICS_MINUTES: Final = 15
+
+# Cell signal metrics, as reported in each generation's "sector".
+SIGNAL_METRICS: Final = ("rsrp", "rsrq", "sinr")
+
+# 24 hours of samples at the default fast poll interval.
+CELL_HISTORY_CAPACITY: Final = 8640
+
+# Signal degradation detection. The baseline follows roughly the last 40 samples.
+DETECTOR_SMOOTHING: Final = 0.05
+DETECTOR_WARMUP_SAMPLES: Final = 30
+DETECTOR_MIN_STDEV: Final = 1.0
+DETECTOR_Z_THRESHOLD: Final = 4.0
+DETECTOR_CUSUM_SLACK: Final = 0.5
+DETECTOR_CUSUM_THRESHOLD: Final = 5.0
+DETECTOR_RECOVERY_SAMPLES: Final = 3
+
+# Cells kept in the per-cell quality index, least recently seen evicted first.
+CELL_INDEX_CAPACITY: Final = 256
+CELL_INDEX_SAVE_DELAY_SECONDS: Final = 60
+# Longer gaps between samples, such as while the gateway is unreachable, do not count as dwell time.
+CELL_INDEX_MAX_GAP_SECONDS: Final = 120
 
 SSID_NAME_PATTERN: Final = r'^[A-Za-z0-9!"#%' + r"',-\/:=@^_~]{1,28}$"
 SSID_PASSWORD_PATTERN: Final = r'^[A-Za-z0-9!"#$%&' + r"'()*+,\-\.\/;<=>?@\[\]^_`|}{~]{8,63}$"
@@ -17,7 +101,12 @@ SSID_PASSWORD_PATTERN: Final = r'^[A-Za-z0-9!"#$%&' + r"'()*+,\-\.\/;<=>?@\[\]^_
 STORAGE_VERSION: Final = 1
 STORAGE_KEY: Final = DOMAIN
 
-SCHEMA_SERVICE_REBOOT_GATEWAY: Final = {}
+TOKEN_REFRESH_MARGIN_SECONDS: Final = 60
+TOKEN_REFRESH_RETRY_SECONDS: Final = 30
+
+SCHEMA_SERVICE_REBOOT_GATEWAY: Final = {
+    vol.Optional("wait", default=False): cv.boolean,
+}
 
 SCHEMA_SERVICE_ENABLE_24_WIFI: Final = {
     vol.Required("enabled"): cv.boolean,
@@ -62,6 +151,88 @@ SCHEMA_SERVICE_GET_GATEWAY_SIM_CARD: Final = {}
 
 SCHEMA_SERVICE_GET_CELL_STATUS: Final = {}
 
+SCHEMA_SERVICE_GET_CELL_HISTORY: Final = {
+    vol.Optional("minutes", default=60): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+    vol.Optional("include_samples", default=False): cv.boolean,
+}
+
+# Channels the gateway offers on each band, as it names them.
+WIFI_CHANNELS: Final = {
+    "2.4ghz": ["Auto", *(str(channel) for channel in range(1, 12))],
+    "5.0ghz": ["Auto", "36", "40", "44", "48", "52", "56", "60", "64", "100", "104", "108", "112", "116", "120", "124", "128", "132", "136", "140", "144", "149", "153", "157", "161", "165"],
+    "6.0ghz": ["Auto", *(str(channel) for channel in range(1, 234, 4))],
+}
+
+# A JSON merge patch against the access point config. Values cannot be null: no setting can be removed.
+# As in any merge patch, "ssids" replaces the whole list, so each SSID must be given in full.
+def _radio_patch_schema(band: str) -> vol.Schema:
+    """Return the schema of a merge patch against one band's radio settings."""
+    return vol.Schema({
+        vol.Optional("isRadioEnabled"): cv.boolean,
+        vol.Optional("channel"): vol.All(cv.string, vol.In(WIFI_CHANNELS[band])),
+        vol.Optional("channelBandwidth"): vol.In(["Auto", "20MHz", "40MHz", "80MHz", "160MHz"]),
+        vol.Optional("transmissionPower"): vol.In(["50%", "100%"]),
+        vol.Optional("airtimeFairness"): cv.boolean,
+        vol.Optional("isMUMIMOEnabled"): cv.boolean,
+        vol.Optional("isWMMEnabled"): cv.boolean,
+    })
+
+SSID_SCHEMA: Final = vol.Schema({
+    vol.Required("ssidName"): vol.All(cv.string, vol.Match(SSID_NAME_PATTERN)),
+    vol.Required("wpaKey"): vol.All(cv.string, vol.Match(SSID_PASSWORD_PATTERN)),
+    vol.Optional("encryptionMode", default="AES"): vol.In(["AES"]),
+    vol.Optional("encryptionVersion", default="WPA2/WPA3"): vol.In(["WPA2/WPA3", "WPA2"]),
+    vol.Optional("isBroadcastEnabled", default=True): cv.boolean,
+    vol.Optional("guest", default=False): cv.boolean,
+    vol.Optional("2.4ghzSsid", default=True): cv.boolean,
+    vol.Optional("5.0ghzSsid", default=True): cv.boolean,
+    vol.Optional("6.0ghzSsid"): cv.boolean,
+})
+
+ACCESS_POINT_PATCH_SCHEMA: Final = vol.Schema({
+    vol.Optional("2.4ghz"): _radio_patch_schema("2.4ghz"),
+    vol.Optional("5.0ghz"): _radio_patch_schema("5.0ghz"),
+    vol.Optional("6.0ghz"): _radio_patch_schema("6.0ghz"),
+    vol.Optional("bandSteering"): vol.Schema({vol.Optional("isEnabled"): cv.boolean}),
+    vol.Optional("ssids"): vol.All(cv.ensure_list, vol.Length(min=1, max=4), [SSID_SCHEMA]),
+})
+
+SCHEMA_SERVICE_APPLY_ACCESS_POINT_PATCH: Final = {
+    vol.Required("patch"): ACCESS_POINT_PATCH_SCHEMA,
+}
+
+SCHEMA_SERVICE_CREATE_SSID: Final = {
+    vol.Required("ssid_name"): vol.All(cv.string, vol.Match(SSID_NAME_PATTERN)),
+    vol.Required("password"): vol.All(cv.string, vol.Match(SSID_PASSWORD_PATTERN)),
+    vol.Optional("encryption_version", default="WPA2/WPA3"): vol.In(["WPA2/WPA3", "WPA2"]),
+    vol.Optional("hidden", default=False): cv.boolean,
+    vol.Optional("guest", default=False): cv.boolean,
+    vol.Optional("wifi24ghz", default=True): cv.boolean,
+    vol.Optional("wifi50ghz", default=True): cv.boolean,
+    vol.Optional("wifi60ghz"): cv.boolean,
+}
+
+SCHEMA_SERVICE_UPDATE_SSID: Final = {
+    vol.Required("ssid_name"): cv.string,
+    vol.Optional("new_ssid_name"): vol.All(cv.string, vol.Match(SSID_NAME_PATTERN)),
+    vol.Optional("password"): vol.All(cv.string, vol.Match(SSID_PASSWORD_PATTERN)),
+    vol.Optional("encryption_version"): vol.In(["WPA2/WPA3", "WPA2"]),
+    vol.Optional("hidden"): cv.boolean,
+    vol.Optional("guest"): cv.boolean,
+    vol.Optional("wifi24ghz"): cv.boolean,
+    vol.Optional("wifi50ghz"): cv.boolean,
+    vol.Optional("wifi60ghz"): cv.boolean,
+}
+
+SCHEMA_SERVICE_DELETE_SSID: Final = {
+    vol.Required("ssid_name"): cv.string,
+}
+
+SCHEMA_SERVICE_GET_CELL_RANKING: Final = {
+    vol.Optional("generation"): vol.In(["4g", "5g"]),
+    vol.Optional("limit"): vol.All(vol.Coerce(int), vol.Range(min=1, max=256)),
+}
+
 SERVICE_REBOOT_GATEWAY: Final = "reboot_gateway"
 SERVICE_ENABLE_24_WIFI: Final = "wifi24ghz_enable"
 SERVICE_ENABLE_50_WIFI: Final = "wifi50ghz_enable"
@@ -77,6 +248,12 @@ SERVICE_GET_GATEWAY: Final = "get_gateway"
 SERVICE_GET_GATEWAY_CLIENTS: Final = "get_gateway_clients"
 SERVICE_GET_GATEWAY_SIM_CARD: Final = "get_gateway_sim_card"
 SERVICE_GET_CELL_STATUS: Final = "get_cell_status"
+SERVICE_GET_CELL_HISTORY: Final = "get_cell_history"
+SERVICE_GET_CELL_RANKING: Final = "get_cell_ranking"
+SERVICE_APPLY_ACCESS_POINT_PATCH: Final = "apply_access_point_patch"
+SERVICE_CREATE_SSID: Final = "create_ssid"
+SERVICE_UPDATE_SSID: Final = "update_ssid"
+SERVICE_DELETE_SSID: Final = "delete_ssid"
 
 class GatewayDeviceEntityFeature(IntFlag):
     """Supported features of the gateway device entity."""
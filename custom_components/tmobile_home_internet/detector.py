@@ -0,0 +1,123 @@
+"""Signal degradation detection for the Home Assistant T-Mobile Home Internet integration."""
+from __future__ import annotations
+
+import math
+from typing import Any
+
+from .const import (
+    DETECTOR_CUSUM_SLACK,
+    DETECTOR_CUSUM_THRESHOLD,
+    DETECTOR_MIN_STDEV,
+    DETECTOR_RECOVERY_SAMPLES,
+    DETECTOR_SMOOTHING,
+    DETECTOR_WARMUP_SAMPLES,
+    DETECTOR_Z_THRESHOLD,
+)
+
+# Metrics watched for drops, as (generation, metric) pairs.
+DETECTOR_METRICS = (("4g", "rsrp"), ("4g", "sinr"), ("5g", "rsrp"), ("5g", "sinr"))
+
+
+class MetricDetector:
+    """Detect a drop in one metric against an exponentially weighted baseline.
+
+    The baseline mean and variance are exponentially weighted moving
+    averages. Each sample's z-score against the baseline feeds a one-sided
+    CUSUM, which accumulates evidence of a sustained drop. The metric is
+    degraded when the CUSUM passes DETECTOR_CUSUM_THRESHOLD, or at once when
+    a single sample is DETECTOR_Z_THRESHOLD deviations below the baseline.
+    While degraded the baseline is frozen, and the metric recovers after
+    DETECTOR_RECOVERY_SAMPLES samples within one deviation of it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the detector."""
+        self.mean: float | None = None
+        self.variance = 0.0
+        self.samples = 0
+        self.cusum = 0.0
+        self.degraded = False
+        self.degraded_at: float | None = None
+        self._recovering = 0
+
+    @property
+    def stdev(self) -> float:
+        """Return the baseline deviation, floored so integer readings do not look volatile."""
+        return max(DETECTOR_MIN_STDEV, math.sqrt(self.variance))
+
+    def _update_baseline(self, value: float) -> None:
+        """Fold a sample into the baseline."""
+        if self.mean is None:
+            self.mean = value
+            return
+        delta = value - self.mean
+        self.mean += DETECTOR_SMOOTHING * delta
+        self.variance = (1 - DETECTOR_SMOOTHING) * (self.variance + DETECTOR_SMOOTHING * delta * delta)
+
+    def process(self, timestamp: float, value: float) -> tuple[str, dict[str, Any]] | None:
+        """Process a sample; return ("degraded" or "recovered", details) on a change."""
+        self.samples += 1
+        if self.mean is None or self.samples <= DETECTOR_WARMUP_SAMPLES:
+            self._update_baseline(value)
+            return None
+
+        z_score = (value - self.mean) / self.stdev
+        details = {"value": value, "baseline": round(self.mean, 1), "z_score": round(z_score, 1)}
+
+        if self.degraded:
+            self._recovering = self._recovering + 1 if z_score >= -1 else 0
+            if self._recovering < DETECTOR_RECOVERY_SAMPLES:
+                return None
+            duration = timestamp - self.degraded_at
+            self.degraded = False
+            self.degraded_at = None
+            self.cusum = 0.0
+            self._recovering = 0
+            return "recovered", details | {"duration": round(duration, 1)}
+
+        self.cusum = max(0.0, self.cusum - z_score - DETECTOR_CUSUM_SLACK)
+        if z_score <= -DETECTOR_Z_THRESHOLD:
+            reason = "z_score"
+        elif self.cusum >= DETECTOR_CUSUM_THRESHOLD:
+            reason = "cusum"
+        else:
+            self._update_baseline(value)
+            return None
+
+        self.degraded = True
+        self.degraded_at = timestamp
+        self._recovering = 0
+        return "degraded", details | {"reason": reason, "cusum": round(self.cusum, 1)}
+
+
+class SignalDetector:
+    """Watch cell samples for drops in RSRP or SINR and for loss of 5G."""
+
+    def __init__(self) -> None:
+        """Initialize the detector."""
+        self._metrics = {key: MetricDetector() for key in DETECTOR_METRICS}
+        self._had_5g = False
+        self._lost_5g_at: float | None = None
+
+    def process(self, timestamp: float, cell: dict[str, Any]) -> list[tuple[str, dict[str, Any]]]:
+        """Process a sample; return the ("degraded" or "recovered", details) changes it caused."""
+        changes = []
+
+        has_5g = "5g" in cell
+        if self._had_5g and not has_5g:
+            self._lost_5g_at = timestamp
+            changes.append(("degraded", {"generation": "5g", "metric": "connection", "reason": "lost"}))
+        elif has_5g and self._lost_5g_at is not None:
+            duration = round(timestamp - self._lost_5g_at, 1)
+            self._lost_5g_at = None
+            changes.append(("recovered", {"generation": "5g", "metric": "connection", "duration": duration}))
+        self._had_5g = has_5g
+
+        for (generation, metric), detector in self._metrics.items():
+            if generation not in cell or (value := cell[generation]["sector"].get(metric)) is None:
+                continue
+            if (change := detector.process(timestamp, value)) is not None:
+                kind, details = change
+                changes.append((kind, {"generation": generation, "metric": metric} | details))
+
+        return changes
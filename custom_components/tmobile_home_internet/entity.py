@@ -0,0 +1,50 @@
+"""Entity helpers for the Home Assistant T-Mobile Home Internet integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import callback
+
+
+class SkipUnchangedStateMixin:
+    """Skip coordinator updates that do not change what an entity shows.
+
+    Mixed into the platform base classes ahead of CoordinatorEntity. An
+    entity whose section of the data is unchanged since the last update, and
+    whose availability is unchanged, is skipped without rendering anything.
+    Otherwise its rendered state is compared with the last state it wrote,
+    and it only writes if they differ.
+    """
+
+    _section: str | None = None
+    _last_fingerprint: tuple | None = None
+
+    def _state_fingerprint(self) -> tuple[Any, ...]:
+        """Return the parts of the rendered state that are written to Home Assistant."""
+        raise NotImplementedError
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        """Return the availability and, if available, the rendered state."""
+        if not self.available:
+            return (False,)
+        return (True, *self._state_fingerprint())
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Remember what was written, then write it."""
+        self._last_fingerprint = self._fingerprint()
+        super().async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if the rendered state changed."""
+        if (
+            self._section is not None
+            and self._section not in self.coordinator.changed_sections
+            and self._last_fingerprint is not None
+            and self._last_fingerprint[0] == self.available
+        ):
+            return
+        if self._fingerprint() == self._last_fingerprint:
+            return
+        super()._handle_coordinator_update()
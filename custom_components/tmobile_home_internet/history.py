@@ -0,0 +1,155 @@
+"""In-memory cell history for the Home Assistant T-Mobile Home Internet integration."""
+from __future__ import annotations
+
+from array import array
+import math
+import statistics
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import SIGNAL_METRICS
+
+GENERATIONS = ("4g", "5g")
+
+# Numeric fields kept per generation, in addition to the ECGI.
+HISTORY_FIELDS = (*SIGNAL_METRICS, "bandwidth")
+
+_MISSING_ECGI = -1
+
+
+def _parse_bandwidth(bandwidth: str | None) -> float:
+    """Return a bandwidth such as "20M" in MHz, or NaN."""
+    try:
+        return float(bandwidth.rstrip("M"))
+    except (AttributeError, ValueError):
+        return math.nan
+
+
+def _parse_ecgi(ecgi: str | None) -> int:
+    """Return a numeric ECGI, or _MISSING_ECGI."""
+    try:
+        return int(ecgi)
+    except (TypeError, ValueError):
+        return _MISSING_ECGI
+
+
+class CellHistory:
+    """Fixed-capacity ring buffer of cell samples.
+
+    Each field is a packed array of capacity entries rather than a list of
+    dicts, so memory use is fixed, 56 bytes per sample, however long
+    Home Assistant runs. Missing values are NaN, or -1 for the ECGI. Samples
+    are appended in time order, so a time window is found by binary search.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize the history."""
+        self.capacity = capacity
+        self._times = array("d", [0.0]) * capacity
+        self._values = {
+            (generation, field): array("f", [math.nan]) * capacity
+            for generation in GENERATIONS
+            for field in HISTORY_FIELDS
+        }
+        self._ecgis = {generation: array("q", [_MISSING_ECGI]) * capacity for generation in GENERATIONS}
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory used by the arrays."""
+        arrays = [self._times, *self._values.values(), *self._ecgis.values()]
+        return sum(len(values) * values.itemsize for values in arrays)
+
+    def append(self, timestamp: float, cell: dict[str, Any]) -> None:
+        """Add a sample, replacing the oldest if full."""
+        position = self._next
+        self._times[position] = timestamp
+        for generation in GENERATIONS:
+            data = cell.get(generation) or {}
+            sector = data.get("sector") or {}
+            for metric in SIGNAL_METRICS:
+                value = sector.get(metric)
+                self._values[(generation, metric)][position] = math.nan if value is None else value
+            self._values[(generation, "bandwidth")][position] = _parse_bandwidth(data.get("bandwidth"))
+            self._ecgis[generation][position] = _parse_ecgi(data.get("ecgi"))
+
+        self._next = (position + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def _position(self, index: int) -> int:
+        """Return the array position of the index'th oldest sample."""
+        return (self._next - self._count + index) % self.capacity
+
+    def _positions(self, since: float) -> list[int]:
+        """Return the array positions of the samples at or after since, oldest first."""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._times[self._position(middle)] < since:
+                low = middle + 1
+            else:
+                high = middle
+        return [self._position(index) for index in range(low, self._count)]
+
+    def summary(self, since: float, include_samples: bool = False) -> dict[str, Any]:
+        """Return summary statistics, and optionally the samples, from since until now."""
+        positions = self._positions(since)
+        result: dict[str, Any] = {
+            "start": dt_util.utc_from_timestamp(self._times[positions[0]]).isoformat() if positions else None,
+            "end": dt_util.utc_from_timestamp(self._times[positions[-1]]).isoformat() if positions else None,
+            "samples": len(positions),
+            "capacity": self.capacity,
+        }
+
+        for generation in GENERATIONS:
+            stats: dict[str, Any] = {}
+            for field in HISTORY_FIELDS:
+                values = self._values[(generation, field)]
+                window = [values[position] for position in positions if not math.isnan(values[position])]
+                if window:
+                    stats[field] = {
+                        "min": round(min(window), 1),
+                        "max": round(max(window), 1),
+                        "mean": round(statistics.fmean(window), 1),
+                        "last": round(window[-1], 1),
+                        "samples": len(window),
+                    }
+
+            ecgis = [
+                self._ecgis[generation][position]
+                for position in positions
+                if self._ecgis[generation][position] != _MISSING_ECGI
+            ]
+            if ecgis:
+                stats["ecgi"] = {
+                    "distinct": list(dict.fromkeys(str(ecgi) for ecgi in ecgis)),
+                    "changes": sum(1 for previous, current in zip(ecgis, ecgis[1:]) if previous != current),
+                    "last": str(ecgis[-1]),
+                }
+            if stats:
+                result[generation] = stats
+
+        if include_samples:
+            result["series"] = [self._sample(position) for position in positions]
+        return result
+
+    def _sample(self, position: int) -> dict[str, Any]:
+        """Return the sample at an array position."""
+        sample: dict[str, Any] = {"time": dt_util.utc_from_timestamp(self._times[position]).isoformat()}
+        for generation in GENERATIONS:
+            values = {
+                field: round(self._values[(generation, field)][position], 1)
+                for field in HISTORY_FIELDS
+                if not math.isnan(self._values[(generation, field)][position])
+            }
+            if (ecgi := self._ecgis[generation][position]) != _MISSING_ECGI:
+                values["ecgi"] = str(ecgi)
+            if values:
+                sample[generation] = values
+        return sample
@@ -0,0 +1,118 @@
+"""Shared request pool for the Home Assistant T-Mobile Home Internet integration."""
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+import logging
+import time
+from typing import Any, AsyncIterator
+
+from homeassistant.core import HomeAssistant, callback
+
+from .api import GatewayBusyError
+from .const import (
+    DATA_REQUEST_POOL,
+    MAX_CONCURRENT_REQUESTS,
+    MAX_GATEWAY_REQUESTS,
+    REQUEST_TIMEOUT_SECONDS,
+    STUCK_REQUEST_SECONDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _GatewayRequests:
+    """Requests to one gateway."""
+
+    def __init__(self, limit: int) -> None:
+        """Initialize the accounting."""
+        self.semaphore = asyncio.Semaphore(limit)
+        self.started: dict[int, float] = {}
+        self.timed_out = 0
+        self.abandoned = 0
+        self._next_id = 0
+
+    def start(self) -> int:
+        """Record a request starting; return its id."""
+        self._next_id += 1
+        self.started[self._next_id] = time.monotonic()
+        return self._next_id
+
+    @property
+    def stuck(self) -> int:
+        """Return the number of requests running past their hard deadline."""
+        deadline = time.monotonic() - STUCK_REQUEST_SECONDS
+        return sum(1 for started in self.started.values() if started < deadline)
+
+
+class GatewayRequestPool:
+    """Bound the number of gateway requests in flight across all config entries.
+
+    Every gateway client shares one pool, so an installation with many
+    gateways keeps a fixed number of connections open and a fixed amount of
+    event loop work in progress, however many entries poll at once. Each
+    gateway may also only use a few of the slots, and each request is given
+    a hard deadline after which it is cancelled.
+
+    A request still running well after its deadline did not respond to
+    cancellation and is counted as stuck. While a gateway has stuck
+    requests, new requests to it are refused with GatewayBusyError instead
+    of queuing behind them and holding slots other gateways need.
+    """
+
+    def __init__(self, limit: int, gateway_limit: int = MAX_GATEWAY_REQUESTS) -> None:
+        """Initialize the pool."""
+        self.limit = limit
+        self.gateway_limit = gateway_limit
+        self._semaphore = asyncio.Semaphore(limit)
+        self._gateways: dict[str, _GatewayRequests] = {}
+
+    def _requests(self, host: str) -> _GatewayRequests:
+        """Return the accounting for a gateway."""
+        if (requests := self._gateways.get(host)) is None:
+            requests = self._gateways[host] = _GatewayRequests(self.gateway_limit)
+        return requests
+
+    @asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[None]:
+        """Hold a request slot for a gateway for the duration of the block."""
+        requests = self._requests(host)
+        if stuck := requests.stuck:
+            raise GatewayBusyError(f"{stuck} earlier request(s) to {host} are still running")
+
+        async with requests.semaphore, self._semaphore:
+            request_id = requests.start()
+            try:
+                async with asyncio.timeout(REQUEST_TIMEOUT_SECONDS):
+                    yield
+            except TimeoutError:
+                requests.timed_out += 1
+                _LOGGER.debug(f"Request to {host} timed out after {REQUEST_TIMEOUT_SECONDS} seconds")
+                raise
+            except asyncio.CancelledError:
+                # The caller gave up, usually on its own shorter timeout.
+                requests.abandoned += 1
+                raise
+            finally:
+                del requests.started[request_id]
+
+    def as_dict(self, host: str) -> dict[str, Any]:
+        """Return a gateway's request state for display as attributes."""
+        requests = self._requests(host)
+        return {
+            "in_flight": len(requests.started),
+            "stuck": requests.stuck,
+            "timed_out": requests.timed_out,
+            "abandoned": requests.abandoned,
+            "limit": self.gateway_limit,
+            "pool_in_flight": sum(len(gateway.started) for gateway in self._gateways.values()),
+            "pool_limit": self.limit,
+        }
+
+
+@callback
+def async_get_request_pool(hass: HomeAssistant) -> GatewayRequestPool:
+    """Return the request pool shared by all config entries."""
+    if (pool := hass.data.get(DATA_REQUEST_POOL)) is None:
+        pool = hass.data[DATA_REQUEST_POOL] = GatewayRequestPool(MAX_CONCURRENT_REQUESTS)
+    return pool
@@ -0,0 +1,122 @@
+"""Retry policy for the Home Assistant T-Mobile Home Internet integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, TypeVar
+
+import aiohttp
+
+from .api import (
+    GatewayApiError,
+    GatewayAuthError,
+    GatewayBusyError,
+    GatewayIncompleteResponseError,
+    GatewayStatusError,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+FAILURE_AUTH = "auth"
+FAILURE_BUSY = "busy"
+FAILURE_INCOMPLETE = "incomplete"
+FAILURE_REBOOTING = "rebooting"
+FAILURE_STUCK = "stuck"
+FAILURE_UNKNOWN = "unknown"
+
+# Failures that clear up by themselves if the request is repeated a little later.
+RETRYABLE_FAILURES = frozenset({FAILURE_BUSY, FAILURE_INCOMPLETE, FAILURE_REBOOTING})
+
+
+def classify_failure(exc: BaseException) -> str:
+    """Return why a gateway request failed."""
+    if isinstance(exc, GatewayAuthError):
+        # The client has already logged in again once; repeating will not help.
+        return FAILURE_AUTH
+    if isinstance(exc, GatewayBusyError):
+        # Earlier requests are stuck; adding more would only queue behind them.
+        return FAILURE_STUCK
+    if isinstance(exc, GatewayStatusError):
+        # The gateway answers 408 while it applies a change.
+        return FAILURE_BUSY if exc.status_code == 408 else FAILURE_UNKNOWN
+    if isinstance(exc, GatewayIncompleteResponseError):
+        return FAILURE_INCOMPLETE
+    if isinstance(exc, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, TimeoutError)):
+        # Refused or dropped connections and silence are what a rebooting gateway looks like.
+        return FAILURE_REBOOTING
+    if isinstance(exc, aiohttp.ClientResponseError) and exc.status >= 500:
+        return FAILURE_REBOOTING
+    return FAILURE_UNKNOWN
+
+
+def is_unreachable(exc: BaseException) -> bool:
+    """Return whether a request failed without reaching the gateway: refused, dropped or timed out.
+
+    Unlike classify_failure, an error status counts as reaching the gateway,
+    and the errors an error was raised from are looked at too.
+    """
+    while exc is not None:
+        if isinstance(exc, (aiohttp.ClientConnectionError, TimeoutError)):
+            return True
+        exc = exc.__cause__
+    return False
+
+
+class RetryPolicy:
+    """Exponential backoff with jitter inside a total time budget.
+
+    Only failures in RETRYABLE_FAILURES are retried. No attempt is started,
+    and no backoff slept, past the end of the budget, so the caller gets an
+    answer in time for its next cycle. Waiting is done with asyncio.sleep,
+    so cancelling the caller cancels the retries at once.
+    """
+
+    def __init__(self, budget: float, initial_delay: float, max_delay: float, multiplier: float = 2) -> None:
+        """Initialize the policy."""
+        self.budget = budget
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+
+    def _backoff(self, attempt: int) -> float:
+        """Return the delay after a failed attempt, with half of it jittered."""
+        delay = min(self.max_delay, self.initial_delay * self.multiplier ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def async_call(
+        self, func: Callable[[], Awaitable[_T]], description: str, budget: float | None = None
+    ) -> _T:
+        """Call func until it succeeds, fails permanently, or the budget runs out.
+
+        A budget given here replaces the policy's own when it is shorter.
+        """
+        if budget is None or budget > self.budget:
+            budget = self.budget
+        deadline = time.monotonic() + budget
+        attempt = 0
+
+        while True:
+            try:
+                return await func()
+            except GatewayApiError as exc:
+                error: Exception = exc
+            except (aiohttp.ClientError, TimeoutError) as exc:
+                error = exc
+
+            failure = classify_failure(error)
+            delay = self._backoff(attempt)
+            attempt += 1
+
+            if failure not in RETRYABLE_FAILURES:
+                raise error
+            if time.monotonic() + delay >= deadline:
+                raise GatewayApiError(
+                    f"Gave up getting {description} after {attempt} attempts ({failure}): {error}"
+                ) from error
+
+            _LOGGER.debug(f"Getting {description} failed ({failure}); attempt {attempt + 1} in {delay:.1f} seconds")
+            await asyncio.sleep(delay)
@@ -0,0 +1,94 @@
+"""Rolling statistics for the Home Assistant T-Mobile Home Internet integration."""
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import deque
+import math
+from typing import Any
+
+
+class RollingStatistics:
+    """Statistics over the samples of the last window_seconds, updated per sample.
+
+    Mean and variance are kept with Welford's algorithm, extended to remove
+    samples as they leave the window, so each sample costs the same however
+    large the window. Percentiles come from a sorted copy of the window,
+    which is exact and, at one sample every few seconds, small.
+    """
+
+    def __init__(self, window_seconds: float) -> None:
+        """Initialize the statistics."""
+        self.window_seconds = window_seconds
+        self._samples: deque[tuple[float, float]] = deque()
+        self._sorted: list[float] = []
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def count(self) -> int:
+        """Return the number of samples in the window."""
+        return len(self._samples)
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample and drop those that have left the window."""
+        while self._samples and self._samples[0][0] <= timestamp - self.window_seconds:
+            self._remove(self._samples.popleft()[1])
+
+        self._samples.append((timestamp, value))
+        insort(self._sorted, value)
+        delta = value - self._mean
+        self._mean += delta / len(self._samples)
+        self._m2 += delta * (value - self._mean)
+
+    def _remove(self, value: float) -> None:
+        """Remove a sample that has already been popped from the window."""
+        del self._sorted[bisect_left(self._sorted, value)]
+        if not self._samples:
+            self._mean = 0.0
+            self._m2 = 0.0
+            return
+        delta = value - self._mean
+        self._mean -= delta / len(self._samples)
+        # Rounding can leave a tiny negative sum of squares.
+        self._m2 = max(0.0, self._m2 - delta * (value - self._mean))
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean."""
+        return self._mean if self._samples else None
+
+    @property
+    def stdev(self) -> float | None:
+        """Return the sample standard deviation."""
+        if len(self._samples) < 2:
+            return None
+        return math.sqrt(self._m2 / (len(self._samples) - 1))
+
+    def percentile(self, percent: float) -> float | None:
+        """Return a percentile, interpolating between samples."""
+        if not self._sorted:
+            return None
+        position = (len(self._sorted) - 1) * percent / 100
+        lower = math.floor(position)
+        upper = min(lower + 1, len(self._sorted) - 1)
+        return self._sorted[lower] + (self._sorted[upper] - self._sorted[lower]) * (position - lower)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for display as attributes."""
+        if not self._samples:
+            return {"samples": 0}
+
+        def rounded(value: float | None) -> float | None:
+            return None if value is None else round(value, 1)
+
+        return {
+            "mean": rounded(self.mean),
+            "stdev": rounded(self.stdev),
+            "min": self._sorted[0],
+            "p5": rounded(self.percentile(5)),
+            "median": rounded(self.percentile(50)),
+            "p95": rounded(self.percentile(95)),
+            "max": self._sorted[-1],
+            "samples": len(self._samples),
+            "window_minutes": round(self.window_seconds / 60, 1),
+        }
@@ -0,0 +1,496 @@
+"""Poll scheduling for the Home Assistant T-Mobile Home Internet integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_PROBE_MAX_SECONDS,
+    BREAKER_PROBE_MIN_SECONDS,
+    EVENT_GATEWAY_REBOOTED,
+    GATEWAY_DUTY_CYCLE,
+    POLL_RELAX_FACTOR,
+    PROBE_TIMEOUT_SECONDS,
+    REBOOT_DOWN_PROBE_SECONDS,
+    REBOOT_DOWN_TIMEOUT_SECONDS,
+    REBOOT_UP_PROBE_MAX_SECONDS,
+    REBOOT_UP_TIMEOUT_SECONDS,
+    RESPONSE_TIME_SMOOTHING,
+    SIGNAL_VOLATILITY_DB,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Signal metrics watched for volatility, as (generation, metric) pairs.
+_VOLATILITY_METRICS = (("4g", "rsrp"), ("4g", "sinr"), ("5g", "rsrp"), ("5g", "sinr"))
+
+
+class AllSectionsFailed(UpdateFailed):
+    """Every section fetched failed, but each still has its last good value.
+
+    Carries the data with those values and the errors, which is published
+    all the same, while the scheduler counts the fetch as a failure.
+    """
+
+    def __init__(self, message: str, data: dict[str, Any]) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.data = data
+
+
+class AdaptivePollInterval:
+    """Poll interval that adapts to signal volatility and gateway response time.
+
+    The interval drops to its minimum when the cell signal moves by more than
+    SIGNAL_VOLATILITY_DB or the serving cell changes, and grows by
+    POLL_RELAX_FACTOR per stable poll up to its maximum. Independently, it is
+    never shorter than the smoothed gateway response time divided by
+    GATEWAY_DUTY_CYCLE, so a struggling gateway is polled less often.
+    """
+
+    def __init__(self, base: float, minimum: float, maximum: float) -> None:
+        """Initialize the interval."""
+        self.base = base
+        self.minimum = minimum
+        self.maximum = maximum
+        self.response_time: float | None = None
+        self._target = base
+        self._last_sample: dict[str, Any] | None = None
+
+    def record_response_time(self, seconds: float) -> None:
+        """Record how long the gateway took to answer a poll."""
+        if self.response_time is None:
+            self.response_time = seconds
+        else:
+            self.response_time += RESPONSE_TIME_SMOOTHING * (seconds - self.response_time)
+
+    def record_cell(self, cell: dict[str, Any]) -> None:
+        """Record a cell sample and tighten or relax the interval."""
+        sample = {
+            f"{generation}_{metric}": cell[generation]["sector"].get(metric)
+            for generation, metric in _VOLATILITY_METRICS
+            if generation in cell
+        }
+        for generation in ("4g", "5g"):
+            if generation in cell:
+                sample[f"{generation}_ecgi"] = cell[generation].get("ecgi")
+
+        if self._last_sample is not None:
+            if self._is_volatile(self._last_sample, sample):
+                self._target = self.minimum
+            else:
+                self._target = min(self.maximum, self._target * POLL_RELAX_FACTOR)
+
+        self._last_sample = sample
+
+    @staticmethod
+    def _is_volatile(previous: dict[str, Any], current: dict[str, Any]) -> bool:
+        """Return whether the signal changed significantly between samples."""
+        # A generation appearing or disappearing, or a new cell, is an event.
+        if previous.keys() != current.keys():
+            return True
+
+        for key, value in current.items():
+            if key.endswith("_ecgi"):
+                if value != previous[key]:
+                    return True
+            elif value is not None and previous[key] is not None:
+                if abs(value - previous[key]) >= SIGNAL_VOLATILITY_DB:
+                    return True
+
+        return False
+
+    @property
+    def interval(self) -> float:
+        """Return the effective interval in seconds."""
+        interval = self._target
+        if self.response_time is not None:
+            interval = max(interval, self.response_time / GATEWAY_DUTY_CYCLE)
+        return min(self.maximum, max(self.minimum, interval))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the scheduler state for display as attributes."""
+        return {
+            "interval": round(self.interval, 1),
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "response_time": None if self.response_time is None else round(self.response_time, 3),
+        }
+
+
+class CircuitBreaker:
+    """Track whether a gateway is reachable.
+
+    The breaker opens after threshold consecutive failed poll batches. While
+    it is open the gateway is only probed, at intervals doubling from
+    probe_min up to probe_max, and it closes when a probe succeeds.
+    """
+
+    def __init__(self, threshold: int, probe_min: float, probe_max: float) -> None:
+        """Initialize the breaker."""
+        self.threshold = threshold
+        self.probe_min = probe_min
+        self.probe_max = probe_max
+        self.failures = 0
+        self.probes = 0
+        self.is_open = False
+        self.opened_at = None
+        self.last_error: str | None = None
+
+    @property
+    def probe_delay(self) -> float:
+        """Return the delay before the next probe."""
+        return min(self.probe_max, self.probe_min * 2 ** self.probes)
+
+    def record_success(self) -> None:
+        """Record a successful poll."""
+        self.failures = 0
+        self.last_error = None
+
+    def record_failure(self, error: Exception) -> bool:
+        """Record a failed poll; return whether the breaker opened."""
+        self.failures += 1
+        self.last_error = str(error)
+        if self.is_open or self.failures < self.threshold:
+            return False
+        self.open()
+        return True
+
+    def open(self) -> None:
+        """Stop polling and start probing."""
+        self.is_open = True
+        self.opened_at = dt_util.utcnow()
+        self.probes = 0
+
+    def record_probe_failure(self, error: Exception) -> None:
+        """Record a failed probe, lengthening the delay before the next."""
+        self.probes += 1
+        self.last_error = str(error)
+
+    def close(self) -> None:
+        """Resume polling."""
+        self.is_open = False
+        self.opened_at = None
+        self.failures = 0
+        self.probes = 0
+        self.last_error = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for display as attributes."""
+        return {
+            "state": "open" if self.is_open else "closed",
+            "failures": self.failures,
+            "threshold": self.threshold,
+            "opened_at": self.opened_at.isoformat() if self.opened_at else None,
+            "probes": self.probes,
+            "next_probe_seconds": self.probe_delay if self.is_open else None,
+            "last_error": self.last_error,
+        }
+
+
+class GatewayScheduler:
+    """Single timer that polls every endpoint of one gateway.
+
+    Each coordinator section is an endpoint polled at its coordinator's
+    adaptive interval. The sections of a coordinator are phased evenly across
+    its interval, so the slow sections are spread over the fast ticks rather
+    than arriving together. Whenever the timer fires, every endpoint due
+    within half a fast interval is fetched in one concurrent batch sharing a
+    single snapshot timestamp, and the results are pushed to the coordinators.
+
+    With several gateways, each scheduler is given a phase between 0 and 1
+    that shifts all of its endpoints by that fraction of their spacing, so
+    the gateways' batches interleave instead of starting together.
+
+    When successive batches fail, a circuit breaker stops the endpoint
+    fetches and the gateway is only probed until it answers again, at which
+    point every endpoint is fetched at once. A reboot requested through
+    async_reboot is handled the same way, without waiting for failures.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinators: list,
+        probe: Callable[[], Awaitable[None]],
+        phase: float = 0,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._coordinators = coordinators
+        self._probe = probe
+        self._phase = phase
+        self.breaker = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_PROBE_MIN_SECONDS, BREAKER_PROBE_MAX_SECONDS)
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._reboot: asyncio.Task | None = None
+        self._reboot_requested: asyncio.Future | None = None
+        self._next_due: dict[tuple[Any, str], float] = {}
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._batch: asyncio.Task | None = None
+        self._running = False
+
+    @property
+    def rebooting(self) -> bool:
+        """Return whether a reboot is in progress."""
+        return self._reboot is not None
+
+    @callback
+    def async_add_listener(self, listener: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call listener when the breaker or reboot state changes; return a function to remove it."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    @callback
+    def _notify(self) -> None:
+        """Call the breaker listeners."""
+        for listener in list(self._listeners):
+            listener()
+
+    @property
+    def _tolerance(self) -> float:
+        """Return how early an endpoint may be fetched to join a batch."""
+        return min(coordinator.poll_interval.interval for coordinator in self._coordinators) / 2
+
+    @callback
+    def async_start(self) -> None:
+        """Start polling; all endpoints are assumed to have just been fetched."""
+        self._running = True
+        now = time.monotonic()
+        for coordinator in self._coordinators:
+            spacing = coordinator.poll_interval.interval / len(coordinator.SECTIONS)
+            for index, section in enumerate(coordinator.SECTIONS):
+                self._next_due[(coordinator, section)] = now + spacing * (index + 1 + self._phase)
+        self._schedule()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop polling and cancel any batch in progress."""
+        self._running = False
+        self._pause()
+        if self._reboot is not None:
+            self._reboot.cancel()
+            self._reboot = None
+
+    @callback
+    def _pause(self) -> None:
+        """Cancel the timer and any batch in progress."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if self._batch is not None:
+            self._batch.cancel()
+            self._batch = None
+
+    @callback
+    def _schedule(self) -> None:
+        """Set the timer for the next endpoint due, or the next probe."""
+        if not self._running or self._reboot is not None:
+            return
+        if self.breaker.is_open:
+            delay = self.breaker.probe_delay
+        else:
+            delay = max(0, min(self._next_due.values()) - time.monotonic())
+        self._unsub_timer = async_call_later(self._hass, delay, self._handle_timer)
+
+    @callback
+    def _handle_timer(self, _now) -> None:
+        """Start a batch, or a probe while the breaker is open."""
+        self._unsub_timer = None
+        if self.breaker.is_open:
+            self._batch = self._hass.async_create_background_task(
+                self._async_run_probe(), "tmobile_home_internet probe"
+            )
+        else:
+            self._batch = self._hass.async_create_background_task(
+                self._async_run_batch(), "tmobile_home_internet poll batch"
+            )
+
+    async def async_reboot(self, reboot: Callable[[], Awaitable[None]], event_data: dict[str, Any]) -> asyncio.Task:
+        """Reboot the gateway with polling paused; return a task resolving to the downtime.
+
+        Returns once the gateway has taken the reboot request, raising the error
+        if it did not, in which case polling resumes. A reboot already in
+        progress is returned rather than starting another.
+        """
+        if self._reboot is None:
+            self._pause()
+            self._reboot_requested = self._hass.loop.create_future()
+            self._reboot = self._hass.async_create_background_task(
+                self._async_run_reboot(reboot, self._reboot_requested, event_data), "tmobile_home_internet reboot"
+            )
+            self._notify()
+        reboot_task = self._reboot
+        await asyncio.shield(self._reboot_requested)
+        return reboot_task
+
+    async def _async_run_reboot(
+        self, reboot: Callable[[], Awaitable[None]], requested: asyncio.Future, event_data: dict[str, Any]
+    ) -> float | None:
+        """Reboot, wait for the gateway to go down and come back, then refresh everything.
+
+        Resolve requested once the reboot request is sent, or fail it with the
+        request's error. Return the seconds the gateway was down, or None if
+        the request failed, or the gateway did not go down or did not come back in time.
+        """
+        try:
+            try:
+                await reboot()
+            except Exception as err:
+                requested.set_exception(err)
+                return None
+            requested.set_result(None)
+            requested_at = time.monotonic()
+
+            went_down = await self._async_wait_for_down(requested_at + REBOOT_DOWN_TIMEOUT_SECONDS)
+            if went_down is None:
+                _LOGGER.warning(f"Gateway still answering {REBOOT_DOWN_TIMEOUT_SECONDS} seconds after reboot request")
+                return None
+
+            came_up = await self._async_wait_for_up(went_down + REBOOT_UP_TIMEOUT_SECONDS)
+            if came_up is None:
+                _LOGGER.warning(f"Gateway not back {REBOOT_UP_TIMEOUT_SECONDS} seconds after rebooting")
+                # Keep probing at the breaker's pace until it is.
+                self.breaker.open()
+                return None
+
+            downtime = round(came_up - went_down, 1)
+            _LOGGER.info(f"Gateway back after {downtime} seconds; resuming polling")
+            self.breaker.close()
+            self._hass.bus.async_fire(
+                EVENT_GATEWAY_REBOOTED,
+                event_data | {"downtime": downtime, "total_time": round(came_up - requested_at, 1)},
+            )
+            return downtime
+        finally:
+            if not requested.done():
+                # Stopped before the request was sent.
+                requested.cancel()
+            # One coordinated refresh of every endpoint.
+            now = time.monotonic()
+            for key in self._next_due:
+                self._next_due[key] = now
+            self._reboot = None
+            self._notify()
+            self._schedule()
+
+    async def _async_is_up(self) -> bool:
+        """Return whether the gateway answers a probe."""
+        try:
+            async with asyncio.timeout(PROBE_TIMEOUT_SECONDS):
+                await self._probe()
+        except Exception:
+            return False
+        return True
+
+    async def _async_wait_for_down(self, deadline: float) -> float | None:
+        """Probe until the gateway stops answering; return when it did."""
+        while True:
+            if not await self._async_is_up():
+                return time.monotonic()
+            if time.monotonic() >= deadline:
+                return None
+            await asyncio.sleep(REBOOT_DOWN_PROBE_SECONDS)
+
+    async def _async_wait_for_up(self, deadline: float) -> float | None:
+        """Probe with backoff until the gateway answers; return when it did."""
+        delay = self.breaker.probe_min
+        while True:
+            await asyncio.sleep(delay)
+            if await self._async_is_up():
+                return time.monotonic()
+            if time.monotonic() >= deadline:
+                return None
+            delay = min(REBOOT_UP_PROBE_MAX_SECONDS, delay * 2)
+
+    async def _async_run_probe(self) -> None:
+        """Probe the gateway, and fetch every endpoint if it answers."""
+        try:
+            await self._probe()
+        except Exception as err:
+            self.breaker.record_probe_failure(err)
+            _LOGGER.debug(f"Gateway still unreachable; probing again in {self.breaker.probe_delay} seconds")
+        else:
+            _LOGGER.info("Gateway is reachable again; resuming polling")
+            self.breaker.close()
+            now = time.monotonic()
+            for key in self._next_due:
+                self._next_due[key] = now
+        finally:
+            self._batch = None
+            self._notify()
+            self._schedule()
+
+    async def _async_run_batch(self) -> None:
+        """Fetch every endpoint that is due, then schedule the next batch."""
+        try:
+            now = time.monotonic()
+            horizon = now + self._tolerance
+            due: dict[Any, list[str]] = {}
+
+            for (coordinator, section), next_due in self._next_due.items():
+                if next_due > horizon:
+                    continue
+                due.setdefault(coordinator, []).append(section)
+                # Keep the endpoint's phase unless it has fallen a whole interval behind.
+                interval = coordinator.poll_interval.interval
+                self._next_due[(coordinator, section)] = max(next_due + interval, now + interval / 2)
+
+            snapshot_time = dt_util.utcnow()
+            results = await asyncio.gather(
+                *(
+                    self._async_refresh(coordinator, sections, snapshot_time)
+                    for coordinator, sections in due.items()
+                )
+            )
+            self._record_results([result for result in results if result is not None])
+        finally:
+            self._batch = None
+            self._schedule()
+
+    @callback
+    def _record_results(self, results: list[Exception | bool]) -> None:
+        """Count a batch as a success unless every fetch in it failed."""
+        if not results:
+            return
+        if any(result is True for result in results):
+            self.breaker.record_success()
+        elif self.breaker.record_failure(results[-1]):
+            _LOGGER.warning(
+                f"Gateway unreachable after {self.breaker.failures} failed polls; "
+                f"pausing polling until it answers: {self.breaker.last_error}"
+            )
+            self._notify()
+
+    async def _async_refresh(self, coordinator, sections: list[str], snapshot_time) -> Exception | bool | None:
+        """Fetch the demanded sections of one coordinator and publish the result.
+
+        Return True if any section was fetched, the error if none was, or None if nothing needed polling.
+        """
+        sections = coordinator.sections_to_poll(sections)
+        if not sections:
+            return None
+
+        try:
+            data = await coordinator.async_fetch_sections(sections, snapshot_time)
+        except AllSectionsFailed as err:
+            # The gateway did not answer, but the sections keep showing their last good values.
+            coordinator.async_set_updated_data(err.data)
+            return err
+        except UpdateFailed as err:
+            coordinator.async_set_update_error(err)
+            return err
+        except Exception as err:
+            _LOGGER.exception(f"Unexpected error polling {', '.join(sections)}")
+            coordinator.async_set_update_error(err)
+            return err
+        else:
+            coordinator.async_set_updated_data(data)
+            return True
@@ -11,9 +11,11 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
+    WIFI_CHANNELS,
 )
 
-from .utils import set_edits_pending, set_ssid_edit_controls
+from .entity import SkipUnchangedStateMixin
+from .utils import edit_entity_id, set_edits_pending, set_ssid_edit_controls
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,9 +45,11 @@ def _create_entities(hass: HomeAssistant, entry: dict):
     return entities
 
 
-class GatewaySelect(CoordinatorEntity, SelectEntity):
+class GatewaySelect(SkipUnchangedStateMixin, CoordinatorEntity, SelectEntity):
     """Represent a select for the gateway."""
 
+    _section: str | None = None
+
     def __init__(self, hass, entry, coordinator, controller):
         """Set up a new HA T-Mobile Home Internet select."""
         self._hass = hass
@@ -58,10 +62,29 @@ class GatewaySelect(CoordinatorEntity, SelectEntity):
             identifiers={(DOMAIN, coordinator.config_entry.entry_id)},
         )
 
+    @property
+    def available(self) -> bool:
+        """Return if the gateway data this entity depends on is fresh."""
+        return super().available and (
+            self._section is None or self.coordinator.section_available(self._section)
+        )
+
+    def _state_fingerprint(self) -> tuple:
+        """Return the rendered state."""
+        return (self.current_option, tuple(self.options))
+
+    async def async_added_to_hass(self) -> None:
+        """Register demand for the section of gateway data this entity reads."""
+        await super().async_added_to_hass()
+        if self._section is not None:
+            self.async_on_remove(self.coordinator.async_add_demand(self._section))
+
 
 class GatewayWiFi24GHzChannelSelect(GatewaySelect):
     """Represent a select for the gateway."""
 
+    _section = "access_point"
+
     def __init__(self, hass, entry, coordinator, controller):
         """Set up a new HA T-Mobile Home Internet WiFi 2.4GHz channel select."""
         super().__init__(hass, entry, coordinator, controller)
@@ -79,7 +102,7 @@ class GatewayWiFi24GHzChannelSelect(GatewaySelect):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_wifi_2_4GHz_channel")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_wifi_2_4GHz_channel")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -89,7 +112,7 @@ class GatewayWiFi24GHzChannelSelect(GatewaySelect):
     @property
     def options(self) -> list[str]:
         """A list of available options as strings"""
-        return ["Auto", "1", "2", "3"]
+        return WIFI_CHANNELS["2.4ghz"]
 
     @property
     def current_option(self) -> str:
@@ -102,15 +125,14 @@ class GatewayWiFi24GHzChannelSelect(GatewaySelect):
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
-        access_point = self._coordinator.data["access_point"]
-        access_point["2.4ghz"]["channel"] = option
-        await self._hass.async_add_executor_job(self._controller.set_ap_config, access_point)
-        await self._coordinator.async_request_refresh()
+        await self._coordinator.access_point_writer.async_write({"2.4ghz": {"channel": option}})
 
 
 class GatewayWiFi50GHzChannelSelect(GatewaySelect):
     """Represent a select for the gateway."""
 
+    _section = "access_point"
+
     def __init__(self, hass, entry, coordinator, controller):
         """Set up a new HA T-Mobile Home Internet WiFi 5.0GHz channel select."""
         super().__init__(hass, entry, coordinator, controller)
@@ -128,7 +150,7 @@ class GatewayWiFi50GHzChannelSelect(GatewaySelect):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_wifi_5_0GHz_channel")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_wifi_5_0GHz_channel")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -138,7 +160,7 @@ class GatewayWiFi50GHzChannelSelect(GatewaySelect):
     @property
     def options(self) -> list[str]:
         """A list of available options as strings"""
-        return ["Auto", "36", "40", "44", "48", "52", "56", "60", "64", "100", "104", "108", "112", "116", "120", "124", "128", "132", "136", "140", "144", "149", "153", "157", "161", "165"]
+        return WIFI_CHANNELS["5.0ghz"]
 
     @property
     def current_option(self) -> str:
@@ -151,15 +173,14 @@ class GatewayWiFi50GHzChannelSelect(GatewaySelect):
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
-        access_point = self._coordinator.data["access_point"]
-        access_point["5.0ghz"]["channel"] = option
-        await self._hass.async_add_executor_job(self._controller.set_ap_config, access_point)
-        await self._coordinator.async_request_refresh()
+        await self._coordinator.access_point_writer.async_write({"5.0ghz": {"channel": option}})
 
 
 class GatewayWiFi24GHzBandwidthSelect(GatewaySelect):
     """Represent a select for the gateway."""
 
+    _section = "access_point"
+
     def __init__(self, hass, entry, coordinator, controller):
         """Set up a new HA T-Mobile Home Internet WiFi 2.4GHz bandwidth select."""
         super().__init__(hass, entry, coordinator, controller)
@@ -177,7 +198,7 @@ class GatewayWiFi24GHzBandwidthSelect(GatewaySelect):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_wifi_2_4GHz_bandwidth")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_wifi_2_4GHz_bandwidth")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -200,15 +221,14 @@ class GatewayWiFi24GHzBandwidthSelect(GatewaySelect):
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
-        access_point = self._coordinator.data["access_point"]
-        access_point["2.4ghz"]["channelBandwidth"] = option
-        await self._hass.async_add_executor_job(self._controller.set_ap_config, access_point)
-        await self._coordinator.async_request_refresh()
+        await self._coordinator.access_point_writer.async_write({"2.4ghz": {"channelBandwidth": option}})
 
 
 class GatewayWiFi50GHzBandwidthSelect(GatewaySelect):
     """Represent a select for the gateway."""
 
+    _section = "access_point"
+
     def __init__(self, hass, entry, coordinator, controller):
         """Set up a new HA T-Mobile Home Internet WiFi 5.0GHz bandwidth select."""
         super().__init__(hass, entry, coordinator, controller)
@@ -226,7 +246,7 @@ class GatewayWiFi50GHzBandwidthSelect(GatewaySelect):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_wifi_5_0GHz_bandwidth")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_wifi_5_0GHz_bandwidth")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -249,15 +269,14 @@ class GatewayWiFi50GHzBandwidthSelect(GatewaySelect):
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
-        access_point = self._coordinator.data["access_point"]
-        access_point["5.0ghz"]["channelBandwidth"] = option
-        await self._hass.async_add_executor_job(self._controller.set_ap_config, access_point)
-        await self._coordinator.async_request_refresh()
+        await self._coordinator.access_point_writer.async_write({"5.0ghz": {"channelBandwidth": option}})
 
 
 class GatewayEditSSIDsSelect(GatewaySelect):
     """Represent a select for the gateway."""
 
+    _section = "access_point"
+
     _attr_should_poll = False
     _attr_current_option: str | None = None
 
@@ -278,7 +297,7 @@ class GatewayEditSSIDsSelect(GatewaySelect):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_edit_ssids")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_edit_ssids")
 
     @property
     def entity_registry_visible_default(self) -> bool:
@@ -307,10 +326,10 @@ class GatewayEditSSIDsSelect(GatewaySelect):
 
         # Set editing controls to current settings
         ssid_index = self.options.index(option)
-        await set_ssid_edit_controls(self._hass, self._coordinator, ssid_index)
+        await set_ssid_edit_controls(self._hass, self._coordinator.config_entry, self._coordinator, ssid_index)
         await self.hass.services.async_call(
                     "homeassistant", "update_entity", 
-                    {"entity_id": "sensor.t_mobile_gateway_ssid_edit_index"}, 
+                    {"entity_id": edit_entity_id(self.hass, self._coordinator.config_entry, "sensor", "gateway_ssid_edit_index")}, 
                     blocking=True
                 )
 
@@ -338,7 +357,7 @@ class GatewayEditSSIDEncryptionVersionSelect(GatewaySelect):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_edit_ssid_encryption_version")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_edit_ssid_encryption_version")
 
     @property
     def entity_registry_visible_default(self) -> bool:
@@ -361,4 +380,4 @@ class GatewayEditSSIDEncryptionVersionSelect(GatewaySelect):
         self.async_write_ha_state()
 
         # Show edits pending
-        await set_edits_pending(True)
+        await set_edits_pending(self.hass, self._coordinator.config_entry, True)
@@ -1,16 +1,27 @@
 """The Home Assistant T-Mobile Home Internet integration."""
+import asyncio
 import logging
+import time
 from typing import Callable
 
 from homeassistant.components.sensor import (SensorDeviceClass, SensorEntity)
-from homeassistant.core import HomeAssistant, SupportsResponse
+from homeassistant.core import HomeAssistant, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
 from homeassistant.util import slugify
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceEntryType, DeviceInfo
 from homeassistant.helpers import entity_platform
-from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
+    CONF_HEARTBEAT_MINUTES,
+    CONF_MIN_PUBLISH_SECONDS,
+    CONF_RSRP_DEADBAND,
+    CONF_RSRQ_DEADBAND,
+    CONF_SINR_DEADBAND,
+    DEFAULT_HEARTBEAT_MINUTES,
+    DEFAULT_MIN_PUBLISH_SECONDS,
+    DEFAULT_SIGNAL_DEADBAND,
     DOMAIN,
     SERVICE_GET_CLIENT_LIST,
     SERVICE_REBOOT_GATEWAY,
@@ -27,6 +38,12 @@ from .const import (
     SERVICE_GET_GATEWAY_CLIENTS,
     SERVICE_GET_GATEWAY_SIM_CARD,
     SERVICE_GET_CELL_STATUS,
+    SERVICE_GET_CELL_HISTORY,
+    SERVICE_GET_CELL_RANKING,
+    SERVICE_APPLY_ACCESS_POINT_PATCH,
+    SERVICE_CREATE_SSID,
+    SERVICE_UPDATE_SSID,
+    SERVICE_DELETE_SSID,
     SCHEMA_SERVICE_GET_CLIENT_LIST,
     SCHEMA_SERVICE_REBOOT_GATEWAY,
     SCHEMA_SERVICE_ENABLE_24_WIFI,
@@ -42,12 +59,17 @@ from .const import (
     SCHEMA_SERVICE_GET_GATEWAY_CLIENTS,
     SCHEMA_SERVICE_GET_GATEWAY_SIM_CARD,
     SCHEMA_SERVICE_GET_CELL_STATUS,
-    STORAGE_KEY,
-    STORAGE_VERSION,
+    SCHEMA_SERVICE_GET_CELL_HISTORY,
+    SCHEMA_SERVICE_GET_CELL_RANKING,
+    SCHEMA_SERVICE_APPLY_ACCESS_POINT_PATCH,
+    SCHEMA_SERVICE_CREATE_SSID,
+    SCHEMA_SERVICE_UPDATE_SSID,
+    SCHEMA_SERVICE_DELETE_SSID,
     GatewayDeviceEntityFeature,
 )
 
-from .utils import get_ssid_edit_index
+from .entity import SkipUnchangedStateMixin
+from .utils import get_ssid_edit_index, value_hash
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -190,15 +212,70 @@ async def async_setup_entry(
         supports_response=SupportsResponse.ONLY,
     )
 
+    # This will call Entity._get_cell_history
+    platform.async_register_entity_service(
+        SERVICE_GET_CELL_HISTORY,
+        SCHEMA_SERVICE_GET_CELL_HISTORY,
+        "_get_cell_history",
+        [GatewayDeviceEntityFeature.CAN_CALL_SERVICES],
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    # This will call Entity._get_cell_ranking
+    platform.async_register_entity_service(
+        SERVICE_GET_CELL_RANKING,
+        SCHEMA_SERVICE_GET_CELL_RANKING,
+        "_get_cell_ranking",
+        [GatewayDeviceEntityFeature.CAN_CALL_SERVICES],
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    # This will call Entity._apply_access_point_patch
+    platform.async_register_entity_service(
+        SERVICE_APPLY_ACCESS_POINT_PATCH,
+        SCHEMA_SERVICE_APPLY_ACCESS_POINT_PATCH,
+        "_apply_access_point_patch",
+        [GatewayDeviceEntityFeature.CAN_CALL_SERVICES],
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    # This will call Entity._create_ssid
+    platform.async_register_entity_service(
+        SERVICE_CREATE_SSID,
+        SCHEMA_SERVICE_CREATE_SSID,
+        "_create_ssid",
+        [GatewayDeviceEntityFeature.CAN_CALL_SERVICES],
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    # This will call Entity._update_ssid
+    platform.async_register_entity_service(
+        SERVICE_UPDATE_SSID,
+        SCHEMA_SERVICE_UPDATE_SSID,
+        "_update_ssid",
+        [GatewayDeviceEntityFeature.CAN_CALL_SERVICES],
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    # This will call Entity._delete_ssid
+    platform.async_register_entity_service(
+        SERVICE_DELETE_SSID,
+        SCHEMA_SERVICE_DELETE_SSID,
+        "_delete_ssid",
+        [GatewayDeviceEntityFeature.CAN_CALL_SERVICES],
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
 
 def _create_entities(hass: HomeAssistant, entry: dict):
     fast_coordinator = hass.data[DOMAIN][entry.entry_id]["fast_coordinator"]
     slow_coordinator = hass.data[DOMAIN][entry.entry_id]["slow_coordinator"]
     controller = hass.data[DOMAIN][entry.entry_id]["controller"]
-    store = Store[dict[str, str]](hass, STORAGE_VERSION, STORAGE_KEY)
+    scheduler = hass.data[DOMAIN][entry.entry_id]["scheduler"]
+    store = hass.data[DOMAIN][entry.entry_id]["hostname_store"]
 
     entities = []
-    entities.append(GatewayDeviceSensor(hass, slow_coordinator, fast_coordinator, controller, store))
+    entities.append(GatewayDeviceSensor(hass, slow_coordinator, fast_coordinator, controller, scheduler, store))
     entities.append(GatewayAccessPointSensor(slow_coordinator))
     entities.append(GatewayClientsSensor(slow_coordinator))
     entities.append(GatewayCellSensor(fast_coordinator))
@@ -218,15 +295,21 @@ def _create_entities(hass: HomeAssistant, entry: dict):
     entities.append(Gateway5gBandwidthSensor(fast_coordinator))
     entities.append(Gateway5gECGISensor(fast_coordinator))
     entities.append(GatewayUptimeSensor(slow_coordinator))
+    for generation in ("4g", "5g"):
+        for metric in ("rsrp", "rsrq", "sinr"):
+            entities.append(GatewaySignalStatisticsSensor(fast_coordinator, generation, metric))
+    entities.append(GatewayConnectionSensor(slow_coordinator, scheduler))
     entities.append(GatewaySSIDEditIndexSensor(hass, slow_coordinator))
     entities.append(GatewaySSIDCountSensor(slow_coordinator))
 
     return entities
 
 
-class GatewaySensor(CoordinatorEntity, SensorEntity):
+class GatewaySensor(SkipUnchangedStateMixin, CoordinatorEntity, SensorEntity):
     """Represent a sensor for the gateway."""
 
+    _section: str | None = None
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway sensor."""
         self._coordinator = coordinator
@@ -236,17 +319,105 @@ class GatewaySensor(CoordinatorEntity, SensorEntity):
             identifiers={(DOMAIN, coordinator.config_entry.entry_id)},
         )
 
+    @property
+    def available(self) -> bool:
+        """Return if the gateway data this entity depends on is fresh."""
+        return super().available and (
+            self._section is None or self.coordinator.section_available(self._section)
+        )
+
+    def _state_fingerprint(self) -> tuple:
+        """Return the rendered state."""
+        return (self.native_value, value_hash(self.extra_state_attributes), self.icon)
+
+    async def async_added_to_hass(self) -> None:
+        """Register demand for the section of gateway data this entity reads."""
+        await super().async_added_to_hass()
+        if self._section is not None:
+            self.async_on_remove(self.coordinator.async_add_demand(self._section))
+
+
+class GatewaySignalSensor(GatewaySensor):
+    """Represent a cell signal sensor that only publishes significant changes.
+
+    A new value is published when it differs from the last published value
+    by at least the metric's deadband, but no sooner than the minimum publish
+    interval after the last. Once the heartbeat interval has passed, any
+    change is published, so small drifts still show up eventually.
+    Becoming unavailable or having no value is always published.
+    """
+
+    _deadband_option: str
+    _generation: str
+    _metric: str
+
+    def __init__(self, coordinator):
+        """Set up a new HA T-Mobile Home Internet gateway signal sensor."""
+        super().__init__(coordinator)
+        self._published_value: float | None = None
+        self._published_at: float | None = None
+
+    def _window_attributes(self) -> dict:
+        """Return the min, max and sample count of the value in oversampling mode."""
+        stats = self.coordinator.data.get("cell_stats", {}).get(self._generation, {}).get(self._metric)
+        if stats is None:
+            return {}
+        return {"min": stats["min"], "max": stats["max"], "samples": stats["samples"]}
+
+    def _should_publish(self) -> bool:
+        """Return whether the current value should be published."""
+        value = self.native_value if self.available else None
+        if value is None or self._published_value is None or self._published_at is None:
+            return True
+
+        options = self.coordinator.config_entry.options
+        elapsed = time.monotonic() - self._published_at
+        heartbeat = options.get(CONF_HEARTBEAT_MINUTES, DEFAULT_HEARTBEAT_MINUTES) * 60
+        if heartbeat and elapsed >= heartbeat:
+            return True
+        if elapsed < options.get(CONF_MIN_PUBLISH_SECONDS, DEFAULT_MIN_PUBLISH_SECONDS):
+            return False
+        deadband = options.get(self._deadband_option, DEFAULT_SIGNAL_DEADBAND)
+        return abs(value - self._published_value) >= deadband
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Publish only significant changes."""
+        if self._should_publish():
+            super()._handle_coordinator_update()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Remember the published value."""
+        self._published_value = self.native_value if self.available else None
+        self._published_at = time.monotonic()
+        super().async_write_ha_state()
+
+
+# Fields of the SSID actions, other than the name and hidden, and the SSID settings they set.
+_SSID_ACTION_FIELDS = {
+    "password": "wpaKey",
+    "encryption_version": "encryptionVersion",
+    "guest": "guest",
+    "wifi24ghz": "2.4ghzSsid",
+    "wifi50ghz": "5.0ghzSsid",
+    "wifi60ghz": "6.0ghzSsid",
+}
+
 
 class GatewayDeviceSensor(GatewaySensor):
     """Represent a sensor for the gateway."""
 
-    def __init__(self, hass, slow_coordinator, fast_coordinator, controller, store):
+    def __init__(self, hass, slow_coordinator, fast_coordinator, controller, scheduler, store):
         """Set up a new HA T-Mobile Home Internet gateway device sensor."""
         self._hass = hass
         self._coordinator = slow_coordinator
         self._fast_coordinator = fast_coordinator
         self._controller = controller
+        self._scheduler = scheduler
         self._store = store
+        # SSID actions each rewrite the whole SSID list, so they take turns.
+        self._ssid_lock = asyncio.Lock()
         super().__init__(slow_coordinator)
         device = self._coordinator._gateway["device"]
         self._attr_device_info = DeviceInfo(
@@ -289,7 +460,16 @@ class GatewayDeviceSensor(GatewaySensor):
     def extra_state_attributes(self):
         attributes = { "device": "None" }
         if self._coordinator.data is not None:
-            attributes = self._coordinator._gateway
+            attributes = self._coordinator._gateway | {
+                "sections": self._coordinator.data["sections"],
+                "polling": {
+                    "fast": self._fast_coordinator.poll_interval.as_dict(),
+                    "slow": self._coordinator.poll_interval.as_dict(),
+                },
+            }
+            if self._controller.pool is not None:
+                attributes["requests"] = self._controller.pool.as_dict(self._controller.host)
+            attributes["access_point_queue"] = self._coordinator.access_point_writer.queue_as_dict()
         return attributes
 
     @property
@@ -298,43 +478,139 @@ class GatewayDeviceSensor(GatewaySensor):
         device = self._coordinator._gateway["device"]
         return device.get("friendlyName", device.get("model"))
 
+    async def async_added_to_hass(self) -> None:
+        """Keep the device details, which come with the time section, up to date."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._coordinator.async_add_demand("time"))
+
     # Services
-    async def _reboot_gateway(self):
-        """Reboot the gateway."""
-        await self._hass.async_add_executor_job(self._controller.reboot_gateway)
+    async def _reboot_gateway(self, wait: bool = False) -> None:
+        """Reboot the gateway, pausing polling until it is back."""
+        try:
+            reboot = await self._scheduler.async_reboot(
+                self._controller.reboot_gateway,
+                {"entry_id": self._coordinator.config_entry.entry_id, "host": self._controller.host},
+            )
+        except Exception as err:
+            raise HomeAssistantError(f"Gateway did not take the reboot request: {err}") from err
+        if wait:
+            # Shielded so that the reboot carries on if the action call is cancelled.
+            if await asyncio.shield(reboot) is None:
+                raise HomeAssistantError("Gateway did not complete its reboot in time")
 
     async def _enable_24_wifi(self, enabled: bool) -> None:
         """Enable or disable 2.4GHz WiFi."""
-        access_point = self._coordinator.data["access_point"]
-        access_point["2.4ghz"]["isRadioEnabled"] = enabled
-        await self._hass.async_add_executor_job(self._controller.set_ap_config, access_point)
+        await self._coordinator.access_point_writer.async_write({"2.4ghz": {"isRadioEnabled": enabled}})
 
     async def _enable_50_wifi(self, enabled: bool) -> None:
         """Enable or disable 5.0GHz WiFi."""
-        access_point = self._coordinator.data["access_point"]
-        access_point["5.0ghz"]["isRadioEnabled"] = enabled
-        await self._hass.async_add_executor_job(self._controller.set_ap_config, access_point)
+        await self._coordinator.access_point_writer.async_write({"5.0ghz": {"isRadioEnabled": enabled}})
 
     async def _enable_60_wifi(self, enabled: bool) -> None:
         """Enable or disable 6.0GHz WiFi."""
+        await self._coordinator.async_ensure_section("access_point")
         access_point = self._coordinator.data["access_point"]
         if "6.0ghz" in access_point:
-          access_point["6.0ghz"]["isRadioEnabled"] = enabled
-          await self._hass.async_add_executor_job(self._controller.set_ap_config, access_point)
+          await self._coordinator.access_point_writer.async_write({"6.0ghz": {"isRadioEnabled": enabled}})
         else:
           raise Exception("6.0GHz band not supported by this gateway.")
 
     async def _set_24_wifi_power(self, power_level: int) -> None:
         """Set 2.4GHz WiFi power level."""
-        access_point = self._coordinator.data["access_point"]
-        access_point["2.4ghz"]["transmissionPower"] = ('50%' if power_level == "Half" else '100%')
-        await self._hass.async_add_executor_job(self._controller.set_ap_config, access_point)
+        power = '50%' if power_level == "Half" else '100%'
+        await self._coordinator.access_point_writer.async_write({"2.4ghz": {"transmissionPower": power}})
 
     async def _set_50_wifi_power(self, power_level: int) -> None:
         """Set 5.0GHz WiFi power level."""
+        power = '50%' if power_level == "Half" else '100%'
+        await self._coordinator.access_point_writer.async_write({"5.0ghz": {"transmissionPower": power}})
+
+    async def _apply_access_point_patch(self, patch: dict) -> dict:
+        """Apply a merge patch to the access point settings in at most one write; return the changes."""
+        await self._coordinator.async_ensure_section("access_point")
         access_point = self._coordinator.data["access_point"]
-        access_point["5.0ghz"]["transmissionPower"] = ('50%' if power_level == "Half" else '100%')
-        await self._hass.async_add_executor_job(self._controller.set_ap_config, access_point)
+        for band in ("2.4ghz", "5.0ghz", "6.0ghz"):
+            if band in patch and band not in access_point:
+                raise HomeAssistantError(f"{band[:3]}GHz band not supported by this gateway.")
+        ssid_names = [ssid["ssidName"] for ssid in patch.get("ssids", [])]
+        if len(set(ssid_names)) != len(ssid_names):
+            raise HomeAssistantError("SSID names must be unique.")
+
+        writer = self._coordinator.access_point_writer
+        changes = await writer.async_write(patch)
+        return {"changes": changes, "queued": writer.queue_depth > 0}
+
+    async def _create_ssid(self, ssid_name: str, hidden: bool, **fields) -> dict:
+        """Add an SSID in a single write; return the SSIDs."""
+        async with self._ssid_lock:
+            ssids = await self._async_get_ssids(fields)
+            if "6.0ghz" in self._coordinator.data["access_point"]:
+                # Like the other bands, on unless turned off.
+                fields.setdefault("wifi60ghz", True)
+            if len(ssids) >= 4:
+                raise HomeAssistantError("The gateway supports at most 4 SSIDs.")
+            if self._ssid_position(ssids, ssid_name) is not None:
+                raise HomeAssistantError(f"SSID {ssid_name} already exists.")
+
+            new_ssid = {"encryptionMode": "AES", "isBroadcastEnabled": not hidden}
+            new_ssid |= {_SSID_ACTION_FIELDS[field]: value for field, value in fields.items()}
+            new_ssid["ssidName"] = ssid_name
+            return await self._async_write_ssids([*ssids, new_ssid])
+
+    async def _update_ssid(
+        self, ssid_name: str, new_ssid_name: str | None = None, hidden: bool | None = None, **fields
+    ) -> dict:
+        """Change an SSID's settings in a single write; return the SSIDs."""
+        async with self._ssid_lock:
+            ssids = await self._async_get_ssids(fields)
+            if (position := self._ssid_position(ssids, ssid_name)) is None:
+                raise HomeAssistantError(f"SSID {ssid_name} not found.")
+            if new_ssid_name not in (None, ssid_name) and self._ssid_position(ssids, new_ssid_name) is not None:
+                raise HomeAssistantError(f"SSID {new_ssid_name} already exists.")
+
+            ssid = ssids[position] | {_SSID_ACTION_FIELDS[field]: value for field, value in fields.items()}
+            if new_ssid_name is not None:
+                ssid["ssidName"] = new_ssid_name
+            if hidden is not None:
+                ssid["isBroadcastEnabled"] = not hidden
+            return await self._async_write_ssids([*ssids[:position], ssid, *ssids[position + 1:]])
+
+    async def _delete_ssid(self, ssid_name: str) -> dict:
+        """Delete an SSID in a single write; return the SSIDs."""
+        async with self._ssid_lock:
+            ssids = await self._async_get_ssids({})
+            if (position := self._ssid_position(ssids, ssid_name)) is None:
+                raise HomeAssistantError(f"SSID {ssid_name} not found.")
+            if position == 0:
+                raise HomeAssistantError("The gateway's first SSID cannot be deleted.")
+            return await self._async_write_ssids([*ssids[:position], *ssids[position + 1:]])
+
+    async def _async_get_ssids(self, fields: dict) -> list[dict]:
+        """Return the current SSIDs, checking the gateway has the bands the fields turn on.
+
+        Queued SSID changes are included, since the whole list is written and
+        would otherwise replace them. On a gateway without the 6GHz band,
+        wifi60ghz false is dropped from the fields.
+        """
+        await self._coordinator.async_ensure_section("access_point")
+        access_point = self._coordinator.data["access_point"]
+        if "6.0ghz" not in access_point:
+            if fields.pop("wifi60ghz", False):
+                raise HomeAssistantError("6.0GHz band not supported by this gateway.")
+        return self._coordinator.access_point_writer.with_queue(access_point)["ssids"]
+
+    @staticmethod
+    def _ssid_position(ssids: list[dict], ssid_name: str) -> int | None:
+        """Return the position of the SSID with a name, or None."""
+        return next((position for position, ssid in enumerate(ssids) if ssid["ssidName"] == ssid_name), None)
+
+    async def _async_write_ssids(self, ssids: list[dict]) -> dict:
+        """Write the SSID list; return it as the gateway now reports it, or as queued."""
+        writer = self._coordinator.access_point_writer
+        await writer.async_write({"ssids": ssids})
+        if writer.queue_depth > 0:
+            return {"ssids": ssids, "queued": True}
+        return {"ssids": self._coordinator.data["access_point"]["ssids"], "queued": False}
 
     async def _set_client_hostname(self, mac_address: str, hostname: str) -> None:
         """Set Client Hostname."""
@@ -378,6 +654,7 @@ class GatewayDeviceSensor(GatewaySensor):
 
     async def _get_client_list(self) -> list[dict]:
         """Get client list."""
+        await self._coordinator.async_ensure_section("clients")
         clients = self._coordinator.data['clients']
 
         # Add "interface" key to dicts
@@ -405,6 +682,7 @@ class GatewayDeviceSensor(GatewaySensor):
 
     async def _get_access_point(self) -> None:
         """Get Access Point."""
+        await self._coordinator.async_ensure_section("access_point")
         attributes = { "access_point": "None" }
         if self._coordinator.data is not None:
             attributes = self._coordinator.data["access_point"]
@@ -420,6 +698,7 @@ class GatewayDeviceSensor(GatewaySensor):
 
     async def _get_gateway_clients(self) -> None:
         """Get Gateway Clients."""
+        await self._coordinator.async_ensure_section("clients")
         attributes = { "clients": "None" }
         if self._coordinator.data is not None:
             attributes = self._coordinator.data["clients"]
@@ -434,15 +713,27 @@ class GatewayDeviceSensor(GatewaySensor):
 
     async def _get_cell_status(self) -> None:
         """Get Cell Status."""
+        await self._fast_coordinator.async_ensure_section("cell")
         attributes = { "cell": "None" }
         if self._fast_coordinator.data is not None:
             attributes = self._fast_coordinator.data["cell"]
         return attributes
 
+    async def _get_cell_history(self, minutes: int = 60, include_samples: bool = False) -> dict:
+        """Get Cell History from the samples held in memory."""
+        since = dt_util.utcnow().timestamp() - minutes * 60
+        return self._fast_coordinator.history.summary(since, include_samples)
+
+    async def _get_cell_ranking(self, generation: str | None = None, limit: int | None = None) -> dict:
+        """Get the cells the gateway has used, best first."""
+        return {"cells": self._fast_coordinator.cell_index.ranking(generation, limit)}
+
 
 class GatewayAccessPointSensor(GatewaySensor):
     """Represent a sensor for the gateway."""
 
+    _section = "access_point"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet access point sensor."""
         super().__init__(coordinator)
@@ -460,7 +751,7 @@ class GatewayAccessPointSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_access_point")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_access_point")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -483,6 +774,8 @@ class GatewayAccessPointSensor(GatewaySensor):
 class GatewayClientsSensor(GatewaySensor):
     """Represent a sensor for the clients of the gateway."""
 
+    _section = "clients"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway clients sensor."""
         super().__init__(coordinator)
@@ -505,7 +798,7 @@ class GatewayClientsSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_gateway_clients")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_gateway_clients")
 
     @property
     def native_unit_of_measurement(self) -> str:
@@ -534,6 +827,8 @@ class GatewayClientsSensor(GatewaySensor):
 class GatewayCellSensor(GatewaySensor):
     """Represent a sensor for the gateway."""
 
+    _section = "cell"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway cell sensor."""
         super().__init__(coordinator)
@@ -551,7 +846,7 @@ class GatewayCellSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_cell_status")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_cell_status")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -597,7 +892,7 @@ class GatewayDeviceSimSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_gateway_sim_card")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_gateway_sim_card")
 
     @property
     def extra_state_attributes(self):
@@ -616,6 +911,8 @@ class GatewayDeviceSimSensor(GatewaySensor):
 class Gateway4gBandsSensor(GatewaySensor):
     """Represent a sensor for the gateway 4G active bands."""
 
+    _section = "cell"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway 4G active bands sensor."""
         super().__init__(coordinator)
@@ -633,7 +930,7 @@ class Gateway4gBandsSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_4g_bands")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_4g_bands")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -648,9 +945,14 @@ class Gateway4gBandsSensor(GatewaySensor):
         return ' '.join(self.coordinator.data["cell"]["4g"]["sector"]["bands"])
 
 
-class Gateway4gRSRPSensor(GatewaySensor):
+class Gateway4gRSRPSensor(GatewaySignalSensor):
     """Represent a sensor for the gateway 4G Reference Signal Received Power."""
 
+    _section = "cell"
+    _deadband_option = CONF_RSRP_DEADBAND
+    _generation = "4g"
+    _metric = "rsrp"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway 4G RSRP sensor."""
         super().__init__(coordinator)
@@ -668,7 +970,7 @@ class Gateway4gRSRPSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_4g_RSRP")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_4g_RSRP")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -682,7 +984,7 @@ class Gateway4gRSRPSensor(GatewaySensor):
 
     @property
     def extra_state_attributes(self):
-        return { "description": "4G Reference Signal Received Power" }
+        return { "description": "4G Reference Signal Received Power" } | self._window_attributes()
 
     @property
     def native_unit_of_measurement(self) -> str:
@@ -697,9 +999,14 @@ class Gateway4gRSRPSensor(GatewaySensor):
         return self.coordinator.data["cell"]["4g"]["sector"]["rsrp"]
 
 
-class Gateway4gRSRQSensor(GatewaySensor):
+class Gateway4gRSRQSensor(GatewaySignalSensor):
     """Represent a sensor for the gateway 4G Reference Signal Received Quality."""
 
+    _section = "cell"
+    _deadband_option = CONF_RSRQ_DEADBAND
+    _generation = "4g"
+    _metric = "rsrq"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway 4G RSRQ sensor."""
         super().__init__(coordinator)
@@ -717,7 +1024,7 @@ class Gateway4gRSRQSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_4g_RSRQ")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_4g_RSRQ")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -736,7 +1043,7 @@ class Gateway4gRSRQSensor(GatewaySensor):
 
     @property
     def extra_state_attributes(self):
-        return { "description": "4G Reference Signal Received Quality" }
+        return { "description": "4G Reference Signal Received Quality" } | self._window_attributes()
 
     @property
     def native_value(self) -> int | None:
@@ -746,9 +1053,14 @@ class Gateway4gRSRQSensor(GatewaySensor):
         return self.coordinator.data["cell"]["4g"]["sector"]["rsrq"]
 
 
-class Gateway4gSINRSensor(GatewaySensor):
+class Gateway4gSINRSensor(GatewaySignalSensor):
     """Represent a sensor for the gateway 4G Signal-to-interference-plus-noise ratio."""
 
+    _section = "cell"
+    _deadband_option = CONF_SINR_DEADBAND
+    _generation = "4g"
+    _metric = "sinr"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway 4G SINR sensor."""
         super().__init__(coordinator)
@@ -766,7 +1078,7 @@ class Gateway4gSINRSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_4g_SINR")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_4g_SINR")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -785,7 +1097,7 @@ class Gateway4gSINRSensor(GatewaySensor):
 
     @property
     def extra_state_attributes(self):
-        return { "description": "4G Signal to Interference & Noise Ratio" }
+        return { "description": "4G Signal to Interference & Noise Ratio" } | self._window_attributes()
 
     @property
     def native_value(self) -> int | None:
@@ -798,6 +1110,8 @@ class Gateway4gSINRSensor(GatewaySensor):
 class Gateway4gAntennaSensor(GatewaySensor):
     """Represent a sensor for the gateway 4G antenna used."""
 
+    _section = "cell"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway 4G antenna used sensor."""
         super().__init__(coordinator)
@@ -815,7 +1129,7 @@ class Gateway4gAntennaSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_4g_antenna")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_4g_antenna")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -833,6 +1147,8 @@ class Gateway4gAntennaSensor(GatewaySensor):
 class Gateway4gBandwidthSensor(GatewaySensor):
     """Represent a sensor for the gateway 4G bandwidth."""
 
+    _section = "cell"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway 4G bandwidth sensor."""
         super().__init__(coordinator)
@@ -850,7 +1166,7 @@ class Gateway4gBandwidthSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_4g_bandwidth")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_4g_bandwidth")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -870,6 +1186,8 @@ class Gateway4gBandwidthSensor(GatewaySensor):
 class Gateway4gECGISensor(GatewaySensor):
     """Represent a sensor for the gateway 4G ECGI."""
 
+    _section = "cell"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway 4G ECGI sensor."""
         super().__init__(coordinator)
@@ -887,7 +1205,7 @@ class Gateway4gECGISensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_4g_ecgi")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_4g_ecgi")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -907,6 +1225,8 @@ class Gateway4gECGISensor(GatewaySensor):
 class Gateway5gBandsSensor(GatewaySensor):
     """Represent a sensor for the gateway 4G active bands."""
 
+    _section = "cell"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway 5G active bands sensor."""
         super().__init__(coordinator)
@@ -924,7 +1244,7 @@ class Gateway5gBandsSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_5g_bands")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_5g_bands")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -939,9 +1259,14 @@ class Gateway5gBandsSensor(GatewaySensor):
         return ' '.join(self.coordinator.data["cell"]["5g"]["sector"]["bands"])
 
 
-class Gateway5gRSRPSensor(GatewaySensor):
+class Gateway5gRSRPSensor(GatewaySignalSensor):
     """Represent a sensor for the gateway 5G Reference Signal Received Power."""
 
+    _section = "cell"
+    _deadband_option = CONF_RSRP_DEADBAND
+    _generation = "5g"
+    _metric = "rsrp"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway 5G RSRP sensor."""
         super().__init__(coordinator)
@@ -959,7 +1284,7 @@ class Gateway5gRSRPSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_5g_RSRP")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_5g_RSRP")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -978,7 +1303,7 @@ class Gateway5gRSRPSensor(GatewaySensor):
 
     @property
     def extra_state_attributes(self):
-        return { "description": "5G Reference Signal Received Power" }
+        return { "description": "5G Reference Signal Received Power" } | self._window_attributes()
 
     @property
     def native_value(self) -> int | None:
@@ -988,9 +1313,14 @@ class Gateway5gRSRPSensor(GatewaySensor):
         return self.coordinator.data["cell"]["5g"]["sector"]["rsrp"]
 
 
-class Gateway5gRSRQSensor(GatewaySensor):
+class Gateway5gRSRQSensor(GatewaySignalSensor):
     """Represent a sensor for the gateway 5G Reference Signal Received Quality."""
 
+    _section = "cell"
+    _deadband_option = CONF_RSRQ_DEADBAND
+    _generation = "5g"
+    _metric = "rsrq"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway 5G RSRQ sensor."""
         super().__init__(coordinator)
@@ -1009,7 +1339,7 @@ class Gateway5gRSRQSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_5g_RSRQ")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_5g_RSRQ")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -1028,7 +1358,7 @@ class Gateway5gRSRQSensor(GatewaySensor):
 
     @property
     def extra_state_attributes(self):
-        return { "description": "5G Reference Signal Received Quality" }
+        return { "description": "5G Reference Signal Received Quality" } | self._window_attributes()
 
     @property
     def native_value(self) -> int | None:
@@ -1038,9 +1368,14 @@ class Gateway5gRSRQSensor(GatewaySensor):
         return self.coordinator.data["cell"]["5g"]["sector"]["rsrq"]
 
 
-class Gateway5gSINRSensor(GatewaySensor):
+class Gateway5gSINRSensor(GatewaySignalSensor):
     """Represent a sensor for the gateway 5G Signal-to-interference-plus-noise ratio."""
 
+    _section = "cell"
+    _deadband_option = CONF_SINR_DEADBAND
+    _generation = "5g"
+    _metric = "sinr"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway 5G SINR sensor."""
         super().__init__(coordinator)
@@ -1058,7 +1393,7 @@ class Gateway5gSINRSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_5g_SINR")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_5g_SINR")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -1077,7 +1412,7 @@ class Gateway5gSINRSensor(GatewaySensor):
 
     @property
     def extra_state_attributes(self):
-        return { "description": "5G Signal to Interference & Noise Ratio" }
+        return { "description": "5G Signal to Interference & Noise Ratio" } | self._window_attributes()
 
     @property
     def native_value(self) -> int | None:
@@ -1090,6 +1425,8 @@ class Gateway5gSINRSensor(GatewaySensor):
 class Gateway5gAntennaSensor(GatewaySensor):
     """Represent a sensor for the gateway 5G antenna used."""
 
+    _section = "cell"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway 5G antenna used sensor."""
         super().__init__(coordinator)
@@ -1107,7 +1444,7 @@ class Gateway5gAntennaSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_5g_antenna")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_5g_antenna")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -1125,6 +1462,8 @@ class Gateway5gAntennaSensor(GatewaySensor):
 class Gateway5gBandwidthSensor(GatewaySensor):
     """Represent a sensor for the gateway 5G bandwidth."""
 
+    _section = "cell"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway 5G bandwidth sensor."""
         super().__init__(coordinator)
@@ -1142,7 +1481,7 @@ class Gateway5gBandwidthSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_5g_bandwidth")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_5g_bandwidth")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -1162,6 +1501,8 @@ class Gateway5gBandwidthSensor(GatewaySensor):
 class Gateway5gECGISensor(GatewaySensor):
     """Represent a sensor for the gateway 5G ECGI."""
 
+    _section = "cell"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway 5G ECGI sensor."""
         super().__init__(coordinator)
@@ -1179,7 +1520,7 @@ class Gateway5gECGISensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_5g_ecgi")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_5g_ecgi")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -1197,6 +1538,8 @@ class Gateway5gECGISensor(GatewaySensor):
 class GatewayUptimeSensor(GatewaySensor):
     """Represent a sensor for the gateway uptime."""
 
+    _section = "time"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway uptime sensor."""
         super().__init__(coordinator)
@@ -1219,7 +1562,7 @@ class GatewayUptimeSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_gateway_uptime")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_gateway_uptime")
 
     @property
     def native_value(self) -> float:
@@ -1227,6 +1570,121 @@ class GatewayUptimeSensor(GatewaySensor):
         uptime = self.coordinator.data["time"]["upTime"]
         return 0 if uptime is None else round(uptime / 3600, 1)
 
+class GatewaySignalStatisticsSensor(GatewaySensor):
+    """Represent a sensor for rolling statistics of a cell signal metric."""
+
+    _section = "cell"
+
+    def __init__(self, coordinator, generation, metric):
+        """Set up a new HA T-Mobile Home Internet gateway signal statistics sensor."""
+        self._generation = generation
+        self._metric = metric
+        super().__init__(coordinator)
+
+    @property
+    def _statistics(self):
+        """Return the rolling statistics this sensor shows."""
+        return self.coordinator.statistics[(self._generation, self._metric)]
+
+    @property
+    def icon(self) -> str:
+        """Return icon."""
+        return "mdi:chart-bell-curve"
+
+    @property
+    def name(self) -> str:
+        """Return the name of this sensor."""
+        return f"T-Mobile {self._generation.upper()} {self._metric.upper()} Statistics"
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique, Home Assistant friendly identifier for this entity."""
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_{self._generation}_{self._metric}_statistics")
+
+    @property
+    def entity_registry_enabled_default(self) -> bool:
+        """Set entity disabled by default."""
+        return False
+
+    @property
+    def device_class(self) -> SensorDeviceClass | None:
+        """Return the type of sensor."""
+        return SensorDeviceClass.SIGNAL_STRENGTH
+
+    @property
+    def native_unit_of_measurement(self) -> str:
+        """The unit of measurement that the sensor's value is expressed in."""
+        return "dBm" if self._metric == "rsrp" else "dB"
+
+    @property
+    def available(self) -> bool:
+        """Return if there are samples in the window."""
+        return super().available and self._statistics.count > 0
+
+    @property
+    def extra_state_attributes(self):
+        return self._statistics.as_dict()
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the mean over the window."""
+        mean = self._statistics.mean
+        return None if mean is None else round(mean, 1)
+
+class GatewayConnectionSensor(GatewaySensor):
+    """Represent a sensor for whether the gateway is reachable."""
+
+    def __init__(self, coordinator, scheduler):
+        """Set up a new HA T-Mobile Home Internet gateway connection sensor."""
+        self._scheduler = scheduler
+        super().__init__(coordinator)
+
+    @property
+    def icon(self) -> str:
+        """Return icon."""
+        return "mdi:lan-connect" if self.native_value == "online" else "mdi:lan-disconnect"
+
+    @property
+    def name(self) -> str:
+        """Return the name of this sensor."""
+        return f"T-Mobile Gateway Connection"
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique, Home Assistant friendly identifier for this entity."""
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_gateway_connection")
+
+    @property
+    def device_class(self) -> SensorDeviceClass:
+        """Return device_class."""
+        return SensorDeviceClass.ENUM
+
+    @property
+    def options(self) -> list[str]:
+        """Return the possible states."""
+        return ["online", "offline", "rebooting"]
+
+    @property
+    def available(self) -> bool:
+        """Always available; reporting an unreachable gateway is its purpose."""
+        return True
+
+    @property
+    def extra_state_attributes(self):
+        return self._scheduler.breaker.as_dict() | {"rebooting": self._scheduler.rebooting}
+
+    @property
+    def native_value(self) -> str:
+        """Return the value of this sensor."""
+        if self._scheduler.rebooting:
+            return "rebooting"
+        return "offline" if self._scheduler.breaker.is_open else "online"
+
+    async def async_added_to_hass(self) -> None:
+        """Update when the circuit breaker opens or closes, or a reboot starts or ends."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._scheduler.async_add_listener(self.async_write_ha_state))
+
 class GatewaySSIDEditIndexSensor(GatewaySensor):
     """Represent a sensor for the gateway SSID Edit Index."""
 
@@ -1248,7 +1706,7 @@ class GatewaySSIDEditIndexSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_gateway_ssid_edit_index")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_gateway_ssid_edit_index")
 
     @property
     def entity_registry_visible_default(self) -> bool:
@@ -1258,11 +1716,13 @@ class GatewaySSIDEditIndexSensor(GatewaySensor):
     @property
     def native_value(self) -> int:
         """Return the value of this sensor."""
-        return get_ssid_edit_index(self._hass)
+        return get_ssid_edit_index(self._hass, self._coordinator.config_entry)
 
 class GatewaySSIDCountSensor(GatewaySensor):
     """Represent a sensor for the gateway SSID Count."""
 
+    _section = "access_point"
+
     def __init__(self, coordinator):
         """Set up a new HA T-Mobile Home Internet gateway SSID Count sensor."""
         super().__init__(coordinator)
@@ -1285,7 +1745,7 @@ class GatewaySSIDCountSensor(GatewaySensor):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_gateway_ssid_count")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_gateway_ssid_count")
 
     @property
     def native_value(self) -> int:
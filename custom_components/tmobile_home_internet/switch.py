@@ -13,7 +13,8 @@ from .const import (
     DOMAIN,
 )
 
-from .utils import set_edits_pending
+from .entity import SkipUnchangedStateMixin
+from .utils import set_edits_pending, value_hash
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -49,9 +50,11 @@ def _create_entities(hass: HomeAssistant, entry: dict):
     return entities
 
 
-class GatewaySwitch(CoordinatorEntity, SwitchEntity):
+class GatewaySwitch(SkipUnchangedStateMixin, CoordinatorEntity, SwitchEntity):
     """Represent a switch for the gateway."""
 
+    _section: str | None = None
+
     def __init__(self, hass, entry, coordinator, controller):
         """Set up a new HA T-Mobile Home Internet switch."""
         self._hass = hass
@@ -64,10 +67,29 @@ class GatewaySwitch(CoordinatorEntity, SwitchEntity):
             identifiers={(DOMAIN, coordinator.config_entry.entry_id)},
         )
 
+    @property
+    def available(self) -> bool:
+        """Return if the gateway data this entity depends on is fresh."""
+        return super().available and (
+            self._section is None or self.coordinator.section_available(self._section)
+        )
+
+    def _state_fingerprint(self) -> tuple:
+        """Return the rendered state."""
+        return (self.is_on, value_hash(self.extra_state_attributes), self.icon)
+
+    async def async_added_to_hass(self) -> None:
+        """Register demand for the section of gateway data this entity reads."""
+        await super().async_added_to_hass()
+        if self._section is not None:
+            self.async_on_remove(self.coordinator.async_add_demand(self._section))
+
 
 class GatewayWiFi24GHzSwitch(GatewaySwitch):
     """Represent a switch for the gateway."""
 
+    _section = "access_point"
+
     def __init__(self, hass, entry, coordinator, controller):
         """Set up a new HA T-Mobile Home Internet WiFi 2.4GHz switch."""
         super().__init__(hass, entry, coordinator, controller)
@@ -85,7 +107,7 @@ class GatewayWiFi24GHzSwitch(GatewaySwitch):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_wifi_2_4GHz")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_wifi_2_4GHz")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -106,25 +128,18 @@ class GatewayWiFi24GHzSwitch(GatewaySwitch):
 
     async def async_turn_on(self, **kwargs):
         """Enable WiFi 2.4GHz."""
-        access_point = self.coordinator.data["access_point"]
-        access_point["2.4ghz"]["isRadioEnabled"] = True
-        await self._hass.async_add_executor_job(self._controller.set_ap_config, access_point)
-        # Doing an async_request_refresh here won't work as the gateway is resetting.
-        self._attr_is_on = True
-        self.async_write_ha_state()
+        # The writer publishes the config it wrote; a refresh won't work as the gateway is resetting.
+        await self.coordinator.access_point_writer.async_write({"2.4ghz": {"isRadioEnabled": True}})
 
     async def async_turn_off(self, **kwargs):
         """Disable WiFi 2.4GHz."""
-        access_point = self.coordinator.data["access_point"]
-        access_point["2.4ghz"]["isRadioEnabled"] = False
-        await self._hass.async_add_executor_job(self._controller.set_ap_config, access_point)
-        # Doing an async_request_refresh here won't work as the router is resetting.
-        self._attr_is_on = False
-        self.async_write_ha_state()
+        await self.coordinator.access_point_writer.async_write({"2.4ghz": {"isRadioEnabled": False}})
 
 class GatewayWiFi50GHzSwitch(GatewaySwitch):
     """Represent a switch for the gateway."""
 
+    _section = "access_point"
+
     def __init__(self, hass, entry, coordinator, controller):
         """Set up a new HA T-Mobile Home Internet WiFi 5.0GHz switch."""
         super().__init__(hass, entry, coordinator, controller)
@@ -142,7 +157,7 @@ class GatewayWiFi50GHzSwitch(GatewaySwitch):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_wifi_5_0GHz")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_wifi_5_0GHz")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -163,26 +178,19 @@ class GatewayWiFi50GHzSwitch(GatewaySwitch):
 
     async def async_turn_on(self, **kwargs):
         """Enable WiFi 5.0GHz."""
-        access_point = self.coordinator.data["access_point"]
-        access_point["5.0ghz"]["isRadioEnabled"] = True
-        await self._hass.async_add_executor_job(self._controller.set_ap_config, access_point)
-        # Doing an async_request_refresh here won't work as the router is resetting.
-        self._attr_is_on = True
-        self.async_write_ha_state()
+        # The writer publishes the config it wrote; a refresh won't work as the gateway is resetting.
+        await self.coordinator.access_point_writer.async_write({"5.0ghz": {"isRadioEnabled": True}})
 
     async def async_turn_off(self, **kwargs):
         """Disable WiFi 5.GHz."""
-        access_point = self.coordinator.data["access_point"]
-        access_point["5.0ghz"]["isRadioEnabled"] = False
-        await self._hass.async_add_executor_job(self._controller.set_ap_config, access_point)
-        # Doing an async_request_refresh here won't work as the router is resetting.
-        self._attr_is_on = False
-        self.async_write_ha_state()
+        await self.coordinator.access_point_writer.async_write({"5.0ghz": {"isRadioEnabled": False}})
 
 
 class GatewayWiFi60GHzSwitch(GatewaySwitch):
     """Represent a switch for the gateway."""
 
+    _section = "access_point"
+
     def __init__(self, hass, entry, coordinator, controller):
         """Set up a new HA T-Mobile Home Internet WiFi 6.0GHz switch."""
         super().__init__(hass, entry, coordinator, controller)
@@ -200,7 +208,7 @@ class GatewayWiFi60GHzSwitch(GatewaySwitch):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_wifi_6_0GHz")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_wifi_6_0GHz")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -226,11 +234,8 @@ class GatewayWiFi60GHzSwitch(GatewaySwitch):
         """Enable WiFi 6.0GHz."""
         access_point = self.coordinator.data["access_point"]
         if "6.0ghz" in access_point:
-          access_point["6.0ghz"]["isRadioEnabled"] = True
-          await self._hass.async_add_executor_job(self._controller.set_ap_config, access_point)
-          # Doing an async_request_refresh here won't work as the router is resetting.
-          self._attr_is_on = True
-          self.async_write_ha_state()
+          # The writer publishes the config it wrote; a refresh won't work as the gateway is resetting.
+          await self.coordinator.access_point_writer.async_write({"6.0ghz": {"isRadioEnabled": True}})
         else:
           raise Exception("6.0GHz band not supported by this gateway.")
 
@@ -238,11 +243,7 @@ class GatewayWiFi60GHzSwitch(GatewaySwitch):
         """Disable WiFi 6.GHz."""
         access_point = self.coordinator.data["access_point"]
         if "6.0ghz" in access_point:
-          access_point["6.0ghz"]["isRadioEnabled"] = False
-          await self._hass.async_add_executor_job(self._controller.set_ap_config, access_point)
-          # Doing an async_request_refresh here won't work as the router is resetting.
-          self._attr_is_on = False
-          self.async_write_ha_state()
+          await self.coordinator.access_point_writer.async_write({"6.0ghz": {"isRadioEnabled": False}})
         else:
           raise Exception("6.0GHz band not supported by this gateway.")
 
@@ -269,7 +270,7 @@ class GatewayEditSSIDsEditsPendingSwitch(GatewaySwitch):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_edit_ssid_edits_pending")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_edit_ssid_edits_pending")
 
     @property
     def entity_registry_visible_default(self) -> bool:
@@ -314,7 +315,7 @@ class GatewayEditSSIDsEditsNameValidSwitch(GatewaySwitch):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_edit_ssid_edits_name_valid")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_edit_ssid_edits_name_valid")
 
     @property
     def entity_registry_visible_default(self) -> bool:
@@ -359,7 +360,7 @@ class GatewayEditSSIDsEditsPasswordValidSwitch(GatewaySwitch):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_edit_ssid_edits_password_valid")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_edit_ssid_edits_password_valid")
 
     @property
     def entity_registry_visible_default(self) -> bool:
@@ -404,7 +405,7 @@ class GatewayEditSSIDsEditsSavingSwitch(GatewaySwitch):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_edit_ssid_edits_saving")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_edit_ssid_edits_saving")
 
     @property
     def entity_registry_visible_default(self) -> bool:
@@ -449,7 +450,7 @@ class GatewayEditSSIDHiddenSwitch(GatewaySwitch):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_edit_ssid_hidden")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_edit_ssid_hidden")
 
     @property
     def entity_registry_visible_default(self) -> bool:
@@ -467,7 +468,7 @@ class GatewayEditSSIDHiddenSwitch(GatewaySwitch):
         self.async_write_ha_state()
 
         # Show edits pending
-        await set_edits_pending(True)
+        await set_edits_pending(self.hass, self._coordinator.config_entry, True)
 
     async def async_turn_off(self, **kwargs):
         """Expose SSID."""
@@ -475,7 +476,7 @@ class GatewayEditSSIDHiddenSwitch(GatewaySwitch):
         self.async_write_ha_state()
 
         # Show edits pending
-        await set_edits_pending(True)
+        await set_edits_pending(self.hass, self._coordinator.config_entry, True)
 
 
 class GatewayEditSSIDGuestSwitch(GatewaySwitch):
@@ -500,7 +501,7 @@ class GatewayEditSSIDGuestSwitch(GatewaySwitch):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_edit_ssid_guest")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_edit_ssid_guest")
 
     @property
     def entity_registry_visible_default(self) -> bool:
@@ -518,7 +519,7 @@ class GatewayEditSSIDGuestSwitch(GatewaySwitch):
         self.async_write_ha_state()
 
         # Show edits pending
-        await set_edits_pending(True)
+        await set_edits_pending(self.hass, self._coordinator.config_entry, True)
 
     async def async_turn_off(self, **kwargs):
         """Clear guest mode."""
@@ -526,7 +527,7 @@ class GatewayEditSSIDGuestSwitch(GatewaySwitch):
         self.async_write_ha_state()
 
         # Show edits pending
-        await set_edits_pending(True)
+        await set_edits_pending(self.hass, self._coordinator.config_entry, True)
 
 
 class GatewayEditSSID24GHzSwitch(GatewaySwitch):
@@ -551,7 +552,7 @@ class GatewayEditSSID24GHzSwitch(GatewaySwitch):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_edit_ssid_2_4ghz")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_edit_ssid_2_4ghz")
 
     @property
     def entity_registry_visible_default(self) -> bool:
@@ -569,7 +570,7 @@ class GatewayEditSSID24GHzSwitch(GatewaySwitch):
         self.async_write_ha_state()
 
         # Show edits pending
-        await set_edits_pending(True)
+        await set_edits_pending(self.hass, self._coordinator.config_entry, True)
 
     async def async_turn_off(self, **kwargs):
         """Disable 2.4GHz band."""
@@ -577,7 +578,7 @@ class GatewayEditSSID24GHzSwitch(GatewaySwitch):
         self.async_write_ha_state()
 
         # Show edits pending
-        await set_edits_pending(True)
+        await set_edits_pending(self.hass, self._coordinator.config_entry, True)
 
 
 class GatewayEditSSID50GHzSwitch(GatewaySwitch):
@@ -602,7 +603,7 @@ class GatewayEditSSID50GHzSwitch(GatewaySwitch):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_edit_ssid_5_0ghz")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_edit_ssid_5_0ghz")
 
     @property
     def entity_registry_visible_default(self) -> bool:
@@ -620,7 +621,7 @@ class GatewayEditSSID50GHzSwitch(GatewaySwitch):
         self.async_write_ha_state()
 
         # Show edits pending
-        await set_edits_pending(True)
+        await set_edits_pending(self.hass, self._coordinator.config_entry, True)
 
     async def async_turn_off(self, **kwargs):
         """Disable 5.0GHz band."""
@@ -628,7 +629,7 @@ class GatewayEditSSID50GHzSwitch(GatewaySwitch):
         self.async_write_ha_state()
 
         # Show edits pending
-        await set_edits_pending(True)
+        await set_edits_pending(self.hass, self._coordinator.config_entry, True)
 
 
 class GatewayEditSSID60GHzSwitch(GatewaySwitch):
@@ -653,7 +654,7 @@ class GatewayEditSSID60GHzSwitch(GatewaySwitch):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_edit_ssid_6_0ghz")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_edit_ssid_6_0ghz")
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -676,7 +677,7 @@ class GatewayEditSSID60GHzSwitch(GatewaySwitch):
         self.async_write_ha_state()
 
         # Show edits pending
-        await set_edits_pending(True)
+        await set_edits_pending(self.hass, self._coordinator.config_entry, True)
 
     async def async_turn_off(self, **kwargs):
         """Disable 6.0GHz band."""
@@ -684,4 +685,4 @@ class GatewayEditSSID60GHzSwitch(GatewaySwitch):
         self.async_write_ha_state()
 
         # Show edits pending
-        await set_edits_pending(True)
+        await set_edits_pending(self.hass, self._coordinator.config_entry, True)
@@ -15,6 +15,7 @@ from .const import (
     SSID_PASSWORD_PATTERN,
 )
 
+from .entity import SkipUnchangedStateMixin
 from .utils import set_edits_pending
 
 _LOGGER = logging.getLogger(__name__)
@@ -39,7 +40,7 @@ def _create_entities(hass: HomeAssistant, entry: dict):
     return entities
 
 
-class GatewayText(CoordinatorEntity, TextEntity):
+class GatewayText(SkipUnchangedStateMixin, CoordinatorEntity, TextEntity):
     """Represent a text for the gateway."""
 
     def __init__(self, hass, coordinator):
@@ -52,6 +53,10 @@ class GatewayText(CoordinatorEntity, TextEntity):
             identifiers={(DOMAIN, coordinator.config_entry.entry_id)},
         )
 
+    def _state_fingerprint(self) -> tuple:
+        """Return the rendered state."""
+        return (self.native_value,)
+
 
 class GatewayEditSSIDNameText(GatewayText):
     """Represent a text for the gateway."""
@@ -76,7 +81,7 @@ class GatewayEditSSIDNameText(GatewayText):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_edit_ssid_name")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_edit_ssid_name")
 
     @property
     def entity_registry_visible_default(self) -> bool:
@@ -109,7 +114,7 @@ class GatewayEditSSIDNameText(GatewayText):
         self.async_write_ha_state()
 
         # Show edits pending
-        await set_edits_pending(True)
+        await set_edits_pending(self.hass, self._coordinator.config_entry, True)
 
 
 class GatewayEditSSIDPasswordText(GatewayText):
@@ -134,7 +139,7 @@ class GatewayEditSSIDPasswordText(GatewayText):
     @property
     def unique_id(self) -> str:
         """Return a unique, Home Assistant friendly identifier for this entity."""
-        return slugify(f"{self._entity_type}_tmobile_home_internet_edit_ssid_password")
+        return slugify(f"{self._coordinator.config_entry.entry_id}_{self._entity_type}_tmobile_home_internet_edit_ssid_password")
 
     @property
     def entity_registry_visible_default(self) -> bool:
@@ -167,5 +172,5 @@ class GatewayEditSSIDPasswordText(GatewayText):
         self.async_write_ha_state()
 
         # Show edits pending
-        await set_edits_pending(True)
+        await set_edits_pending(self.hass, self._coordinator.config_entry, True)
 
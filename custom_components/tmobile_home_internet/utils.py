@@ -1,29 +1,38 @@
 """The Home Assistant T-Mobile Home Internet integration utils."""
+import asyncio
+import copy
+import json
 import logging
 import random
 import re
 import string
-import time
 
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import Event, HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import slugify
 
-from .const import SSID_NAME_PATTERN, SSID_PASSWORD_PATTERN
+from .const import DOMAIN, SSID_NAME_PATTERN, SSID_PASSWORD_PATTERN
 
 _LOGGER = logging.getLogger(__name__)
 
-class Static():
-    _hass = None
+def edit_entity_id(hass: HomeAssistant, entry: ConfigEntry, domain: str, key: str) -> str | None:
+    """Return the entity id of one of an entry's SSID editing entities, found by its unique id.
 
-    @property
-    def hass(self) -> HomeAssistant:
-        """Return hass object."""
-        return Static._hass
+    Only the first entry's entities get ids such as text.t_mobile_edit_ssid_name;
+    the others' have a suffix, and any of them may have been renamed.
+    """
+    unique_id = slugify(f"{entry.entry_id}_{domain}_tmobile_home_internet_{key}")
+    return er.async_get(hass).async_get_entity_id(domain, DOMAIN, unique_id)
 
-    @hass.setter
-    def hass(self, hass):
-        Static._hass = hass
+def edit_state(hass: HomeAssistant, entry: ConfigEntry, domain: str, key: str) -> str | None:
+    """Return the state of one of an entry's SSID editing entities."""
+    entity_id = edit_entity_id(hass, entry, domain, key)
+    state = hass.states.get(entity_id) if entity_id is not None else None
+    return state.state if state is not None else None
 
-async def set_ssid_edit_controls(hass: HomeAssistant, coordinator, ssid_index: int) -> None:
+async def set_ssid_edit_controls(hass: HomeAssistant, entry: ConfigEntry, coordinator, ssid_index: int) -> None:
     """Restore editing controls to gateway values"""
 
     # Restore the original values to controls
@@ -37,7 +46,7 @@ async def set_ssid_edit_controls(hass: HomeAssistant, coordinator, ssid_index: i
     ssid6_0ghz = coordinator.data["access_point"]['ssids'][ssid_index].get("6.0ghzSsid", False)  # May not exist on all gateways
 
     # Check ssidName
-    name_valid = hass.states.get("switch.t_mobile_edit_ssid_edits_name_valid").state
+    name_valid = edit_state(hass, entry, "switch", "edit_ssid_edits_name_valid")
 
     # If current string did not pass pattern test, state will not have been updated,
     # so setting it to itself does nothing and card will retain invalid text after Cancel. 
@@ -48,25 +57,25 @@ async def set_ssid_edit_controls(hass: HomeAssistant, coordinator, ssid_index: i
         # Set ssidName to random string
         await hass.services.async_call(
                     "text", "set_value", 
-                    {"entity_id": "text.t_mobile_edit_ssid_name", "value": random_string}, 
+                    {"entity_id": edit_entity_id(hass, entry, "text", "edit_ssid_name"), "value": random_string}, 
                     blocking=True
                 )
 
         # Delay is necessary or above change will not be applied.
-        await hass.async_add_executor_job(time.sleep, 0.05)
+        await asyncio.sleep(0.05)
 
     # Set ssidName valid
-    await set_SSID_name_valid(True)
+    await set_SSID_name_valid(hass, entry, True)
 
     # Set ssidName to gateway value
     await hass.services.async_call(
                 "text", "set_value", 
-                {"entity_id": "text.t_mobile_edit_ssid_name", "value": ssidName}, 
+                {"entity_id": edit_entity_id(hass, entry, "text", "edit_ssid_name"), "value": ssidName}, 
                 blocking=True
             )
 
     # Check wpaKey
-    password_valid = hass.states.get("switch.t_mobile_edit_ssid_edits_password_valid").state
+    password_valid = edit_state(hass, entry, "switch", "edit_ssid_edits_password_valid")
 
     # Same logic as above with name.
     if password_valid == "off":
@@ -75,27 +84,27 @@ async def set_ssid_edit_controls(hass: HomeAssistant, coordinator, ssid_index: i
         # Set wpaKey to random string
         await hass.services.async_call(
                     "text", "set_value", 
-                    {"entity_id": "text.t_mobile_edit_ssid_password", "value": random_string}, 
+                    {"entity_id": edit_entity_id(hass, entry, "text", "edit_ssid_password"), "value": random_string}, 
                     blocking=True
                 )
 
         # Delay is necessary or above change will not be applied.
-        await hass.async_add_executor_job(time.sleep, 0.05)
+        await asyncio.sleep(0.05)
 
     # Set wpaKey valid
-    await set_SSID_password_valid(True)
+    await set_SSID_password_valid(hass, entry, True)
 
     # Set wpaKey to gateway value
     await hass.services.async_call(
                 "text", "set_value", 
-                {"entity_id": "text.t_mobile_edit_ssid_password", "value": wpaKey}, 
+                {"entity_id": edit_entity_id(hass, entry, "text", "edit_ssid_password"), "value": wpaKey}, 
                 blocking=True
             )
 
     # Set encryptionVersion to gateway value
     await hass.services.async_call(
                 "select", "select_option", 
-                {"entity_id": "select.t_mobile_edit_ssid_encryption_version", "option": encryptionVersion}, 
+                {"entity_id": edit_entity_id(hass, entry, "select", "edit_ssid_encryption_version"), "option": encryptionVersion}, 
                 blocking=True
             )
 
@@ -103,7 +112,7 @@ async def set_ssid_edit_controls(hass: HomeAssistant, coordinator, ssid_index: i
     action = "turn_off" if isBroadcastEnabled else "turn_on"
     await hass.services.async_call(
                 "switch", action, 
-                {"entity_id": "switch.t_mobile_edit_ssid_hidden"}, 
+                {"entity_id": edit_entity_id(hass, entry, "switch", "edit_ssid_hidden")}, 
                 blocking=True
             )
 
@@ -111,7 +120,7 @@ async def set_ssid_edit_controls(hass: HomeAssistant, coordinator, ssid_index: i
     action = "turn_on" if guest else "turn_off"
     await hass.services.async_call(
                 "switch", action, 
-                {"entity_id": "switch.t_mobile_edit_ssid_guest"}, 
+                {"entity_id": edit_entity_id(hass, entry, "switch", "edit_ssid_guest")}, 
                 blocking=True
             )
 
@@ -119,7 +128,7 @@ async def set_ssid_edit_controls(hass: HomeAssistant, coordinator, ssid_index: i
     action = "turn_on" if ssid2_4ghz else "turn_off"
     await hass.services.async_call(
                 "switch", action, 
-                {"entity_id": "switch.t_mobile_edit_ssid_2_4ghz"}, 
+                {"entity_id": edit_entity_id(hass, entry, "switch", "edit_ssid_2_4ghz")}, 
                 blocking=True
             )
 
@@ -127,7 +136,7 @@ async def set_ssid_edit_controls(hass: HomeAssistant, coordinator, ssid_index: i
     action = "turn_on" if ssid5_0ghz else "turn_off"
     await hass.services.async_call(
                 "switch", action, 
-                {"entity_id": "switch.t_mobile_edit_ssid_5_0ghz"}, 
+                {"entity_id": edit_entity_id(hass, entry, "switch", "edit_ssid_5_0ghz")}, 
                 blocking=True
             )
 
@@ -135,20 +144,23 @@ async def set_ssid_edit_controls(hass: HomeAssistant, coordinator, ssid_index: i
     action = "turn_on" if ssid6_0ghz else "turn_off"
     await hass.services.async_call(
                 "switch", action,
-                {"entity_id": "switch.t_mobile_edit_ssid_6_0ghz"},
+                {"entity_id": edit_entity_id(hass, entry, "switch", "edit_ssid_6_0ghz")},
                 blocking=True
             )
 
     # Clear edits pending
     await hass.services.async_call(
                 "switch", "turn_off", 
-                {"entity_id": "switch.t_mobile_edit_ssid_edits_pending"}, 
+                {"entity_id": edit_entity_id(hass, entry, "switch", "edit_ssid_edits_pending")}, 
                 blocking=True
             )
 
-def get_ssid_edit_index(hass: HomeAssistant) -> int:
+def get_ssid_edit_index(hass: HomeAssistant, entry: ConfigEntry) -> int:
     """Get index of selected SSID for editing"""
-    ssid = hass.states.get("select.t_mobile_edit_ssids")
+    entity_id = edit_entity_id(hass, entry, "select", "edit_ssids")
+    ssid = hass.states.get(entity_id) if entity_id is not None else None
+    if ssid is None:
+        return -1
     ssid_option = ssid.state
     ssid_options = ssid.attributes["options"]
     try:
@@ -159,6 +171,70 @@ def get_ssid_edit_index(hass: HomeAssistant) -> int:
         # If no current selection
         return -1
 
+def value_hash(value) -> int:
+    """Hash a JSON-like value, so that equal data hashes equal however it was built."""
+    return hash(json.dumps(value, sort_keys=True, default=str))
+
+def apply_merge_patch(target, patch):
+    """Return target with a JSON merge patch (RFC 7386) applied, leaving target unchanged.
+
+    Parts of target that the patch does not touch are shared, not copied.
+    """
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
+
+def combine_merge_patches(first: dict, second: dict) -> dict:
+    """Return one merge patch with the effect of applying first, then second."""
+    result = dict(first)
+    for key, value in second.items():
+        if isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = combine_merge_patches(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+def merge_patch_diff(old: dict, new: dict) -> dict:
+    """Return the smallest merge patch that turns old into new; empty if they are equal.
+
+    Lists are compared as a whole, since a merge patch can only replace them.
+    """
+    patch = {key: None for key in old if key not in new}
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            if changes := merge_patch_diff(old[key], value):
+                patch[key] = changes
+        elif value != old[key]:
+            patch[key] = value
+    return patch
+
+def reports_merge_patch(reported, patch) -> bool:
+    """Return whether reported has the values a merge patch sets, whatever else it has.
+
+    Lists must have the same length, and are compared item by item, so that
+    fields the gateway adds to an SSID are not taken for a difference.
+    """
+    if isinstance(patch, dict):
+        return isinstance(reported, dict) and all(
+            key not in reported if value is None else key in reported and reports_merge_patch(reported[key], value)
+            for key, value in patch.items()
+        )
+    if isinstance(patch, list):
+        return (
+            isinstance(reported, list)
+            and len(reported) == len(patch)
+            and all(reports_merge_patch(item, value) for item, value in zip(reported, patch))
+        )
+    return reported == patch
+
 def generate_random_mixed_string(length):
     characters = string.ascii_letters + string.digits
     random_string = ''.join(random.choice(characters) for _ in range(length))
@@ -169,17 +245,29 @@ def generate_random_hex_string(length):
     random_string = ''.join(random.choice(characters) for _ in range(length))
     return random_string
 
-async def validate_text_and_update_entities(event: Event):
+async def validate_text_and_update_entities(hass: HomeAssistant, event: Event):
     """Validate input text against pattern and adjust entities used by Save/Cancel buttons"""
     if event.data.get("domain") == "text" and \
         event.data.get("service") == "set_value":
-            if event.data.get('service_data')['entity_id'][0] == "text.t_mobile_edit_ssid_name":
-                await set_SSID_name_valid(validate_SSID_name(event.data.get('service_data')['value']))
-                await set_edits_pending(True)
-
-            elif event.data.get('service_data')['entity_id'][0] == "text.t_mobile_edit_ssid_password":
-                await set_SSID_password_valid(validate_SSID_password(event.data.get('service_data')['value']))
-                await set_edits_pending(True)
+            entity_ids = cv.ensure_list(event.data.get('service_data', {}).get('entity_id'))
+            if not entity_ids:
+                return
+
+            # Find the entry whose editing text was set; each entry has its own.
+            registry_entry = er.async_get(hass).async_get(entity_ids[0])
+            if registry_entry is None or registry_entry.platform != DOMAIN:
+                return
+            entry = hass.config_entries.async_get_entry(registry_entry.config_entry_id)
+            if entry is None:
+                return
+
+            if entity_ids[0] == edit_entity_id(hass, entry, "text", "edit_ssid_name"):
+                await set_SSID_name_valid(hass, entry, validate_SSID_name(event.data.get('service_data')['value']))
+                await set_edits_pending(hass, entry, True)
+
+            elif entity_ids[0] == edit_entity_id(hass, entry, "text", "edit_ssid_password"):
+                await set_SSID_password_valid(hass, entry, validate_SSID_password(event.data.get('service_data')['value']))
+                await set_edits_pending(hass, entry, True)
 
 def validate_SSID_name(value: str) -> bool:
     regex = SSID_NAME_PATTERN
@@ -189,84 +277,78 @@ def validate_SSID_password(value: str) -> bool:
     regex = SSID_PASSWORD_PATTERN
     return True if re.match(regex,value) else False
 
-async def set_SSID_name_valid(valid: bool) -> None:
-    hass = Static().hass
+async def set_SSID_name_valid(hass: HomeAssistant, entry: ConfigEntry, valid: bool) -> None:
     if valid:
         # Set name valid indicator
         await hass.services.async_call(
                     "switch", "turn_on", 
-                    {"entity_id": "switch.t_mobile_edit_ssid_edits_name_valid"}, 
+                    {"entity_id": edit_entity_id(hass, entry, "switch", "edit_ssid_edits_name_valid")}, 
                     blocking=True
                 )
     else:
         # Clear name valid indicator
         await hass.services.async_call(
                     "switch", "turn_off", 
-                    {"entity_id": "switch.t_mobile_edit_ssid_edits_name_valid"}, 
+                    {"entity_id": edit_entity_id(hass, entry, "switch", "edit_ssid_edits_name_valid")}, 
                     blocking=True
                 )
 
-async def set_SSID_password_valid(valid: bool) -> None:
-    hass = Static().hass
+async def set_SSID_password_valid(hass: HomeAssistant, entry: ConfigEntry, valid: bool) -> None:
     if valid:
         # Set password valid indicator
         await hass.services.async_call(
                     "switch", "turn_on", 
-                    {"entity_id": "switch.t_mobile_edit_ssid_edits_password_valid"}, 
+                    {"entity_id": edit_entity_id(hass, entry, "switch", "edit_ssid_edits_password_valid")}, 
                     blocking=True
                 )
     else:
         # Clear password valid indicator
         await hass.services.async_call(
                     "switch", "turn_off", 
-                    {"entity_id": "switch.t_mobile_edit_ssid_edits_password_valid"}, 
+                    {"entity_id": edit_entity_id(hass, entry, "switch", "edit_ssid_edits_password_valid")}, 
                     blocking=True
                 )
 
-async def set_edits_pending(editing: bool) -> None:
+async def set_edits_pending(hass: HomeAssistant, entry: ConfigEntry, editing: bool) -> None:
     """Set or clear edits pending indicator."""
-    hass = Static().hass
     if editing:
         await hass.services.async_call(
                     "switch", "turn_on", 
-                    {"entity_id": "switch.t_mobile_edit_ssid_edits_pending"}, 
+                    {"entity_id": edit_entity_id(hass, entry, "switch", "edit_ssid_edits_pending")}, 
                     blocking=True
                 )
     else:
         await hass.services.async_call(
                     "switch", "turn_off", 
-                    {"entity_id": "switch.t_mobile_edit_ssid_edits_pending"}, 
+                    {"entity_id": edit_entity_id(hass, entry, "switch", "edit_ssid_edits_pending")}, 
                     blocking=True
                 )
 
-async def set_edits_saving(editing: bool) -> None:
+async def set_edits_saving(hass: HomeAssistant, entry: ConfigEntry, editing: bool) -> None:
     """Set or clear edits saving indicator."""
-    hass = Static().hass
     if editing:
         await hass.services.async_call(
                     "switch", "turn_on", 
-                    {"entity_id": "switch.t_mobile_edit_ssid_edits_saving"}, 
+                    {"entity_id": edit_entity_id(hass, entry, "switch", "edit_ssid_edits_saving")}, 
                     blocking=True
                 )
     else:
         await hass.services.async_call(
                     "switch", "turn_off", 
-                    {"entity_id": "switch.t_mobile_edit_ssid_edits_saving"}, 
+                    {"entity_id": edit_entity_id(hass, entry, "switch", "edit_ssid_edits_saving")}, 
                     blocking=True
                 )
 
-async def update_entity(entity_id: str) -> None:
+async def update_entity(hass: HomeAssistant, entity_id: str) -> None:
     """Set or clear edits saving indicator."""
-    hass = Static().hass
     await hass.services.async_call(
                 "homeassistant", "update_entity", 
                 {"entity_id": entity_id}, 
                 blocking=True
             )
 
-async def select_option(entity_id: str, option: str) -> None:
+async def select_option(hass: HomeAssistant, entity_id: str, option: str) -> None:
     """Set or clear edits saving indicator."""
-    hass = Static().hass
     await hass.services.async_call(
                 "select", "select_option", 
                 {"entity_id": entity_id, "option": option}, 
@@ -0,0 +1,282 @@
+"""Access point writes for the Home Assistant T-Mobile Home Internet integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import GatewayApiClient
+from .const import (
+    AP_CONFIRM_INITIAL_DELAY_SECONDS,
+    AP_CONFIRM_MAX_DELAY_SECONDS,
+    AP_CONFIRM_TIMEOUT_SECONDS,
+    AP_QUEUE_MAX_REPLAYS,
+    AP_QUEUE_REPLAY_INITIAL_DELAY_SECONDS,
+    AP_QUEUE_REPLAY_MAX_DELAY_SECONDS,
+    AP_WRITE_WINDOW_SECONDS,
+)
+from .retry import classify_failure, is_unreachable
+from .utils import apply_merge_patch, combine_merge_patches, merge_patch_diff, reports_merge_patch
+
+if TYPE_CHECKING:
+    from . import SlowCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AccessPointWriter:
+    """Combine access point changes made close together into one write.
+
+    Every write of the access point config can reset the gateway's radios,
+    so changes are not written one by one. Each change is a JSON merge patch
+    against the "access_point" section. Patches arriving within
+    AP_WRITE_WINDOW_SECONDS of the first are combined, applied to the
+    current config, and sent as a single set_ap_config, or not sent at all
+    if they change nothing. Every caller waits until that write is done, and
+    is given the changes its own patch makes to the config as it was before
+    the write, or the error. Writes never overlap.
+
+    The new config is published to entities as soon as it is sent, and the
+    coordinator stops polling the access point while the write is in
+    progress. The gateway resets to apply the config, so the writer then
+    polls it at growing intervals until it reports the changes. If it does
+    not within AP_CONFIRM_TIMEOUT_SECONDS, or the write fails, the config
+    shown before the write is restored and the callers get an error.
+
+    If the gateway cannot be reached, the patch is instead queued, saved to a
+    Store so it survives a restart, and the callers are given their changes
+    to the config last read with the queue applied, as if written. A write
+    the gateway answers with an error is not queued. Later patches are
+    combined with the queue. The queue is written as soon as a poll shows the
+    gateway is reachable again; since changes that are already in place are
+    not written, replaying is safe. A replay that cannot reach the gateway
+    either is retried no sooner than after a doubling delay, and after
+    AP_QUEUE_MAX_REPLAYS the queue is dropped.
+
+    Unloading cancels any write in progress, and its callers get an error.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: SlowCoordinator, controller: GatewayApiClient, store: Store
+    ) -> None:
+        """Initialize the writer."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._controller = controller
+        self._store = store
+        self._patch: dict[str, Any] = {}
+        self._waiters: list[tuple[asyncio.Future, dict[str, Any]]] = []
+        self._window: asyncio.Task | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+        self.in_progress = False
+        self._queue: dict[str, Any] = {"patch": {}, "writes": 0, "queued_at": None, "replays": 0}
+        self._replay_after = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of writes waiting in the queue for the gateway to be reachable."""
+        return self._queue["writes"]
+
+    def queue_as_dict(self) -> dict[str, Any]:
+        """Return the queue for display as attributes, without the values, which may include passwords."""
+        return {
+            "depth": self._queue["writes"],
+            "queued_at": self._queue["queued_at"],
+            "replays": self._queue.get("replays", 0),
+            "sections": sorted(self._queue["patch"]),
+        }
+
+    def with_queue(self, access_point: dict[str, Any]) -> dict[str, Any]:
+        """Return an access point config with the queued changes applied, as callers were told it is."""
+        if not self._queue["writes"]:
+            return access_point
+        return apply_merge_patch(access_point, self._queue["patch"])
+
+    async def async_load(self) -> None:
+        """Load the queue saved by a previous run."""
+        if (queue := await self._store.async_load()) is not None:
+            self._queue = queue
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Replay the queue whenever a poll reaches the gateway; return a function to stop."""
+        return self._coordinator.async_add_listener(self._handle_coordinator_update)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Start writing the queue if the latest poll reached the gateway."""
+        if not self._queue["writes"] or self._window is not None or self._lock.locked():
+            return
+        if time.monotonic() < self._replay_after:
+            return
+        sections = (self._coordinator.data or {}).get("sections", {}).values()
+        latest = max(sections, key=lambda state: state["attempted_at"], default=None)
+        if latest is not None and latest["error"] is None:
+            _LOGGER.info(f"Gateway is reachable, writing {self._queue['writes']} queued access point changes")
+            self._async_open_window()
+
+    @callback
+    def _async_open_window(self) -> None:
+        """Start a window, unless one is open already."""
+        if self._window is None:
+            self._window = self._hass.async_create_background_task(
+                self._async_write_window(), "tmobile_home_internet access point write"
+            )
+            self._tasks.add(self._window)
+            self._window.add_done_callback(self._tasks.discard)
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the window and any write in progress; their callers get an error."""
+        for task in self._tasks:
+            task.cancel()
+
+    async def async_write(self, patch: dict[str, Any]) -> dict[str, Any]:
+        """Write a merge patch along with any others in the window; return the changes it made."""
+        waiter = self._hass.loop.create_future()
+        self._patch = combine_merge_patches(self._patch, patch)
+        self._waiters.append((waiter, patch))
+        self._async_open_window()
+        return await waiter
+
+    async def _async_write_window(self) -> None:
+        """Wait for the window to close, then write everything patched during it, and the queue."""
+        waiters = self._waiters
+        try:
+            await asyncio.sleep(AP_WRITE_WINDOW_SECONDS)
+            # Patches from now on start the next window.
+            patch, waiters = self._patch, self._waiters
+            self._patch, self._waiters, self._window = {}, [], None
+
+            async with self._lock:
+                await self._async_write(patch, waiters)
+        except asyncio.CancelledError:
+            if self._window is asyncio.current_task():
+                # Cancelled before the window closed.
+                self._patch, self._waiters, self._window = {}, [], None
+            self._fail(waiters, HomeAssistantError("Access point write cancelled"))
+            raise
+
+    async def _async_write(self, patch: dict[str, Any], waiters: list[tuple[asyncio.Future, dict[str, Any]]]) -> None:
+        """Write a patch combined with the queue, or queue it if the gateway cannot be reached."""
+        queue = self._queue
+        if queue["writes"]:
+            patch = combine_merge_patches(queue["patch"], patch)
+        try:
+            current = await self._async_apply(patch)
+        except Exception as err:
+            if not is_unreachable(err):
+                if queue["writes"]:
+                    _LOGGER.error(f"Dropping {queue['writes']} queued access point changes: {err}")
+                    await self._async_save_queue(None)
+                self._fail(waiters, err)
+                return
+
+            replays = queue.get("replays", 0) + 1 if queue["writes"] else 0
+            if replays >= AP_QUEUE_MAX_REPLAYS:
+                _LOGGER.error(
+                    f"Dropping {queue['writes']} queued access point changes, "
+                    f"gateway still unreachable after {replays} attempts: {err}"
+                )
+                await self._async_save_queue(None)
+                self._fail(waiters, err)
+                return
+
+            _LOGGER.warning(f"Gateway unreachable, queueing access point changes until it is back: {err}")
+            if replays:
+                delay = AP_QUEUE_REPLAY_INITIAL_DELAY_SECONDS * 2 ** (replays - 1)
+                self._replay_after = time.monotonic() + min(delay, AP_QUEUE_REPLAY_MAX_DELAY_SECONDS)
+            await self._async_save_queue({
+                "patch": patch,
+                "writes": queue["writes"] + len(waiters),
+                "queued_at": queue["queued_at"] or dt_util.utcnow().isoformat(),
+                "replays": replays,
+            })
+            last_read = (self._coordinator.data or {}).get("access_point") or {}
+            self._resolve(waiters, apply_merge_patch(last_read, queue["patch"]) if queue["writes"] else last_read)
+        else:
+            if queue["writes"]:
+                await self._async_save_queue(None)
+            self._replay_after = 0.0
+            self._resolve(waiters, current)
+
+    @staticmethod
+    def _fail(waiters: list[tuple[asyncio.Future, dict[str, Any]]], err: Exception) -> None:
+        """Give the waiting callers the error."""
+        for waiter, _ in waiters:
+            if not waiter.done():
+                waiter.set_exception(err)
+
+    @staticmethod
+    def _resolve(waiters: list[tuple[asyncio.Future, dict[str, Any]]], current: dict[str, Any]) -> None:
+        """Give each waiting caller the changes its own patch makes to the current config."""
+        for waiter, patch in waiters:
+            if not waiter.done():
+                waiter.set_result(merge_patch_diff(current, apply_merge_patch(current, patch)))
+
+    async def _async_save_queue(self, queue: dict[str, Any] | None) -> None:
+        """Replace the queue, or empty it, and save it."""
+        self._queue = queue or {"patch": {}, "writes": 0, "queued_at": None, "replays": 0}
+        if queue is None:
+            await self._store.async_remove()
+        else:
+            await self._store.async_save(queue)
+        # Show the new queue depth.
+        self._coordinator.async_update_listeners()
+
+    async def _async_apply(self, patch: dict[str, Any]) -> dict[str, Any]:
+        """Apply a patch to the current config and write it if it changes anything; return the config patched."""
+        await self._coordinator.async_ensure_section("access_point")
+        current = self._coordinator.data["access_point"]
+        access_point = apply_merge_patch(current, patch)
+
+        changes = merge_patch_diff(current, access_point)
+        if not changes:
+            _LOGGER.debug("Access point changes have no effect, skipping write")
+            return current
+
+        _LOGGER.debug(f"Writing access point changes: {sorted(changes)}")
+        self.in_progress = True
+        self._coordinator.async_set_section("access_point", access_point)
+        try:
+            await self._controller.set_ap_config(access_point)
+            self._coordinator.async_set_section("access_point", await self._async_confirm(changes))
+        except Exception:
+            if self._coordinator.data["access_point"] is access_point:
+                self._coordinator.async_set_section("access_point", current)
+            raise
+        finally:
+            self.in_progress = False
+        return current
+
+    async def _async_confirm(self, changes: dict[str, Any]) -> dict[str, Any]:
+        """Poll the gateway until it reports the changes; return the config it reports.
+
+        Only the fields written are compared, since the gateway may add others.
+        """
+        deadline = time.monotonic() + AP_CONFIRM_TIMEOUT_SECONDS
+        delay = AP_CONFIRM_INITIAL_DELAY_SECONDS
+        while True:
+            await asyncio.sleep(min(delay, max(0, deadline - time.monotonic())))
+            try:
+                reported = await self._controller.get_ap_config()
+            except Exception as err:
+                # Expected while the gateway resets.
+                _LOGGER.debug(f"Waiting for access point changes, gateway {classify_failure(err)}: {err}")
+            else:
+                if reports_merge_patch(reported, changes):
+                    return reported
+                _LOGGER.debug("Waiting for access point changes, gateway still reports the old values")
+
+            if time.monotonic() >= deadline:
+                raise HomeAssistantError(
+                    f"Gateway did not apply the access point changes within {AP_CONFIRM_TIMEOUT_SECONDS} seconds"
+                )
+            delay = min(delay * 2, AP_CONFIRM_MAX_DELAY_SECONDS)
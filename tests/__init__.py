@@ -0,0 +1 @@
+"""Tests for the T-Mobile Home Internet integration."""
@@ -0,0 +1,163 @@
+"""Helpers for the T-Mobile Home Internet integration tests."""
+from __future__ import annotations
+
+import asyncio
+import copy
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator
+
+import aiohttp
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from custom_components.tmobile_home_internet import FastCoordinator, SlowCoordinator
+from custom_components.tmobile_home_internet.api import GatewayApiClient
+from custom_components.tmobile_home_internet.const import DOMAIN
+from custom_components.tmobile_home_internet.pool import GatewayRequestPool
+from custom_components.tmobile_home_internet.scheduler import AdaptivePollInterval
+
+# What a gateway answers on each path, trimmed to the fields the integration reads.
+GATEWAY_RESPONSES: dict[str, dict[str, Any]] = {
+    "gateway?get=all": {
+        "device": {
+            "name": "G4AR",
+            "manufacturer": "Arcadyan",
+            "model": "G4AR",
+            "serial": "G4AR00000001",
+            "macId": "00:11:22:33:44:55",
+            "softwareVersion": "1.00.02",
+            "hardwareVersion": "R01",
+        },
+        "signal": {},
+        "time": {"upTime": 1000},
+    },
+    "network/telemetry/?get=cell": {
+        "cell": {
+            "4g": {
+                "bandwidth": "20M",
+                "ecgi": "310260000000001",
+                "sector": {"rsrp": -96, "rsrq": -9, "sinr": 7},
+            },
+            "5g": {
+                "bandwidth": "100M",
+                "ecgi": "310260000000002",
+                "sector": {"rsrp": -103, "rsrq": -11, "sinr": 4},
+            },
+        },
+    },
+    "network/telemetry/?get=sim": {"sim": {"iccId": "8901260000000000000", "status": True}},
+    "network/telemetry/?get=clients": {"clients": {"2.4ghz": [], "5.0ghz": [], "ethernet": []}},
+    "network/configuration/v2?get=ap": {
+        "2.4ghz": {"isRadioEnabled": True, "channel": "Auto"},
+        "5.0ghz": {"isRadioEnabled": True, "channel": "Auto"},
+        "ssids": [{"ssidName": "TMOBILE-0000", "2.4ghzSsid": True, "5.0ghzSsid": True}],
+    },
+}
+
+
+class FakeResponse:
+    """Stands in for an aiohttp response."""
+
+    def __init__(self, status: int, body: Any) -> None:
+        """Initialize the response."""
+        self.status = status
+        self._body = body
+
+    async def json(self, content_type: str | None = None) -> Any:
+        """Return the body."""
+        return self._body
+
+    def raise_for_status(self) -> None:
+        """Raise for an error status."""
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(None, (), status=self.status)
+
+
+class FakeGatewaySession:
+    """Stands in for the aiohttp session, answering like gateways after latency seconds.
+
+    Requests in flight are counted per host and in total. Setting online to
+    False makes every request fail as if the gateways were rebooting. An
+    access point config written is reported from then on.
+    """
+
+    def __init__(self, latency: float = 0) -> None:
+        """Initialize the session."""
+        self.latency = latency
+        self.online = True
+        self.responses = copy.deepcopy(GATEWAY_RESPONSES)
+        self.requests = 0
+        self.in_flight: dict[str, int] = {}
+        self.max_in_flight: dict[str, int] = {}
+        self.max_total_in_flight = 0
+
+    @asynccontextmanager
+    async def request(
+        self, method: str, url: str, json: dict[str, Any] | None = None, headers: dict[str, str] | None = None
+    ) -> AsyncIterator[FakeResponse]:
+        """Answer a request."""
+        host, path = url.removeprefix("http://").split("/TMI/v1/", 1)
+        self.requests += 1
+        self.in_flight[host] = self.in_flight.get(host, 0) + 1
+        self.max_in_flight[host] = max(self.max_in_flight.get(host, 0), self.in_flight[host])
+        self.max_total_in_flight = max(self.max_total_in_flight, sum(self.in_flight.values()))
+        try:
+            await asyncio.sleep(self.latency)
+            if not self.online:
+                raise aiohttp.ClientConnectionError(f"Cannot connect to host {host}")
+            if path == "network/configuration/v2?set=ap":
+                self.responses["network/configuration/v2?get=ap"] = copy.deepcopy(json)
+            yield FakeResponse(200, self.responses.get(path, {}))
+        finally:
+            self.in_flight[host] -= 1
+
+    def get(self, url: str, headers: dict[str, str] | None = None):
+        """Answer a GET."""
+        return self.request("GET", url, headers=headers)
+
+    def post(self, url: str, json: dict[str, Any] | None = None, headers: dict[str, str] | None = None):
+        """Answer a POST."""
+        return self.request("POST", url, json=json, headers=headers)
+
+
+def create_client(session: FakeGatewaySession, host: str, pool: GatewayRequestPool) -> GatewayApiClient:
+    """Return a client for a fake gateway, already holding a token."""
+    client = GatewayApiClient(session, "admin", "password", host, pool)
+    client.set_token("token", datetime.now(timezone.utc) + timedelta(days=1))
+    return client
+
+
+async def async_create_coordinators(
+    hass: HomeAssistant, client: GatewayApiClient, fast_seconds: float, slow_seconds: float
+) -> tuple[FastCoordinator, SlowCoordinator]:
+    """Return a gateway's coordinators with fixed poll intervals, after their first fetch.
+
+    Every section is demanded, as if all of the entities were enabled.
+    """
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: client.host, CONF_USERNAME: "admin", CONF_PASSWORD: "password"},
+        unique_id=client.host,
+    )
+    entry.add_to_hass(hass)
+    token = config_entries.current_entry.set(entry)
+    try:
+        fast = FastCoordinator(hass, client)
+        slow = SlowCoordinator(hass, client)
+    finally:
+        config_entries.current_entry.reset(token)
+
+    fast.poll_interval = AdaptivePollInterval(fast_seconds, fast_seconds, fast_seconds)
+    slow.poll_interval = AdaptivePollInterval(slow_seconds, slow_seconds, slow_seconds)
+
+    await slow._async_setup()
+    for coordinator in (fast, slow):
+        for section in coordinator.SECTIONS:
+            if not coordinator.has_demand(section):
+                coordinator.async_add_demand(section)
+        coordinator.async_set_updated_data(await coordinator.async_fetch_sections(list(coordinator.SECTIONS)))
+    return fast, slow
@@ -0,0 +1,136 @@
+"""Tests for the gateway poll scheduler."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.tmobile_home_internet import _GOLDEN_RATIO_CONJUGATE
+from custom_components.tmobile_home_internet.const import MAX_CONCURRENT_REQUESTS
+from custom_components.tmobile_home_internet.pool import GatewayRequestPool
+from custom_components.tmobile_home_internet.scheduler import GatewayScheduler
+
+from .common import FakeGatewaySession, async_create_coordinators, create_client
+
+
+async def _async_wait_for(condition, timeout: float) -> None:
+    """Wait until condition() is true."""
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+async def test_breaker_opens_when_every_endpoint_fails(hass: HomeAssistant) -> None:
+    """Batches in which no endpoint answers open the breaker, and the last good data is kept."""
+    session = FakeGatewaySession()
+    client = create_client(session, "192.168.12.1", GatewayRequestPool(8))
+    fast, slow = await async_create_coordinators(hass, client, 0.05, 0.15)
+    access_point = slow.data["access_point"]
+
+    scheduler = GatewayScheduler(hass, [fast, slow], client.probe)
+    notified = []
+    scheduler.async_add_listener(lambda: notified.append(scheduler.breaker.is_open))
+    session.online = False
+    # The slow interval is normally far longer than a cached gateway response lives.
+    client._cache.clear()
+    scheduler.async_start()
+    try:
+        await _async_wait_for(lambda: scheduler.breaker.is_open, 5)
+    finally:
+        scheduler.async_stop()
+        await fast.cell_index.async_save()
+
+    assert scheduler.breaker.failures >= scheduler.breaker.threshold
+    assert "Cannot connect" in scheduler.breaker.last_error
+    assert notified == [True]
+
+    # The slow sections failed together, but still show their last good values.
+    assert slow.last_update_success
+    assert slow.data["access_point"] is access_point
+    assert all(state["error"] is not None for state in slow.data["sections"].values())
+    assert not fast.last_update_success
+
+
+async def test_reboot_raises_when_the_request_fails(hass: HomeAssistant) -> None:
+    """A reboot request the gateway does not take is raised, and polling resumes."""
+    session = FakeGatewaySession()
+    client = create_client(session, "192.168.12.1", GatewayRequestPool(8))
+    fast, slow = await async_create_coordinators(hass, client, 0.05, 0.15)
+
+    scheduler = GatewayScheduler(hass, [fast, slow], client.probe)
+    updates = []
+    fast.async_add_listener(lambda: updates.append(time.monotonic()))
+    scheduler.async_start()
+    session.online = False
+    try:
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await scheduler.async_reboot(client.reboot_gateway, {})
+        assert not scheduler.rebooting
+        session.online = True
+        updates.clear()
+        await _async_wait_for(lambda: len(updates) >= 2, 5)
+    finally:
+        scheduler.async_stop()
+        await fast.cell_index.async_save()
+
+
+async def test_many_gateways_poll_without_overruns(hass: HomeAssistant) -> None:
+    """Fifty gateways sharing the request pool keep to the pool limits and to their schedules."""
+    gateways = 50
+    fast_seconds, slow_seconds, run_seconds = 0.5, 1.5, 4.0
+    session = FakeGatewaySession()
+    pool = GatewayRequestPool(MAX_CONCURRENT_REQUESTS)
+
+    schedulers = []
+    fast_coordinators = []
+    fast_updates: list[list[float]] = []
+    slow_attempts: list[dict[str, set]] = []
+    for index in range(gateways):
+        client = create_client(session, f"10.0.{index // 250}.{index % 250 + 1}", pool)
+        fast, slow = await async_create_coordinators(hass, client, fast_seconds, slow_seconds)
+        updates: list[float] = []
+        attempts: dict[str, set] = {section: set() for section in slow.SECTIONS}
+        fast.async_add_listener(lambda updates=updates: updates.append(time.monotonic()))
+        slow.async_add_listener(
+            lambda slow=slow, attempts=attempts: [
+                attempts[section].add(state["attempted_at"]) for section, state in slow.data["sections"].items()
+            ]
+        )
+        fast_coordinators.append(fast)
+        fast_updates.append(updates)
+        slow_attempts.append(attempts)
+        # The same phases async_setup_entry gives the entries.
+        schedulers.append(GatewayScheduler(hass, [fast, slow], client.probe, (index * _GOLDEN_RATIO_CONJUGATE) % 1))
+
+    # Slow enough that the gateways contend for the pool.
+    session.latency = 0.04
+    started = time.monotonic()
+    for scheduler in schedulers:
+        scheduler.async_start()
+    try:
+        await asyncio.sleep(run_seconds)
+        requests = [pool.as_dict(host) for host in session.max_in_flight]
+    finally:
+        for scheduler in schedulers:
+            scheduler.async_stop()
+        for fast in fast_coordinators:
+            await fast.cell_index.async_save()
+
+    assert len(requests) == gateways
+    assert session.max_total_in_flight == pool.limit
+    assert max(session.max_in_flight.values()) <= pool.gateway_limit
+    for gateway_requests in requests:
+        assert gateway_requests["stuck"] == gateway_requests["timed_out"] == gateway_requests["abandoned"] == 0
+
+    for scheduler, updates, attempts in zip(schedulers, fast_updates, slow_attempts):
+        assert not scheduler.breaker.failures
+        # No batch ran into the next one: after the gateway's phase, the fast endpoint was polled every interval...
+        assert updates[0] - started < fast_seconds * 2.5
+        assert max(later - earlier for earlier, later in zip(updates, updates[1:])) < fast_seconds * 1.5
+        assert started + run_seconds - updates[-1] < fast_seconds * 1.5
+        # ...and every slow endpoint came round again.
+        for section_attempts in attempts.values():
+            assert len(section_attempts) >= 2
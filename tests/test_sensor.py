@@ -0,0 +1,51 @@
+"""Tests for the gateway sensor's access point actions."""
+from __future__ import annotations
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.tmobile_home_internet import writer
+from custom_components.tmobile_home_internet.pool import GatewayRequestPool
+from custom_components.tmobile_home_internet.sensor import GatewayDeviceSensor
+
+from .common import FakeGatewaySession, async_create_coordinators, create_client
+
+
+@pytest.fixture(autouse=True)
+def _fast_writes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Write and confirm without the gateway's delays."""
+    monkeypatch.setattr(writer, "AP_WRITE_WINDOW_SECONDS", 0)
+    monkeypatch.setattr(writer, "AP_CONFIRM_INITIAL_DELAY_SECONDS", 0.01)
+    monkeypatch.setattr(writer, "AP_CONFIRM_TIMEOUT_SECONDS", 1)
+
+
+@pytest.fixture
+async def gateway(hass: HomeAssistant):
+    """Return a fake gateway session and the gateway sensor for it."""
+    session = FakeGatewaySession()
+    client = create_client(session, "192.168.12.1", GatewayRequestPool(8))
+    fast, slow = await async_create_coordinators(hass, client, 60, 60)
+    yield session, GatewayDeviceSensor(hass, slow, fast, client, None, None)
+    await fast.cell_index.async_save()
+
+
+def _ssid_names(result: dict) -> list[str]:
+    """Return the names of the SSIDs an action returned."""
+    return [ssid["ssidName"] for ssid in result["ssids"]]
+
+
+async def test_queued_ssid_changes_are_kept(gateway) -> None:
+    """An SSID action made while another is queued builds on it rather than replacing it."""
+    session, sensor = gateway
+    session.online = False
+
+    result = await sensor._create_ssid("GUEST", False, password="guestpassword")
+    assert result["queued"]
+    result = await sensor._create_ssid("IOT", True, password="iotpassword")
+    assert result["queued"]
+    assert _ssid_names(result) == ["TMOBILE-0000", "GUEST", "IOT"]
+
+    result = await sensor._delete_ssid("GUEST")
+    assert _ssid_names(result) == ["TMOBILE-0000", "IOT"]
+    assert sensor._coordinator.access_point_writer.queue_depth == 3
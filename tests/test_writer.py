@@ -0,0 +1,136 @@
+"""Tests for the access point writer."""
+from __future__ import annotations
+
+import asyncio
+
+import aiohttp
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.tmobile_home_internet import writer
+from custom_components.tmobile_home_internet.pool import GatewayRequestPool
+
+from .common import FakeGatewaySession, async_create_coordinators, create_client
+
+
+@pytest.fixture(autouse=True)
+def _fast_writes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Write and confirm without the gateway's delays."""
+    monkeypatch.setattr(writer, "AP_WRITE_WINDOW_SECONDS", 0)
+    monkeypatch.setattr(writer, "AP_CONFIRM_INITIAL_DELAY_SECONDS", 0.01)
+    monkeypatch.setattr(writer, "AP_CONFIRM_TIMEOUT_SECONDS", 1)
+
+
+async def test_write_is_confirmed_when_the_gateway_adds_fields(hass: HomeAssistant) -> None:
+    """An SSID write is confirmed by the fields written, though the gateway reports more."""
+    session = FakeGatewaySession()
+    client = create_client(session, "192.168.12.1", GatewayRequestPool(8))
+    fast, slow = await async_create_coordinators(hass, client, 60, 60)
+
+    set_ap_config = client.set_ap_config
+
+    async def set_ap_config_adding_6ghz(config: dict) -> None:
+        """Write the config; the gateway then reports a 6GHz flag on every SSID."""
+        await set_ap_config(config)
+        for ssid in session.responses["network/configuration/v2?get=ap"]["ssids"]:
+            ssid.setdefault("6.0ghzSsid", False)
+
+    client.set_ap_config = set_ap_config_adding_6ghz
+    ssids = [{"ssidName": "TMOBILE-0000", "2.4ghzSsid": True, "5.0ghzSsid": False}]
+    try:
+        changes = await slow.access_point_writer.async_write({"ssids": ssids})
+    finally:
+        await fast.cell_index.async_save()
+
+    assert changes == {"ssids": ssids}
+    assert slow.data["access_point"]["ssids"] == [ssids[0] | {"6.0ghzSsid": False}]
+
+
+async def test_callers_get_their_own_changes(hass: HomeAssistant) -> None:
+    """Patches combined into one write, or queued, each return only what they change."""
+    session = FakeGatewaySession()
+    client = create_client(session, "192.168.12.1", GatewayRequestPool(8))
+    fast, slow = await async_create_coordinators(hass, client, 60, 60)
+    access_point_writer = slow.access_point_writer
+    try:
+        changes = await asyncio.gather(
+            access_point_writer.async_write({"2.4ghz": {"isRadioEnabled": False}}),
+            access_point_writer.async_write({"5.0ghz": {"channel": "36", "isRadioEnabled": True}}),
+        )
+        assert changes == [{"2.4ghz": {"isRadioEnabled": False}}, {"5.0ghz": {"channel": "36"}}]
+
+        session.online = False
+        changes = await asyncio.gather(
+            access_point_writer.async_write({"2.4ghz": {"isRadioEnabled": True}}),
+            access_point_writer.async_write({"5.0ghz": {"channel": "36"}}),
+        )
+        assert changes == [{"2.4ghz": {"isRadioEnabled": True}}, {}]
+        assert access_point_writer.queue_depth == 2
+    finally:
+        await fast.cell_index.async_save()
+
+
+async def test_rejected_write_is_not_queued(hass: HomeAssistant) -> None:
+    """A write the gateway answers with an error fails, rather than being queued as if unreachable."""
+    session = FakeGatewaySession()
+    client = create_client(session, "192.168.12.1", GatewayRequestPool(8))
+    fast, slow = await async_create_coordinators(hass, client, 60, 60)
+
+    async def reject(config: dict) -> None:
+        raise aiohttp.ClientResponseError(None, (), status=500, message="Internal Server Error")
+
+    client.set_ap_config = reject
+    try:
+        with pytest.raises(aiohttp.ClientResponseError):
+            await slow.access_point_writer.async_write({"2.4ghz": {"isRadioEnabled": False}})
+    finally:
+        await fast.cell_index.async_save()
+
+    assert slow.access_point_writer.queue_depth == 0
+    assert slow.data["access_point"]["2.4ghz"]["isRadioEnabled"]
+
+
+async def test_queue_is_dropped_after_the_replay_limit(hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A queue the gateway keeps timing out on is replayed a limited number of times, then dropped."""
+    monkeypatch.setattr(writer, "AP_QUEUE_MAX_REPLAYS", 3)
+    monkeypatch.setattr(writer, "AP_QUEUE_REPLAY_INITIAL_DELAY_SECONDS", 0)
+    session = FakeGatewaySession()
+    client = create_client(session, "192.168.12.1", GatewayRequestPool(8))
+    fast, slow = await async_create_coordinators(hass, client, 60, 60)
+    access_point_writer = slow.access_point_writer
+
+    session.online = False
+    try:
+        await access_point_writer.async_write({"2.4ghz": {"isRadioEnabled": False}})
+        replays = []
+        while access_point_writer.queue_depth:
+            replays.append(access_point_writer.queue_as_dict()["replays"])
+            access_point_writer._handle_coordinator_update()
+            # Polls are not running, so open the window as a successful poll would.
+            access_point_writer._async_open_window()
+            await access_point_writer._window
+    finally:
+        await fast.cell_index.async_save()
+
+    assert replays == [0, 1, 2]
+
+
+async def test_stopping_fails_waiting_callers(hass: HomeAssistant) -> None:
+    """Callers waiting on a write get an error when the writer is stopped on unload."""
+    session = FakeGatewaySession()
+    client = create_client(session, "192.168.12.1", GatewayRequestPool(8))
+    fast, slow = await async_create_coordinators(hass, client, 60, 60)
+    access_point_writer = slow.access_point_writer
+
+    write = hass.async_create_task(access_point_writer.async_write({"2.4ghz": {"isRadioEnabled": False}}))
+    await asyncio.sleep(0)
+    access_point_writer.async_stop()
+    try:
+        with pytest.raises(HomeAssistantError):
+            await write
+    finally:
+        await fast.cell_index.async_save()
+
+    assert session.responses["network/configuration/v2?get=ap"]["2.4ghz"]["isRadioEnabled"]